@@ -1,19 +1,54 @@
+import os
 import random # random is no longer needed for core logic, but keeping for now if other parts use it.
-from core_game_logic import generate_secret_number, calculate_clues
-from bots import BotPlayer # Import BotPlayer
+import time
+from core_game_logic import CLASSIC, MAX_SYMBOLS, Clue, Number, Variant
+from game_log import BOT_GUESSER, HARD_HUMAN_GUESSER, HUMAN_GUESSER, SOURCE_CLI, GameLogWriter, encode_moves, open_game_log
+from game_session import MAX_DIGITS, GameSession
+from adversary import AdversarialGameSession
+from bots import SolverBotPlayer # Import SolverBotPlayer
+from strategies import STRATEGIES, RandomConsistentStrategy, make_strategy
+from feedback_table import MAX_TABLE_DIGITS, load_feedback_table, table_path
+from opening_book import OpeningBook, book_path
+from parallel_filter import PARALLEL_MIN_DIGITS, SharedCandidateSet, shutdown_filter_pool
 
-def get_num_digits():
+_game_log: GameLogWriter | None = None
+_game_log_opened = False
+
+def get_game_log() -> GameLogWriter | None:
+    """Opens the game log on first use; returns None if logging is disabled or unavailable."""
+    global _game_log, _game_log_opened
+    if not _game_log_opened:
+        _game_log = open_game_log()
+        _game_log_opened = True
+    return _game_log
+
+def get_variant() -> Variant:
+    """Prompts for the game variant: the number of symbols and whether they may repeat."""
+    while True:
+        size_str = input(f"Enter the number of symbols (2-{MAX_SYMBOLS}, symbols above 9 are a-f; default 10): ").strip()
+        if not size_str:
+            alphabet_size = CLASSIC.alphabet_size
+            break
+        if size_str.isdigit() and 2 <= int(size_str) <= MAX_SYMBOLS:
+            alphabet_size = int(size_str)
+            break
+        print(f"Please enter a number between 2 and {MAX_SYMBOLS}.")
+    allow_repeats = input("Allow repeated symbols? (yes/no, default no): ").strip().lower().startswith('y')
+    return Variant(alphabet_size, allow_repeats)
+
+def get_num_digits(variant: Variant = CLASSIC):
+    max_digits = MAX_DIGITS if variant == CLASSIC else variant.max_digits()
     while True:
         try:
-            num_digits_str = input("Enter the number of digits for the secret number (1-9): ")
+            num_digits_str = input(f"Enter the number of digits for the secret number (1-{max_digits}): ")
             if not num_digits_str.isdigit():
                 print("Invalid input. Please enter a number.")
                 continue
             num_digits = int(num_digits_str)
-            if 1 <= num_digits <= 9:
+            if 1 <= num_digits <= max_digits:
                 return num_digits
             else:
-                print("Please enter a number between 1 and 9.")
+                print(f"Please enter a number between 1 and {max_digits}.")
         except ValueError:
             print("Invalid input. Please enter a valid number.")
 
@@ -32,6 +67,30 @@ def get_max_guesses():
         except ValueError:
             print("Invalid input. Please enter a valid number.")
 
+def get_bot_strategy() -> str:
+    """Prompts the player to choose the bot's guess-selection strategy."""
+    strategy_names = list(STRATEGIES)
+    print("Choose the bot's strategy:")
+    for i, name in enumerate(strategy_names, start=1):
+        print(f"{i}. {name}")
+    while True:
+        choice = input(f"Enter your choice (1-{len(strategy_names)}, default 2): ").strip()
+        if not choice:
+            return strategy_names[1]
+        if choice.isdigit() and 1 <= int(choice) <= len(strategy_names):
+            return strategy_names[int(choice) - 1]
+        print(f"Please enter a number between 1 and {len(strategy_names)}.")
+
+def get_difficulty() -> bool:
+    """Asks whether to play against the adversarial host; returns True for hard mode."""
+    while True:
+        choice = input("Choose the difficulty (1. normal, 2. hard - the computer avoids committing to a number; default 1): ").strip()
+        if choice in ("", "1"):
+            return False
+        if choice == "2":
+            return True
+        print("Please enter 1 or 2.")
+
 def display_rules():
     try:
         with open('TSF_Game_Rules.txt', 'r') as file:
@@ -47,21 +106,23 @@ def display_rules():
     except Exception as e:
         print(f"Error reading rules: {e}")
 
-def get_player_guess(num_digits: int, current_guess_num: int) -> list[str]:
+def describe_digits(num_digits: int, variant: Variant) -> str:
+    """Describes what a secret looks like, e.g. '4 unique digits' or '5 symbols from 0123456789ab'."""
+    if variant == CLASSIC:
+        return f"{num_digits} unique digits"
+    kind = "symbols" if variant.allow_repeats else "unique symbols"
+    return f"{num_digits} {kind} from {variant.symbols}"
+
+def get_player_guess(session: GameSession) -> Number:
     while True:
-        player_guess_str = input(f"Enter your guess #{current_guess_num} ({num_digits} unique digits): ")
-        if len(player_guess_str) != num_digits:
-            print(f"Error: Guess must have {num_digits} digits.")
-            continue
-        if not player_guess_str.isdigit():
-            print("Error: Guess must contain only digits.")
-            continue
-        if len(set(player_guess_str)) != num_digits:
-            print("Error: Digits in guess must be unique.")
-            continue
-        return list(player_guess_str)
+        player_guess_str = input(f"Enter your guess #{session.guesses_taken + 1} "
+                                 f"({describe_digits(session.num_digits, session.variant)}): ")
+        try:
+            return session.parse_guess(player_guess_str)
+        except ValueError as e:
+            print(f"Error: {e}")
 
-def get_clues_from_player(num_digits: int, bot_guess_str: str) -> list[str]:
+def get_clues_from_player(num_digits: int, bot_guess_str: str) -> Clue:
     """Prompts the human player for clues for the bot's guess and validates them."""
     while True:
         clue_input = input(f"Enter clues for bot's guess '{bot_guess_str}' (e.g., TSF, {num_digits} characters): ").upper()
@@ -71,79 +132,125 @@ def get_clues_from_player(num_digits: int, bot_guess_str: str) -> list[str]:
         if not all(c in 'TSF' for c in clue_input):
             print("Error: Clues can only contain 'T', 'S', or 'F'.")
             continue
-        return list(clue_input)
+        return Clue.from_symbols(clue_input)
 
 def play_human_guesses_mode():
     print("\n--- Mode: You Guess Computer's Number ---")
-    num_digits = get_num_digits()
+    variant = get_variant()
+    num_digits = get_num_digits(variant)
     max_guesses = get_max_guesses()
+    # The adversarial host only plays the classic game.
+    hard_mode = variant == CLASSIC and get_difficulty()
 
     try:
-        secret_num_list = generate_secret_number(num_digits)
+        if hard_mode:
+            session = AdversarialGameSession(num_digits, max_guesses)
+        else:
+            session = GameSession(num_digits, max_guesses, variant=variant)
     except ValueError as e:
         print(f"Error setting up game: {e}")
         return 
 
-    print(f'\nI have thought up a {num_digits}-digit number.')
+    print(f'\nI have thought up a number of {describe_digits(num_digits, variant)}.')
     print(f'You have {max_guesses} guesses to get it.')
-    # print(f"Hint (for debugging): The secret number is {''.join(secret_num_list)}")
-
-    num_guesses_taken = 0
-    game_won = False
+    # print(f"Hint (for debugging): The secret number is {''.join(session.secret_number)}")
 
-    while num_guesses_taken < max_guesses:
-        num_guesses_taken += 1
-        player_guess_list = get_player_guess(num_digits, num_guesses_taken)
+    while not session.is_over:
+        player_guess = get_player_guess(session)
 
         try:
-            clues = calculate_clues(player_guess_list, secret_num_list)
+            clues = session.submit_guess(player_guess)
         except ValueError as e:
             print(f"Error calculating clues: {e}. Please try your guess again.")
-            num_guesses_taken -= 1 
             continue
 
-        clues_str_display = " ".join(clues)
+        clues_str_display = " ".join(clues.symbols())
         print(f"Clues: {clues_str_display}")
 
-        if all(c == 'T' for c in clues):
+        if session.won:
             print('Congratulations! You got it!')
-            game_won = True
-            break
     
-    if not game_won:
+    if not session.won:
         print('\nYou ran out of guesses.')
-        print(f"The answer was {''.join(secret_num_list)}.")
+        print(f"The answer was {session.secret_number}.")
+
+    # The game log stores classic numbers only.
+    game_log = get_game_log() if variant == CLASSIC else None
+    if game_log is not None:
+        mode = HARD_HUMAN_GUESSER if hard_mode else HUMAN_GUESSER
+        game_log.record_game(mode, SOURCE_CLI, num_digits, max_guesses, session.secret_number,
+                             encode_moves(session.history), session.started_at)
 
 def play_bot_guesses_mode():
     print("\n--- Mode: Bot Guesses Your Number ---")
-    num_digits = get_num_digits()
+    variant = get_variant()
+    num_digits = get_num_digits(variant)
     max_guesses = get_max_guesses()
+    # Other variants are played by the random consistent strategy (see bots.SolverBotPlayer).
+    strategy_name = get_bot_strategy() if variant == CLASSIC else RandomConsistentStrategy.name
 
-    print(f"\nOkay, think of a {num_digits}-digit number with unique digits.")
+    print(f"\nOkay, think of a number of {describe_digits(num_digits, variant)}.")
     input("Press Enter when you have your number and are ready for the bot to start guessing...")
 
-    bot = BotPlayer(num_digits)
-    bot_guesses_taken = 0
-    bot_won = False
+    feedback_table = None
+    if variant == CLASSIC and num_digits <= MAX_TABLE_DIGITS:
+        # Shared, memory-mapped table; built and cached on disk the first time only.
+        if not os.path.exists(table_path(num_digits)):
+            print("Preparing the bot's feedback table. This only happens the first time...")
+        try:
+            feedback_table = load_feedback_table(num_digits)
+        except OSError as e:
+            print(f"Could not load the feedback table cache ({e}). Continuing without it.")
 
-    while bot_guesses_taken < max_guesses:
-        bot_guesses_taken += 1
-        bot_guess_list = bot.generate_guess()
-        bot_guess_str = "".join(bot_guess_list)
-        
-        print(f"\nBot's guess #{bot_guesses_taken}: {bot_guess_str}")
-        
-        player_clues_list = get_clues_from_player(num_digits, bot_guess_str)
-        
-        bot.update_strategy(bot_guess_list, player_clues_list)
+    # Use a precomputed opening book if one was generated for this strategy (see opening_book.py).
+    opening_book_file = book_path(num_digits, strategy_name)
+    use_book = variant == CLASSIC and os.path.exists(opening_book_file)
+    opening_book = OpeningBook(opening_book_file) if use_book else None
 
-        if all(c == 'T' for c in player_clues_list):
-            print(f"\nBot guessed your number '{bot_guess_str}' in {bot_guesses_taken} tries! Well done, Bot!")
-            bot_won = True
-            break
-    
-    if not bot_won:
-        print(f"\nBot ran out of guesses after {max_guesses} tries. You stumped the bot!")
+    # Large classic games filter the bot's candidates across all cores.
+    candidates = None
+    if variant == CLASSIC and num_digits >= PARALLEL_MIN_DIGITS and (os.cpu_count() or 1) > 1:
+        candidates = SharedCandidateSet(num_digits)
+
+    try:
+        bot = SolverBotPlayer(num_digits, feedback_table, make_strategy(strategy_name), opening_book,
+                              variant=variant, candidates=candidates)
+        bot_guesses_taken = 0
+        bot_won = False
+        history: list[tuple[Number, Clue]] = []
+        started_at = time.time()
+
+        while bot_guesses_taken < max_guesses:
+            bot_guesses_taken += 1
+            bot_guess = bot.generate_guess()
+            bot_guess_str = str(bot_guess)
+
+            print(f"\nBot's guess #{bot_guesses_taken}: {bot_guess_str}")
+
+            player_clues = get_clues_from_player(num_digits, bot_guess_str)
+
+            bot.update_strategy(bot_guess, player_clues)
+            history.append((bot_guess, player_clues))
+
+            if player_clues.is_win:
+                print(f"\nBot guessed your number '{bot_guess_str}' in {bot_guesses_taken} tries! Well done, Bot!")
+                bot_won = True
+                break
+
+        if not bot_won:
+            print(f"\nBot ran out of guesses after {max_guesses} tries. You stumped the bot!")
+    finally:
+        # Unlink the shared memory and stop the filtering workers even if the game
+        # is interrupted (Ctrl-C, EOF, errors); the next large game starts a new pool.
+        if candidates is not None:
+            candidates.close()
+            shutdown_filter_pool()
+
+    game_log = get_game_log() if variant == CLASSIC else None
+    if game_log is not None:
+        # The player's secret is only known if the bot found it.
+        game_log.record_game(BOT_GUESSER, SOURCE_CLI, num_digits, max_guesses,
+                             history[-1][0] if bot_won else None, encode_moves(history), started_at)
 
 def main():
     display_rules()
@@ -0,0 +1,174 @@
+"""
+TSF Game - Adversarial Host
+
+`AdversarialGameSession` is the hard difficulty of the "player guesses the
+computer's number" game. The host never commits to a secret up front: it
+keeps every secret consistent with the clues given so far and answers each
+guess with the clues of the largest class of those secrets, so every answer
+is one a real secret would have produced and the player is left with as many
+possibilities as possible. A secret is only picked, from the survivors, once
+the game is over.
+
+Each guess partitions the surviving secrets by feedback code (vectorized
+scoring plus `np.bincount`). The first guess would have to score every
+possible secret (3,628,800 for 9 digits), but any two first guesses partition
+the space the same way up to a relabeling of the digits, so the partition of
+the guess 0, 1, ..., n-1 is computed once per digit count and the player's
+first guess is answered by relabeling the chosen class (`feedback_class`). Every later guess only
+scores the surviving secrets, which keeps each answer interactive even for
+7-9 digits.
+"""
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from core_game_logic import CLASSIC, Clue, Number, Variant, score_guesses, winning_clue_code
+from game_session import GameSession, validate_settings
+from permutation_index import NUM_SYMBOLS, rank, rank_batch
+from solver import CandidateSet, all_secret_masks, enumerate_secrets
+
+
+@lru_cache(maxsize=None)
+def opening_partition(num_digits: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Partitions every secret by its feedback to the guess 0, 1, ..., num_digits - 1.
+
+    Args:
+        num_digits: The number of digits in the game.
+
+    Returns:
+        (codes, counts): each secret's feedback code, in `enumerate_secrets`
+        order, and the number of secrets per code. Both are cached and read-only.
+    """
+    secrets = enumerate_secrets(num_digits)
+    codes = score_guesses(np.arange(num_digits, dtype=np.uint8), secrets, all_secret_masks(num_digits))
+    counts = np.bincount(codes, minlength=3 ** num_digits)
+    codes.setflags(write=False)
+    counts.setflags(write=False)
+    return codes, counts
+
+
+def feedback_class(guess: np.ndarray, code: int) -> np.ndarray:
+    """
+    Returns every secret that gives feedback `code` for `guess`, without scoring the whole space.
+
+    The canonical guess 0..n-1 maps to `guess` under a relabeling of the digits,
+    which maps the secrets giving `code` to the canonical guess (see
+    `opening_partition`) onto those giving `code` to `guess`.
+
+    Args:
+        guess: A `uint8` digit array of shape (num_digits,).
+        code: A feedback code.
+
+    Returns:
+        A `uint8` array of shape (K, num_digits), one secret per row, in no particular order.
+    """
+    num_digits = len(guess)
+    relabel = np.empty(NUM_SYMBOLS, dtype=np.uint8)
+    relabel[:num_digits] = guess
+    relabel[num_digits:] = np.setdiff1d(np.arange(NUM_SYMBOLS), guess)
+    codes, _ = opening_partition(num_digits)
+    return relabel[enumerate_secrets(num_digits)[codes == code]]
+
+
+class AdversarialGameSession(GameSession):
+    """
+    A game against a host that answers every guess with the clues that keep the most secrets possible.
+
+    Attributes:
+        candidates (CandidateSet | None): The secrets consistent with every clue
+            so far; None until the first guess (every secret is possible).
+        rng (np.random.Generator): Breaks ties between equally large classes and
+            picks the revealed secret.
+    """
+    def __init__(self, num_digits: int, max_guesses: int, rng: np.random.Generator | None = None):
+        """
+        Starts a new game, precomputing the opening partition for `num_digits` if needed.
+
+        Args:
+            num_digits: The number of digits in the secret number.
+            max_guesses: The maximum number of guesses allowed.
+            rng: Random generator. Defaults to a freshly seeded one.
+
+        Raises:
+            ValueError: If the settings are out of range.
+        """
+        validate_settings(num_digits, max_guesses)
+        self.num_digits: int = num_digits
+        self.max_guesses: int = max_guesses
+        self.variant: Variant = CLASSIC
+        self.history: list[tuple[Number, Clue]] = []
+        self.won: bool = False
+        self.rng: np.random.Generator = rng if rng is not None else np.random.default_rng()
+        self.candidates: CandidateSet | None = None
+        self._secret: Number | None = None
+        opening_partition(num_digits)
+        self.started_at: float = time.time()
+
+    @property
+    def secret_number(self) -> Number:
+        """
+        The secret number.
+
+        Once the game is over the host commits to one secret consistent with
+        every clue (the last guess, if the player won). Before that, each read
+        returns some currently consistent secret, which later answers may rule out.
+        """
+        if self._secret is not None:
+            return self._secret
+        if self.won:
+            self._secret = self.history[-1][0]
+            return self._secret
+        if self.candidates is None:
+            digits = self.rng.permutation(NUM_SYMBOLS)[:self.num_digits]
+        else:
+            digits = self.candidates.digits[self.rng.integers(len(self.candidates))]
+        secret = Number.from_digits(digits.tolist())
+        if self.is_over:
+            self._secret = secret
+        return secret
+
+    def submit_guess(self, guess: Number) -> Clue:
+        """
+        Answers a guess with the clues of the largest class of consistent secrets, and records it.
+
+        Args:
+            guess: A validated guess (see `game_session.parse_guess`).
+
+        Returns:
+            The clues for the guess. They are all 'T' only if the guess is the
+            last secret still consistent with the clues.
+
+        Raises:
+            ValueError: If the game is already over.
+        """
+        if self.is_over:
+            raise ValueError("The game is already over.")
+        guess_digits = guess.to_array()
+        if self.candidates is None:
+            codes, counts = opening_partition(self.num_digits)
+        else:
+            codes = self.candidates.scores(guess_digits)
+            counts = np.bincount(codes, minlength=3 ** self.num_digits)
+        code = self._choose_code(counts)
+
+        if self.candidates is None:
+            members = feedback_class(guess_digits, code)
+            self.candidates = CandidateSet(self.num_digits, indices=np.sort(rank_batch(members)))
+            self.candidates.history = ((rank(guess_digits), code),)
+        else:
+            self.candidates = self.candidates.subset(codes == code, (rank(guess_digits), code))
+
+        clues = Clue(int(code), self.num_digits)
+        self.history.append((guess, clues))
+        self.won = clues.is_win
+        return clues
+
+    def _choose_code(self, counts: np.ndarray) -> int:
+        # The largest class wins, and the winning code loses every tie, so it is only given when the
+        # guess is the last candidate. Other ties are broken at random so the answers follow no pattern.
+        weights = counts.astype(np.int64) * 2
+        weights[winning_clue_code(self.num_digits)] -= 1
+        best = np.flatnonzero(weights == weights.max())
+        return int(best[self.rng.integers(len(best))]) if len(best) > 1 else int(best[0])
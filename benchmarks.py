@@ -0,0 +1,240 @@
+"""
+TSF Game - Benchmark Suite
+
+Measures the game's hot paths for every digit count from 1 to 9:
+
+- `calculate_clues` and `score_guess` calls per second.
+- `generate_secret_number` secrets per second, and `generate_secrets` bulk
+  secrets per second.
+- `BotPlayer.generate_guess` and `BotPlayer.update_strategy` latency
+  percentiles (milliseconds), over full games.
+- End-to-end simulated games per second (bot vs. secret, as in
+  `simulation.play_game`).
+
+Results are printed as JSON. With a baseline file, every metric is compared
+against its baseline value and the run fails (exit status 1) if any metric is
+worse by more than the threshold: lower throughput or higher latency.
+
+Run it from the command line, e.g.:
+    python benchmarks.py --save-baseline benchmark_baseline.json
+    python benchmarks.py --baseline benchmark_baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+from bots import BotPlayer
+from core_game_logic import Number, calculate_clues, generate_secret_number, generate_secrets, score_guess
+from simulation import HEURISTIC_BOT, make_bot, play_game
+from strategies import STRATEGIES
+
+DEFAULT_THRESHOLD: float = 0.25
+DEFAULT_MIN_TIME: float = 0.5
+QUICK_MIN_TIME: float = 0.1
+
+# Latency changes smaller than this are timer noise and never count as regressions.
+LATENCY_NOISE_FLOOR_MS: float = 0.05
+
+# Pre-generated inputs per timing loop, so input generation is not measured.
+_INPUT_POOL_SIZE = 1000
+
+
+def _metric(value: float, unit: str, higher_is_better: bool) -> dict:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def _rate(func, args_pool: list[tuple], min_time: float) -> float:
+    """ Calls `func` over `args_pool` repeatedly for at least `min_time` seconds and returns calls per second. """
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for args in args_pool:
+            func(*args)
+        calls += len(args_pool)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def _random_number(num_digits: int) -> Number:
+    return Number.from_digits(generate_secret_number(num_digits))
+
+
+def _percentiles_ms(samples: list[float]) -> dict[str, float]:
+    p50, p90, p99 = np.percentile(np.asarray(samples) * 1000.0, [50, 90, 99])
+    return {"p50": float(p50), "p90": float(p90), "p99": float(p99)}
+
+
+def bench_calculate_clues(num_digits: int, min_time: float) -> float:
+    """ Returns `calculate_clues` calls per second on random guess/secret pairs. """
+    pool = [(generate_secret_number(num_digits), generate_secret_number(num_digits)) for _ in range(_INPUT_POOL_SIZE)]
+    return _rate(calculate_clues, pool, min_time)
+
+
+def bench_score_guess(num_digits: int, min_time: float) -> float:
+    """ Returns `score_guess` calls per second on random guess/secret pairs. """
+    pool = [(_random_number(num_digits), _random_number(num_digits)) for _ in range(_INPUT_POOL_SIZE)]
+    return _rate(score_guess, pool, min_time)
+
+
+def bench_generate_secret_number(num_digits: int, min_time: float) -> float:
+    """ Returns `generate_secret_number` secrets generated per second. """
+    return _rate(generate_secret_number, [(num_digits,)] * _INPUT_POOL_SIZE, min_time)
+
+
+def bench_generate_secrets(num_digits: int, min_time: float, seed: int = 0, batch_size: int = 100_000) -> float:
+    """ Returns secrets generated per second by `generate_secrets`, in batches of `batch_size`. """
+    rng = np.random.default_rng(seed)
+    return _rate(generate_secrets, [(batch_size, num_digits, rng)], min_time) * batch_size
+
+
+def bench_bot_latency(num_digits: int, num_games: int, max_guesses: int = 100) -> dict[str, dict[str, float]]:
+    """
+    Times every `generate_guess` and `update_strategy` call of the heuristic bot over full games.
+
+    Returns:
+        Latency percentiles in milliseconds, keyed by method name.
+    """
+    guess_times, update_times = [], []
+    for _ in range(num_games):
+        bot = BotPlayer(num_digits)
+        secret = _random_number(num_digits)
+        for _ in range(max_guesses):
+            start = time.perf_counter()
+            guess = bot.generate_guess()
+            guess_times.append(time.perf_counter() - start)
+            clues = score_guess(guess, secret)
+            start = time.perf_counter()
+            bot.update_strategy(guess, clues)
+            update_times.append(time.perf_counter() - start)
+            if clues.is_win:
+                break
+    return {"generate_guess": _percentiles_ms(guess_times), "update_strategy": _percentiles_ms(update_times)}
+
+
+def bench_games(num_digits: int, strategy_name: str, min_time: float, max_guesses: int = 100) -> float:
+    """ Returns full simulated games per second (bot creation included). """
+    games = 0
+    start = time.perf_counter()
+    while True:
+        play_game(make_bot(num_digits, strategy_name), _random_number(num_digits), max_guesses)
+        games += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return games / elapsed
+
+
+def run_benchmarks(digit_counts: list[int], min_time: float = DEFAULT_MIN_TIME, latency_games: int = 50,
+                   strategy_name: str = HEURISTIC_BOT, seed: int = 0) -> dict:
+    """
+    Runs every benchmark for each digit count.
+
+    Args:
+        digit_counts: The digit counts to benchmark (1 to 9).
+        min_time: Minimum seconds spent timing each throughput metric.
+        latency_games: Games played per digit count for the bot latency percentiles.
+        strategy_name: Bot used for the games-per-second benchmark (see `simulation.make_bot`).
+        seed: Seed for the global `random` module, so every run uses the same inputs.
+
+    Returns:
+        A JSON-serializable report: run metadata under "meta" and, under
+        "metrics", one entry per metric name with its value, unit and direction.
+    """
+    random.seed(seed)
+    metrics = {}
+    for n in digit_counts:
+        metrics[f"calculate_clues.calls_per_sec.d{n}"] = _metric(bench_calculate_clues(n, min_time), "calls/s", True)
+        metrics[f"score_guess.calls_per_sec.d{n}"] = _metric(bench_score_guess(n, min_time), "calls/s", True)
+        metrics[f"generate_secret_number.per_sec.d{n}"] = _metric(bench_generate_secret_number(n, min_time), "calls/s", True)
+        metrics[f"generate_secrets.per_sec.d{n}"] = _metric(bench_generate_secrets(n, min_time, seed), "secrets/s", True)
+        for method, percentiles in bench_bot_latency(n, latency_games).items():
+            for name, value in percentiles.items():
+                metrics[f"bot.{method}.{name}_ms.d{n}"] = _metric(value, "ms", False)
+        metrics[f"games.{strategy_name}.per_sec.d{n}"] = _metric(bench_games(n, strategy_name, min_time), "games/s", True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "min_time": min_time,
+            "latency_games": latency_games,
+            "seed": seed,
+        },
+        "metrics": metrics,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """
+    Lists the metrics that regressed by more than `threshold` relative to `baseline`.
+
+    Metrics missing from either report are ignored, so a baseline can cover a
+    subset of digit counts. Latency increases below `LATENCY_NOISE_FLOOR_MS`
+    are ignored as timer noise.
+
+    Returns:
+        One human-readable line per regression; empty if there are none.
+    """
+    regressions = []
+    for name, metric in report["metrics"].items():
+        base = baseline.get("metrics", {}).get(name)
+        if base is None or base["value"] <= 0:
+            continue
+        ratio = metric["value"] / base["value"]
+        if metric["higher_is_better"]:
+            worse = ratio < 1 - threshold
+        else:
+            worse = ratio > 1 + threshold and metric["value"] - base["value"] > LATENCY_NOISE_FLOOR_MS
+        if worse:
+            regressions.append(f"{name}: {metric['value']:.4g} {metric['unit']} vs baseline "
+                               f"{base['value']:.4g} ({(ratio - 1) * 100:+.1f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark core scoring, bot decisions and full games.")
+    parser.add_argument("--digits", type=int, nargs="+", default=list(range(1, 10)),
+                        help="Digit counts to benchmark (default: 1 to 9).")
+    parser.add_argument("--quick", action="store_true", help="Shorter timing loops (noisier results).")
+    parser.add_argument("--latency-games", type=int, default=50, help="Games per digit count for bot latencies.")
+    parser.add_argument("--strategy", default=HEURISTIC_BOT, choices=[HEURISTIC_BOT, *STRATEGIES],
+                        help="Bot used for the games-per-second benchmark.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the benchmark inputs.")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file.")
+    parser.add_argument("--baseline", default=None, help="Baseline report to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative regression before failing (default: 0.25 = 25%%).")
+    parser.add_argument("--save-baseline", default=None, help="Write this run's report as the new baseline.")
+    args = parser.parse_args()
+
+    min_time = QUICK_MIN_TIME if args.quick else DEFAULT_MIN_TIME
+    latency_games = min(args.latency_games, 10) if args.quick else args.latency_games
+    report = run_benchmarks(args.digits, min_time, latency_games, args.strategy, args.seed)
+    text = json.dumps(report, indent=2)
+    print(text)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+TSF Game - Bot Tracing
+
+Instrumentation hooks for `bots.BotPlayer` and its subclasses. When tracing
+is enabled, every `generate_guess` and `update_strategy` call emits one event
+dict to a trace sink:
+
+    {"event": "generate_guess", "bot": "BotPlayer", "seconds": 1.2e-05,
+     "branches": ["position_fallback"], "candidate_space": 5040}
+    {"event": "update_strategy", "bot": "BotPlayer", "seconds": 8.1e-06,
+     "space_before": 5040, "space_after": 1440, "deduction_passes": 1}
+
+`branches` lists the fallback paths taken while building the guess (empty in
+the normal case). `candidate_space` is the exact number of remaining secrets
+for `SolverBotPlayer`, and for the heuristic bot the upper bound given by its
+per-position digit sets.
+
+Sinks:
+- `NullSink` (the default): tracing disabled; the bot skips all timing and
+  bookkeeping, so the only cost is one attribute check per call.
+- `MemorySink`: aggregate counters and timings in memory, optionally keeping
+  every event.
+- `JsonLinesSink`: one JSON object per line, written to a file in buffered batches.
+
+A sink can be passed to a bot explicitly, or chosen for every bot in the
+process with the TSF_BOT_TRACE environment variable: "memory", or a file path
+for JSON lines. A "{pid}" in the path is replaced by the process id, so each
+worker of a process pool writes its own file, e.g.:
+    TSF_BOT_TRACE=/tmp/bot-trace-{pid}.jsonl python simulation.py --digits 5
+"""
+import atexit
+import json
+import os
+from collections import Counter
+
+TRACE_ENV_VAR: str = "TSF_BOT_TRACE"
+
+
+class TraceSink:
+    """
+    Base class for trace sinks.
+
+    Attributes:
+        enabled (bool): False if the bot should skip tracing entirely.
+    """
+    enabled: bool = True
+
+    def record(self, event: dict):
+        """ Receives one trace event. """
+        raise NotImplementedError
+
+    def flush(self):
+        """ Writes out any buffered events. """
+
+    def close(self):
+        """ Flushes and releases any resources held by the sink. """
+        self.flush()
+
+
+class NullSink(TraceSink):
+    """ Discards everything; bots check `enabled` and skip tracing altogether. """
+    enabled = False
+
+    def record(self, event: dict):
+        pass
+
+
+class MemorySink(TraceSink):
+    """
+    Aggregates trace events in memory.
+
+    Attributes:
+        calls (Counter): Number of events per event name.
+        seconds (Counter): Total seconds spent per event name.
+        branches (Counter): Number of times each fallback branch was taken.
+        deduction_passes (int): Total deduction-loop passes in `update_strategy`.
+        events (list[dict] | None): Every event, if created with `keep_events=True`.
+    """
+    def __init__(self, keep_events: bool = False):
+        self.calls: Counter = Counter()
+        self.seconds: Counter = Counter()
+        self.branches: Counter = Counter()
+        self.deduction_passes: int = 0
+        self.events: list[dict] | None = [] if keep_events else None
+
+    def record(self, event: dict):
+        name = event["event"]
+        self.calls[name] += 1
+        self.seconds[name] += event["seconds"]
+        self.branches.update(event.get("branches", ()))
+        self.deduction_passes += event.get("deduction_passes", 0)
+        if self.events is not None:
+            self.events.append(event)
+
+    def summary(self) -> dict:
+        """ Returns the aggregates as a JSON-serializable dict. """
+        return {
+            "calls": dict(self.calls),
+            "mean_ms": {name: 1000.0 * self.seconds[name] / count for name, count in self.calls.items()},
+            "branches": dict(self.branches),
+            "deduction_passes": self.deduction_passes,
+        }
+
+
+class JsonLinesSink(TraceSink):
+    """
+    Appends events to a file as JSON lines, in batches of `buffer_events`.
+
+    Attributes:
+        path (str): The trace file.
+        buffer_events (int): Events held in memory before a write.
+    """
+    def __init__(self, path: str, buffer_events: int = 1000):
+        self.path: str = path
+        self.buffer_events: int = buffer_events
+        self._buffer: list[str] = []
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, event: dict):
+        self._buffer.append(json.dumps(event, separators=(",", ":")))
+        if len(self._buffer) >= self.buffer_events:
+            self.flush()
+
+    def flush(self):
+        if self._buffer and not self._file.closed:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer.clear()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+NULL_SINK: NullSink = NullSink()
+
+_default_sink: TraceSink | None = None
+_default_sink_pid: int | None = None
+
+
+def make_sink(spec: str | None) -> TraceSink:
+    """
+    Creates a sink from a short description.
+
+    Args:
+        spec: None, "" or "off" for `NULL_SINK`; "memory" for a `MemorySink`;
+            anything else is a JSON-lines file path ("{pid}" is replaced by the process id).
+
+    Returns:
+        The sink. File sinks are closed automatically at interpreter exit.
+    """
+    if not spec or spec.lower() == "off":
+        return NULL_SINK
+    if spec.lower() == "memory":
+        return MemorySink()
+    sink = JsonLinesSink(spec.replace("{pid}", str(os.getpid())))
+    atexit.register(sink.close)
+    return sink
+
+
+def default_sink() -> TraceSink:
+    """ Returns the process-wide sink selected by the TSF_BOT_TRACE environment variable. """
+    global _default_sink, _default_sink_pid
+    # Forked workers get their own sink instead of sharing the parent's file buffer.
+    if _default_sink is None or _default_sink_pid != os.getpid():
+        _default_sink = make_sink(os.environ.get(TRACE_ENV_VAR))
+        _default_sink_pid = os.getpid()
+    return _default_sink
@@ -6,8 +6,48 @@ strategy for an AI player in the TSF (Ten Sefirot Finder) game.
 The bot maintains a knowledge base derived from clues received on its guesses
 and uses this knowledge to generate subsequent, more informed guesses.
 This bot is designed to be used in the "Bot Guesses Your Number" mode of TSF_Game.py.
+
+`SolverBotPlayer` extends the heuristic bot with an exact candidate set (see
+`candidate_bitsets.py`) and picks its guesses with a pluggable strategy (see `strategies.py`).
+
+Both bots can report per-call timings, fallback branches, candidate-space
+sizes and deduction passes to a trace sink (see `bot_tracing.py`).
 """
+import math
 import random
+import time
+
+import numpy as np
+
+from bot_tracing import TraceSink, default_sink
+from candidate_bitsets import BitsetCandidateSet
+from core_game_logic import CLASSIC, CLUE_VALUES, MAX_SYMBOLS, SYMBOLS, Clue, Number, Variant
+from opening_book import OpeningBook
+from parallel_filter import SharedCandidateSet
+from strategies import GuessStrategy, RandomConsistentStrategy
+from variant_space import VariantCandidateSet
+
+ALL_DIGITS_MASK: int = (1 << 10) - 1 # Bits 0-9 set: every digit of the classic game possible
+
+# Per-position clue values in a `Clue` code.
+CLUE_T: int = CLUE_VALUES['T']
+CLUE_S: int = CLUE_VALUES['S']
+CLUE_F: int = CLUE_VALUES['F']
+
+def mask_to_digits(mask: int) -> list[str]:
+    """ Returns the digit symbols whose bits are set in a digit mask, in ascending order. """
+    return [SYMBOLS[d] for d in range(MAX_SYMBOLS) if mask >> d & 1]
+
+def mask_to_ints(mask: int) -> list[int]:
+    """ Returns the digit values whose bits are set in a digit mask, in ascending order. """
+    return [d for d in range(MAX_SYMBOLS) if mask >> d & 1]
+
+def digits_to_mask(digits) -> int:
+    """ Returns the digit mask with a bit set for each digit (symbol string or int) in `digits`. """
+    mask = 0
+    for d in digits:
+        mask |= 1 << (int(d, 16) if isinstance(d, str) else int(d))
+    return mask
 
 class BotPlayer:
     """
@@ -17,9 +57,15 @@ class BotPlayer:
     it receives for its previous guesses. It maintains an internal state representing
     its current knowledge about the secret number.
 
+    The knowledge base is stored as integer masks (bit `d` set means digit `d`),
+    so deduction runs on bitwise operations and `snapshot`/`restore` only copy a
+    handful of ints. The set-valued attributes below are read-only views built from
+    those masks.
+
     Attributes:
         num_digits (int): The number of digits in the secret number.
-        all_possible_digits (list[str]): A list of all possible digits ('0' through '9').
+        variant (Variant): The alphabet and repeat policy of the game.
+        all_possible_digits (list[str]): A list of all possible digits ('0' through '9' in the classic game).
         possible_digits_per_position (list[set[str]]): For each position in the secret number,
             a set of digits that could potentially be in that position.
         known_correct_misplaced (set[str]): A set of digits known to be in the secret
@@ -28,34 +74,99 @@ class BotPlayer:
             a position in the secret number. If a digit is confirmed for a position,
             it's stored as a string at that index; otherwise, None.
         eliminated_digits (set[str]): A set of digits known not to be in the secret number at all.
-        last_guess (list[str]): The most recent guess made by the bot.
+        last_guess (Number | None): The most recent guess made by the bot.
+        tracer (TraceSink): Receives a trace event per `generate_guess` and
+            `update_strategy` call when its `enabled` flag is set.
     """
-    def __init__(self, num_digits: int):
+    def __init__(self, num_digits: int, tracer: TraceSink | None = None, variant: Variant = CLASSIC):
         """
         Initializes the BotPlayer.
 
         Args:
-            num_digits: The number of unique digits in the secret number the bot will try to guess.
+            num_digits: The number of digits in the secret number the bot will try to guess.
+            tracer: Trace sink for instrumentation. Defaults to the sink selected by
+                the TSF_BOT_TRACE environment variable (disabled if unset).
+            variant: The alphabet and repeat policy. Defaults to unique digits 0-9.
         """
         self.num_digits: int = num_digits
-        self.all_possible_digits: list[str] = [str(i) for i in range(10)]
+        self.tracer: TraceSink = tracer if tracer is not None else default_sink()
+        self.variant: Variant = variant
+        self.all_possible_digits: list[str] = list(variant.symbols)
+        self.all_digits_mask: int = (1 << variant.alphabet_size) - 1
         
         # --- Bot's Knowledge Base Initialization ---
         # For each position, initially all digits are possible.
-        self.possible_digits_per_position: list[set[str]] = [set(self.all_possible_digits) for _ in range(num_digits)]
+        self.possible_masks: list[int] = [self.all_digits_mask] * num_digits
         
         # Digits known to be in the number but not in the right place yet.
-        self.known_correct_misplaced: set[str] = set()
+        self.misplaced_mask: int = 0
         
-        # Digits confirmed to be at a specific position. `None` means unknown.
-        self.confirmed_digits_at_position: list[str | None] = [None] * num_digits
+        # Digit confirmed at each position. -1 means unknown.
+        self.confirmed_digits: list[int] = [-1] * num_digits
         
         # Digits confirmed NOT to be in the number at all.
-        self.eliminated_digits: set[str] = set()
+        self.eliminated_mask: int = 0
 
-        self.last_guess: list[str] = [] # Stores the last guess made by the bot for reference.
+        self.last_guess: Number | None = None # Stores the last guess made by the bot for reference.
 
-    def generate_guess(self) -> list[str]:
+    # --- Set-based views of the knowledge base ---
+
+    @property
+    def possible_digits_per_position(self) -> list[set[str]]:
+        return [set(mask_to_digits(mask)) for mask in self.possible_masks]
+
+    @property
+    def known_correct_misplaced(self) -> set[str]:
+        return set(mask_to_digits(self.misplaced_mask))
+
+    @property
+    def confirmed_digits_at_position(self) -> list[str | None]:
+        return [None if d < 0 else SYMBOLS[d] for d in self.confirmed_digits]
+
+    @property
+    def eliminated_digits(self) -> set[str]:
+        return set(mask_to_digits(self.eliminated_mask))
+
+    def snapshot(self) -> tuple:
+        """
+        Captures the knowledge base as an immutable, hashable tuple of ints.
+
+        Returns:
+            A value accepted by `restore`.
+        """
+        return (tuple(self.possible_masks), self.misplaced_mask, tuple(self.confirmed_digits), self.eliminated_mask)
+
+    def restore(self, state: tuple):
+        """ Restores a knowledge base captured by `snapshot`. """
+        possible_masks, self.misplaced_mask, confirmed_digits, self.eliminated_mask = state
+        self.possible_masks = list(possible_masks)
+        self.confirmed_digits = list(confirmed_digits)
+
+    def candidate_space_size(self) -> int:
+        """
+        Returns an upper bound on the number of secrets still possible: the product
+        of the per-position digit set sizes.
+        """
+        return math.prod(mask.bit_count() for mask in self.possible_masks)
+
+    def generate_guess(self) -> Number:
+        """
+        Generates the bot's next guess, recording a trace event if tracing is enabled.
+
+        Returns:
+            The bot's guess.
+        """
+        if not self.tracer.enabled:
+            return self._generate_guess([])
+        start = time.perf_counter()
+        branches: list[str] = []
+        guess = self._generate_guess(branches)
+        self.tracer.record({"event": "generate_guess", "bot": type(self).__name__,
+                            "seconds": time.perf_counter() - start, "branches": branches,
+                            "candidate_space": self.candidate_space_size()})
+        return guess
+
+    def _generate_guess(self, branches: list[str]) -> Number:
         """
         Generates the bot's next guess based on its current knowledge.
         The strategy involves several steps:
@@ -63,196 +174,360 @@ class BotPlayer:
         2. Attempt to place digits known to be correct but misplaced ('S' clues)
            into plausible remaining slots.
         3. Fill any remaining slots with digits that are still possible for those
-           positions, ensuring uniqueness and avoiding eliminated digits.
+           positions, avoiding eliminated digits and (unless the variant allows
+           repeats) digits already used.
         4. Includes fallback mechanisms for complex or constrained scenarios.
 
+        Args:
+            branches: Receives the name of each fallback branch taken.
+
         Returns:
-            A list of strings representing the bot's guess.
-            Example: ['1', '2', '3']
+            The bot's guess.
         """
-        guess: list[str | None] = [None] * self.num_digits
-        used_digits_in_current_guess: set[str] = set()
+        guess: list[int | None] = [None] * self.num_digits
+        used_mask = 0 # Digits already used in the current guess
 
         # Step 1: Fill in confirmed digits
         for i in range(self.num_digits):
-            if self.confirmed_digits_at_position[i] is not None:
-                guess[i] = self.confirmed_digits_at_position[i]
-                used_digits_in_current_guess.add(guess[i])
+            if self.confirmed_digits[i] >= 0:
+                guess[i] = self.confirmed_digits[i]
+                used_mask |= 1 << self.confirmed_digits[i]
 
         # Step 2: Try to use known_correct_misplaced digits in new, valid positions
         # Shuffle to introduce some randomness if multiple misplaced digits could fit.
-        available_misplaced = list(self.known_correct_misplaced - used_digits_in_current_guess)
+        available_misplaced = mask_to_ints(self.misplaced_mask & ~used_mask)
         random.shuffle(available_misplaced)
 
         for i in range(self.num_digits):
             if guess[i] is None: # If position not yet filled by a confirmed digit
                 for digit in available_misplaced:
+                    bit = 1 << digit
                     # Check if this misplaced digit is possible at this position and not already used in this guess
-                    if digit in self.possible_digits_per_position[i] and digit not in used_digits_in_current_guess:
+                    if self.possible_masks[i] & bit and not used_mask & bit:
                         guess[i] = digit
-                        used_digits_in_current_guess.add(digit)
+                        used_mask |= bit
                         break # Digit placed, move to the next position in the guess
 
         # Step 3: Fill remaining slots with other possible digits
         for i in range(self.num_digits):
             if guess[i] is None: # If position still not filled
                 # Candidates are those possible for this position, not yet used in this guess, and not globally eliminated.
-                candidates = list(
-                    self.possible_digits_per_position[i] - 
-                    used_digits_in_current_guess - 
-                    self.eliminated_digits
-                )
+                candidates = mask_to_ints(self.possible_masks[i] & ~used_mask & ~self.eliminated_mask)
+                if not candidates and self.variant.allow_repeats:
+                    # Repeats are allowed, so reuse a digit rather than fall back.
+                    candidates = mask_to_ints(self.possible_masks[i] & ~self.eliminated_mask)
                 random.shuffle(candidates) # Randomize choice among valid candidates
                 
                 if candidates:
                     guess[i] = candidates[0]
-                    used_digits_in_current_guess.add(guess[i])
+                    used_mask |= 1 << guess[i]
                 else:
                     # Fallback strategy: If no candidates from position-specific list,
                     # try any digit not yet used and not eliminated.
                     # This can happen if initial assumptions or clue interpretations were too restrictive.
-                    fallback_candidates = list(set(self.all_possible_digits) - used_digits_in_current_guess - self.eliminated_digits)
+                    branches.append("position_fallback")
+                    fallback_candidates = mask_to_ints(self.all_digits_mask & ~used_mask & ~self.eliminated_mask)
                     random.shuffle(fallback_candidates)
                     if fallback_candidates:
                         guess[i] = fallback_candidates[0]
-                        used_digits_in_current_guess.add(guess[i])
+                        used_mask |= 1 << guess[i]
                     else:
                         # This is a critical state, implying a contradiction or that all digits are somehow accounted for or eliminated.
                         # This should be extremely rare with num_digits <= 10.
                         # For robustness, assign a placeholder or raise an error.
                         # Current behavior: print warning and use a random available digit, which might violate some constraint.
-                        print(f"Warning: Bot in critical state at generate_guess. Position {i}, Used: {used_digits_in_current_guess}, Eliminated: {self.eliminated_digits}")
-                        remaining_options = [d for d in self.all_possible_digits if d not in used_digits_in_current_guess]
+                        branches.append("critical_state")
+                        print(f"Warning: Bot in critical state at generate_guess. Position {i}, Used: {set(mask_to_digits(used_mask))}, Eliminated: {self.eliminated_digits}")
+                        remaining_options = mask_to_ints(self.all_digits_mask & ~used_mask)
                         if remaining_options:
                              guess[i] = random.choice(remaining_options)
-                             used_digits_in_current_guess.add(guess[i])
-                        else: # Should ideally not be reached if num_digits <= 10
-                             guess[i] = '?' # Placeholder for error
+                             used_mask |= 1 << guess[i]
+                        # Otherwise (should not be reached if num_digits <= 10) the position stays None for the final fill.
 
-        # Final check: Ensure all elements in guess are strings and the guess has unique digits.
+        # Final check: Ensure every position is filled and (unless repeats are allowed) the guess has unique digits.
         # The logic above should strive for this, but this is a safeguard.
-        current_guess_set = {g for g in guess if g is not None and g != '?'}
-        if len(current_guess_set) != self.num_digits or any(g is None or g == '?' for g in guess):
-            # Attempt to fill Nones or '?' with unique digits not yet used.
+        current_guess_mask = digits_to_mask(g for g in guess if g is not None)
+        repeated = not self.variant.allow_repeats and current_guess_mask.bit_count() != self.num_digits
+        if repeated or any(g is None for g in guess):
+            # Attempt to fill Nones with unique digits not yet used.
             # This is a more robust fallback for ensuring guess length and uniqueness.
-            final_fill_digits = list(set(self.all_possible_digits) - current_guess_set - self.eliminated_digits)
+            branches.append("final_fill")
+            final_fill_digits = mask_to_ints(self.all_digits_mask & ~current_guess_mask & ~self.eliminated_mask)
             random.shuffle(final_fill_digits)
             for i in range(self.num_digits):
-                if guess[i] is None or guess[i] == '?':
+                if guess[i] is None:
                     if final_fill_digits:
                         new_digit = final_fill_digits.pop(0)
                         guess[i] = new_digit
-                        current_guess_set.add(new_digit) # Keep track of used digits for this final fill
+                        current_guess_mask |= 1 << new_digit # Keep track of used digits for this final fill
                     else:
                         # If still can't fill, indicates a severe issue with bot's state or constraints.
+                        branches.append("critical_error")
                         print(f"CRITICAL ERROR: Bot cannot form a complete unique guess of length {self.num_digits}. Current constructed guess: {guess}")
-                        guess[i] = random.choice(list(set(self.all_possible_digits) - current_guess_set)) if set(self.all_possible_digits) - current_guess_set else 'X' # Last resort placeholder
+                        unused_digits = mask_to_ints(self.all_digits_mask & ~current_guess_mask)
+                        guess[i] = random.choice(unused_digits) if unused_digits else 0 # Last resort placeholder
 
-        self.last_guess = [str(g) for g in guess] # Ensure all elements are strings
+        self.last_guess = Number.from_digits(guess)
         return self.last_guess
 
 
-    def update_strategy(self, guess: list[str], clues: list[str]):
+    def update_strategy(self, guess: Number, clues: Clue):
+        """
+        Updates the bot's knowledge base, recording a trace event if tracing is enabled.
+
+        Args:
+            guess: The bot's last guess.
+            clues: The clues received for that guess.
+        """
+        if not self.tracer.enabled:
+            self._update_strategy(guess, clues)
+            return
+        space_before = self.candidate_space_size()
+        start = time.perf_counter()
+        deduction_passes = self._update_strategy(guess, clues)
+        elapsed = time.perf_counter() - start
+        self.tracer.record({"event": "update_strategy", "bot": type(self).__name__, "seconds": elapsed,
+                            "space_before": space_before, "space_after": self.candidate_space_size(),
+                            "deduction_passes": deduction_passes})
+
+    def _update_strategy(self, guess: Number, clues: Clue) -> int:
         """
         Updates the bot's knowledge base based on the last guess and the clues received.
 
         Args:
-            guess: The bot's last guess (list of strings).
-            clues: The clues received for that guess (list of strings: 'T', 'S', 'F').
+            guess: The bot's last guess.
+            clues: The clues received for that guess, one value per position:
                    'T' = Correct digit, correct position.
                    'S' = Correct digit, wrong position.
                    'F' = Incorrect digit (not in the secret number).
+
+        Returns:
+            The number of passes made by the deduction loop.
         """
-        if len(guess) != self.num_digits or len(clues) != self.num_digits:
+        if guess.num_digits != self.num_digits or clues.num_digits != self.num_digits:
             # print(f"Error: Bot received guess/clues length mismatch. Guess: {len(guess)}, Clues: {len(clues)}, Expected: {self.num_digits}")
-            return # Or raise an error
+            return 0 # Or raise an error
 
+        possible_masks = self.possible_masks
+        packed_guess, code = guess.packed, clues.code
         for i in range(self.num_digits):
-            digit_in_guess = guess[i]
-            clue_for_digit = clues[i]
-
-            if clue_for_digit == 'T':
-                # Digit is confirmed at this position
-                self.confirmed_digits_at_position[i] = digit_in_guess
-                self.possible_digits_per_position[i] = {digit_in_guess} # Only this digit is possible here
-                self.known_correct_misplaced.discard(digit_in_guess) # No longer just 'misplaced'
-                self.eliminated_digits.discard(digit_in_guess) # Cannot be eliminated if it's 'T'
-                
-                # Remove this confirmed digit from possibilities of all OTHER positions
-                for j in range(self.num_digits):
-                    if i != j:
-                        self.possible_digits_per_position[j].discard(digit_in_guess)
+            digit_in_guess = packed_guess & 15
+            packed_guess >>= 4
+            bit = 1 << digit_in_guess
+            code, clue_for_digit = divmod(code, 3)
+
+            if clue_for_digit == CLUE_T:
+                # Digit is confirmed at this position; without repeats, remove it from all OTHER positions
+                if not self.variant.allow_repeats:
+                    for j in range(self.num_digits):
+                        possible_masks[j] &= ~bit
+                self.confirmed_digits[i] = digit_in_guess
+                possible_masks[i] = bit # Only this digit is possible here
+                self.misplaced_mask &= ~bit # No longer just 'misplaced'
+                self.eliminated_mask &= ~bit # Cannot be eliminated if it's 'T'
 
-            elif clue_for_digit == 'S':
+            elif clue_for_digit == CLUE_S:
                 # Digit is in the number, but NOT at this position
-                self.known_correct_misplaced.add(digit_in_guess)
-                self.possible_digits_per_position[i].discard(digit_in_guess) # Cannot be at this position
-                self.eliminated_digits.discard(digit_in_guess) # Cannot be eliminated if it's 'S'
+                self.misplaced_mask |= bit
+                possible_masks[i] &= ~bit # Cannot be at this position
+                self.eliminated_mask &= ~bit # Cannot be eliminated if it's 'S'
 
-            elif clue_for_digit == 'F':
+            elif clue_for_digit == CLUE_F:
                 # Digit is not in the secret number at all
-                self.eliminated_digits.add(digit_in_guess)
-                self.known_correct_misplaced.discard(digit_in_guess) # Cannot be misplaced if it's not in number
+                self.eliminated_mask |= bit
+                self.misplaced_mask &= ~bit # Cannot be misplaced if it's not in number
                 # Remove from all positions' possibilities
                 for j in range(self.num_digits):
-                    self.possible_digits_per_position[j].discard(digit_in_guess)
+                    possible_masks[j] &= ~bit
 
         # --- Post-clue processing refinements ---
 
         # 1. Ensure consistency: if a digit is confirmed, it's not misplaced.
-        for confirmed_digit in self.confirmed_digits_at_position:
-            if confirmed_digit is not None:
-                self.known_correct_misplaced.discard(confirmed_digit)
+        self.misplaced_mask &= ~digits_to_mask(d for d in self.confirmed_digits if d >= 0)
 
         # 2. If a digit is eliminated, ensure it's removed from all position possibilities.
         # (This is often handled by 'F' logic but serves as a good safeguard).
-        for elim_digit in self.eliminated_digits:
-            for i in range(self.num_digits):
-                self.possible_digits_per_position[i].discard(elim_digit)
+        for i in range(self.num_digits):
+            possible_masks[i] &= ~self.eliminated_mask
         
         # 3. Deduction: If a 'known_correct_misplaced' digit can only fit in one remaining
-        #    unconfirmed slot (based on `possible_digits_per_position`), then confirm it there.
-        non_confirmed_indices = [k for k, d_val in enumerate(self.confirmed_digits_at_position) if d_val is None]
+        #    unconfirmed slot (based on `possible_masks`), then confirm it there.
+        #    Repeat until a pass makes no new deduction, as one deduction can lead to others.
+        open_positions = [k for k, d_val in enumerate(self.confirmed_digits) if d_val < 0]
         
-        # Iterate multiple times or until no new deductions are made in a pass,
-        # as one deduction can lead to others. For simplicity, one pass here,
-        # but a loop `while new_deductions_made:` would be more robust.
+        deduction_passes = 0
         made_deduction_in_pass = True 
         while made_deduction_in_pass:
+            deduction_passes += 1
             made_deduction_in_pass = False
-            for m_digit in list(self.known_correct_misplaced): # Iterate over a copy as set might change
-                possible_placements_for_m_digit = []
-                for idx in non_confirmed_indices:
-                    if self.confirmed_digits_at_position[idx] is None and \
-                       m_digit in self.possible_digits_per_position[idx]:
-                        possible_placements_for_m_digit.append(idx)
+            for m_digit in range(self.variant.alphabet_size):
+                bit = 1 << m_digit
+                if not self.misplaced_mask & bit:
+                    continue
+                # Bit k of `placements` is set if position open_positions[k] can hold the digit.
+                placements = 0
+                for k, idx in enumerate(open_positions):
+                    if possible_masks[idx] & bit:
+                        placements |= 1 << k
                 
-                if len(possible_placements_for_m_digit) == 1:
-                    idx_to_confirm = possible_placements_for_m_digit[0]
+                if placements and not placements & (placements - 1): # Exactly one possible placement
+                    idx_to_confirm = open_positions[placements.bit_length() - 1]
                     # print(f"Bot deduction: Digit {m_digit} must be at position {idx_to_confirm}")
-                    self.confirmed_digits_at_position[idx_to_confirm] = m_digit
-                    self.possible_digits_per_position[idx_to_confirm] = {m_digit}
-                    self.known_correct_misplaced.discard(m_digit) # Now confirmed
-                    
-                    # This digit is now confirmed, remove it from other non-confirmed positions' possibilities
-                    for j_idx in non_confirmed_indices:
-                        if j_idx != idx_to_confirm:
-                            self.possible_digits_per_position[j_idx].discard(m_digit)
+                    self.confirmed_digits[idx_to_confirm] = m_digit
+                    possible_masks[idx_to_confirm] = bit
+                    self.misplaced_mask &= ~bit # Now confirmed
                     
-                    non_confirmed_indices.remove(idx_to_confirm) # This index is now confirmed
+                    # This digit is now confirmed; without repeats, remove it from other non-confirmed positions' possibilities
+                    open_positions.remove(idx_to_confirm) # This index is now confirmed
+                    if not self.variant.allow_repeats:
+                        for j_idx in open_positions:
+                            possible_masks[j_idx] &= ~bit
                     made_deduction_in_pass = True # Signal that a deduction was made, loop again
+        return deduction_passes
 
     def get_bot_state_for_debugging(self) -> dict:
         """ Helper method to get the bot's internal state for debugging. """
         return {
             "num_digits": self.num_digits,
-            "possible_digits_per_position": [sorted(list(s)) for s in self.possible_digits_per_position], # Sets to sorted lists
-            "known_correct_misplaced": sorted(list(self.known_correct_misplaced)),
+            "possible_digits_per_position": [mask_to_digits(m) for m in self.possible_masks], # Masks to sorted lists
+            "known_correct_misplaced": mask_to_digits(self.misplaced_mask),
             "confirmed_digits_at_position": self.confirmed_digits_at_position,
-            "eliminated_digits": sorted(list(self.eliminated_digits)),
-            "last_guess": self.last_guess
+            "eliminated_digits": mask_to_digits(self.eliminated_mask),
+            "last_guess": self.last_guess.to_list() if self.last_guess is not None else []
         }
 
+class SolverBotPlayer(BotPlayer):
+    """
+    A bot that picks its guesses from the exact set of secrets consistent with every clue.
+
+    In addition to the heuristic knowledge base inherited from `BotPlayer`, this
+    bot keeps the exact set of remaining candidate secrets and narrows it after
+    each `update_strategy` call. A pluggable `GuessStrategy` picks each guess;
+    the default strategy guesses a random candidate, so every guess could
+    actually be the answer.
+
+    In other variants (see `core_game_logic.Variant`) the candidates are tracked
+    by a `variant_space.VariantCandidateSet`, which streams them instead of
+    enumerating the space, and each guess is a random consistent candidate.
+
+    The candidate set is pluggable: `parallel_filter.SharedCandidateSet` filters
+    8-9 digit games across a worker pool instead of a single core.
+
+    Attributes:
+        candidates (BitsetCandidateSet | SharedCandidateSet | VariantCandidateSet): The secrets
+            consistent with all clues so far.
+        strategy (GuessStrategy): The strategy used to pick each guess.
+        opening_book (OpeningBook | None): Precomputed guesses for the first moves, if any.
+    """
+    def __init__(self, num_digits: int, feedback_table: np.ndarray | None = None,
+                 strategy: GuessStrategy | None = None, opening_book: OpeningBook | None = None,
+                 tracer: TraceSink | None = None, variant: Variant = CLASSIC,
+                 candidates: SharedCandidateSet | None = None):
+        """
+        Initializes the SolverBotPlayer.
+
+        Args:
+            num_digits: The number of digits in the secret number the bot will try to guess.
+            feedback_table: Optional precomputed feedback matrix for `num_digits`
+                (see `feedback_table.load_feedback_table`), used to narrow the
+                candidate set by lookup instead of scoring.
+            strategy: The guess-selection strategy. Defaults to `RandomConsistentStrategy`.
+            opening_book: Optional opening book, produced by the same strategy, consulted
+                before falling back to live search.
+            tracer: Trace sink for instrumentation (see `BotPlayer`).
+            variant: The alphabet and repeat policy. Defaults to unique digits 0-9.
+            candidates: Optional fresh candidate set to narrow instead of a new
+                `BitsetCandidateSet` (classic game, without a feedback table).
+
+        Raises:
+            ValueError: If a variant other than the classic game is combined with a
+                feedback table, an opening book or a strategy other than `RandomConsistentStrategy`,
+                or if `candidates` does not fit the game or is combined with a feedback table.
+        """
+        super().__init__(num_digits, tracer, variant)
+        self.strategy: GuessStrategy = strategy if strategy is not None else RandomConsistentStrategy()
+        self.opening_book: OpeningBook | None = opening_book
+        if candidates is not None:
+            if feedback_table is not None or variant != CLASSIC or candidates.num_digits != num_digits:
+                raise ValueError("A custom candidate set must hold classic secrets of num_digits digits "
+                                 "and cannot be combined with a feedback table.")
+            self.candidates: BitsetCandidateSet | SharedCandidateSet | VariantCandidateSet = candidates
+        elif variant == CLASSIC:
+            self.candidates = BitsetCandidateSet(num_digits, feedback_table)
+        else:
+            # Feedback tables, opening books and the partition strategies index the classic space.
+            if feedback_table is not None or opening_book is not None:
+                raise ValueError("Feedback tables and opening books only exist for the classic game.")
+            if type(self.strategy) is not RandomConsistentStrategy:
+                raise ValueError(f"Only the '{RandomConsistentStrategy.name}' strategy supports game variants.")
+            self.candidates = VariantCandidateSet(num_digits, variant)
+
+    def candidate_space_size(self) -> int:
+        """ Returns the number of secrets consistent with all clues so far (estimated for large variant spaces). """
+        if isinstance(self.candidates, VariantCandidateSet):
+            return self.candidates.size()
+        return len(self.candidates)
+
+    def _generate_guess(self, branches: list[str]) -> Number:
+        """
+        Asks the strategy to pick the next guess from the remaining candidates.
+
+        While the game is still covered by the opening book, the book's guess is
+        used instead of searching. In game variants, a random consistent secret is
+        drawn from the streamed candidates. If no candidate is left (which only happens when inconsistent clues were
+        supplied), falls back to the heuristic `BotPlayer.generate_guess`.
+
+        Args:
+            branches: Receives the name of each fallback branch taken.
+
+        Returns:
+            The bot's guess.
+        """
+        variant_guess = None
+        if isinstance(self.candidates, VariantCandidateSet):
+            variant_guess = self.candidates.sample(self.strategy.rng)
+            no_candidates = variant_guess is None
+        else:
+            no_candidates = len(self.candidates) == 0
+        if no_candidates:
+            branches.append("no_consistent_secret")
+            print("Warning: No secret is consistent with the clues received. Falling back to heuristic guess.")
+            return super()._generate_guess(branches)
+        if variant_guess is not None:
+            self.last_guess = Number.from_array(variant_guess)
+            return self.last_guess
+
+        guess = self.opening_book.lookup(self.candidates.history) if self.opening_book is not None else None
+        if guess is not None:
+            branches.append("opening_book")
+        else:
+            guess = self.strategy.choose_guess(self.candidates.view())
+        self.last_guess = Number.from_array(guess)
+        return self.last_guess
+
+    def _update_strategy(self, guess: Number, clues: Clue) -> int:
+        """
+        Updates the heuristic knowledge base and filters the candidate set.
+
+        Args:
+            guess: The bot's last guess.
+            clues: The clues received for that guess.
+
+        Returns:
+            The number of passes made by the heuristic deduction loop.
+        """
+        deduction_passes = super()._update_strategy(guess, clues)
+        if guess.num_digits != self.num_digits or clues.num_digits != self.num_digits:
+            return deduction_passes
+        self.candidates.filter(guess, clues)
+        return deduction_passes
+
+    def get_bot_state_for_debugging(self) -> dict:
+        """ Helper method to get the bot's internal state for debugging. """
+        state = super().get_bot_state_for_debugging()
+        state["remaining_candidates"] = self.candidate_space_size()
+        return state
+
 # Example Usage (for testing the bot class directly if this script is run)
 if __name__ == '__main__':
     test_num_digits = 4
@@ -268,7 +543,7 @@ if __name__ == '__main__':
     # Simulate human providing clues for guess1 against secret ['1', '2', '3', '4']
     # This part would normally be done by calling core_game_logic.calculate_clues
     # E.g., if guess1 = ['0', '5', '1', '2'], clues1 = ['F', 'F', 'S', 'S']
-    clues1 = ['F', 'F', 'S', 'S'] # Example clues if guess1 was ['0','5','1','2']
+    clues1 = Clue.from_symbols(['F', 'F', 'S', 'S']) # Example clues if guess1 was ['0','5','1','2']
     print(f"Clues for guess1: {clues1}")
     bot.update_strategy(guess1, clues1)
     print("Bot state after guess 1:", bot.get_bot_state_for_debugging())
@@ -278,7 +553,7 @@ if __name__ == '__main__':
     print(f"\nRound 2: Bot's guess: {guess2}")
     # E.g., if guess2 = ['1', '3', '8', '9'] vs secret ['1', '2', '3', '4']
     # clues2 = ['T', 'S', 'F', 'F']
-    clues2 = ['T', 'S', 'F', 'F'] # Example
+    clues2 = Clue.from_symbols(['T', 'S', 'F', 'F']) # Example
     print(f"Clues for guess2: {clues2}")
     bot.update_strategy(guess2, clues2)
     print("Bot state after guess 2:", bot.get_bot_state_for_debugging())
@@ -289,7 +564,7 @@ if __name__ == '__main__':
     # ... and so on
     # E.g., if guess3 = ['1', '2', '4', '3'] vs secret ['1', '2', '3', '4']
     # clues3 = ['T', 'T', 'S', 'S']
-    clues3 = ['T','T','S','S']
+    clues3 = Clue.from_symbols(['T','T','S','S'])
     print(f"Clues for guess3: {clues3}")
     bot.update_strategy(guess3, clues3)
     print("Bot state after guess 3:", bot.get_bot_state_for_debugging())
@@ -297,9 +572,9 @@ if __name__ == '__main__':
     # Round 4
     guess4 = bot.generate_guess()
     print(f"\nRound 4: Bot's guess: {guess4}")
-    clues4 = ['T','T','T','T'] # Assuming it gets it right
+    clues4 = Clue.from_symbols(['T','T','T','T']) # Assuming it gets it right
     print(f"Clues for guess4: {clues4}")
     bot.update_strategy(guess4, clues4)
     print("Bot state after guess 4:", bot.get_bot_state_for_debugging())
-    if all(c == 'T' for c in clues4):
+    if clues4.is_win:
         print("\nBot successfully guessed the number!")
@@ -0,0 +1,241 @@
+"""
+TSF Game - Bitset Candidate Sets
+
+`BitsetCandidateSet` stores the secrets still consistent with a game's clues
+as one bit per possible secret, over the dense index space of
+`permutation_index` (630 bytes for a 4-digit game, about 450 KB for 9 digits).
+Applying a clue is a bitwise AND with the bitset of secrets consistent with
+that (guess, clue) pair, the number of remaining secrets is a popcount, and
+iterating walks the set bits in index order.
+
+Consistency bitsets are shared through a `ConsistencyCache`: a bounded,
+thread-safe LRU keyed by (digit count, guess index, feedback code). Games that
+share an opening (every game of a deterministic strategy, or many concurrent
+players starting with the same guess) compute each opening bitset once and
+reuse it. Building a bitset scores the guess against every possible secret,
+so once only a small fraction of the space remains, clues are instead applied
+by scoring the remaining secrets directly, and those bitsets are not cached.
+
+Guess strategies work on a `solver.CandidateSet`; `BitsetCandidateSet.view()`
+materializes one, cached until the set changes.
+"""
+import threading
+from collections.abc import Iterator
+from functools import lru_cache
+
+import numpy as np
+
+from core_game_logic import Clue, Number, encode_clues, encode_digits, score_guesses
+from permutation_index import num_permutations, rank, to_bitset, unrank
+from solver import CandidateSet, History, all_secret_masks, enumerate_secrets
+from transposition import TranspositionTable
+
+# Clues are applied through (cached) full-space bitsets while at least this fraction of the space remains.
+CACHED_FILTER_MIN_FRACTION: float = 1 / 8
+
+_POPCOUNT8: np.ndarray = np.array([i.bit_count() for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits: np.ndarray) -> int:
+    """ Returns the number of set bits in a `uint8` bitset. """
+    return int(_POPCOUNT8[bits].sum(dtype=np.int64))
+
+
+@lru_cache(maxsize=None)
+def full_bitset(num_digits: int) -> np.ndarray:
+    """ Returns the read-only bitset holding every secret of `num_digits` digits. """
+    bits = to_bitset(np.arange(num_permutations(num_digits)), num_digits)
+    bits.setflags(write=False)
+    return bits
+
+
+def consistency_bitset(num_digits: int, guess_index: int, code: int,
+                       feedback_table: np.ndarray | None = None) -> np.ndarray:
+    """
+    Computes the bitset of secrets that give feedback `code` for a guess.
+
+    Args:
+        num_digits: The number of digits in the game.
+        guess_index: The guess's enumeration index (see `permutation_index.rank`).
+        code: The feedback code received.
+        feedback_table: Optional precomputed feedback matrix, used instead of scoring.
+
+    Returns:
+        A read-only `uint8` bitset over the index space.
+    """
+    if feedback_table is not None:
+        codes = feedback_table[guess_index]
+    else:
+        guess = np.array(unrank(guess_index, num_digits), dtype=np.uint8)
+        codes = score_guesses(guess, enumerate_secrets(num_digits), all_secret_masks(num_digits))
+    bits = np.packbits(codes == code, bitorder="little")
+    bits.setflags(write=False)
+    return bits
+
+
+class ConsistencyCache:
+    """
+    A bounded, thread-safe LRU of consistency bitsets.
+
+    Attributes:
+        table (TranspositionTable): The underlying LRU, with its entry limit,
+            memory cap and hit/miss statistics.
+    """
+    def __init__(self, max_entries: int = 1024, max_bytes: int | None = 64 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of bitsets kept.
+            max_bytes: Approximate memory cap in bytes, or None for no cap.
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        self.table: TranspositionTable = TranspositionTable(max_entries, max_bytes)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def get(self, num_digits: int, guess_index: int, code: int) -> np.ndarray | None:
+        """ Returns the cached bitset for a (guess, clue) pair, or None. """
+        with self._lock:
+            return self.table.get((num_digits, guess_index, code))
+
+    def consistent(self, num_digits: int, guess_index: int, code: int,
+                   feedback_table: np.ndarray | None = None) -> np.ndarray:
+        """ Returns the bitset for a (guess, clue) pair, computing and caching it if needed. """
+        bits = self.get(num_digits, guess_index, code)
+        if bits is None:
+            # Computed outside the lock; two threads may occasionally both compute the same bitset.
+            bits = consistency_bitset(num_digits, guess_index, code, feedback_table)
+            with self._lock:
+                self.table.put((num_digits, guess_index, code), bits)
+        return bits
+
+
+_default_cache: ConsistencyCache | None = None
+
+
+def default_consistency_cache() -> ConsistencyCache:
+    """ Returns the process-wide cache shared by every `BitsetCandidateSet` created without one. """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ConsistencyCache()
+    return _default_cache
+
+
+class BitsetCandidateSet:
+    """
+    The set of secrets still consistent with all clues received so far, as a bitset.
+
+    Bitsets are never modified in place (they may be shared with the cache or
+    other sets); every change replaces `bits`.
+
+    Attributes:
+        num_digits (int): The number of digits in each secret.
+        bits (np.ndarray): `uint8` bitset over the index space; bit `k % 8` of
+            byte `k // 8` is set if the secret with index k is still possible.
+        feedback_table (np.ndarray | None): Optional precomputed feedback matrix
+            (see `feedback_table.load_feedback_table`) used instead of scoring.
+        cache (ConsistencyCache): Where consistency bitsets are shared.
+        history (History): The (guess enumeration index, feedback code) pairs
+            that narrowed the set down to its current members.
+    """
+    def __init__(self, num_digits: int, feedback_table: np.ndarray | None = None,
+                 cache: ConsistencyCache | None = None):
+        """
+        Initializes the set with every possible secret.
+
+        Args:
+            num_digits: The number of unique digits in the secret number.
+            feedback_table: Optional precomputed feedback matrix for `num_digits`.
+            cache: Consistency cache. Defaults to the process-wide `default_consistency_cache()`.
+        """
+        self.num_digits: int = num_digits
+        self.bits: np.ndarray = full_bitset(num_digits)
+        self.feedback_table: np.ndarray | None = feedback_table
+        self.cache: ConsistencyCache = cache if cache is not None else default_consistency_cache()
+        self.history: History = ()
+        self._count: int = num_permutations(num_digits)
+        self._view: CandidateSet | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, number: Number | int) -> bool:
+        """ True if the secret (a `Number` or an enumeration index) is still possible. """
+        index = rank(number) if isinstance(number, Number) else number
+        return bool(self.bits[index >> 3] >> (index & 7) & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        """ Iterates over the enumeration indices of the members, in ascending order. """
+        return iter(self.indices().tolist())
+
+    def __and__(self, other: "BitsetCandidateSet") -> "BitsetCandidateSet":
+        """
+        Returns the secrets in both sets; the result's history holds both sets' clues.
+
+        Raises:
+            ValueError: If the sets are for different digit counts.
+        """
+        if other.num_digits != self.num_digits:
+            raise ValueError("Cannot intersect candidate sets for different digit counts.")
+        result = BitsetCandidateSet(self.num_digits, self.feedback_table, self.cache)
+        result.history = self.history + tuple(step for step in other.history if step not in self.history)
+        result._set_bits(self.bits & other.bits)
+        return result
+
+    def indices(self) -> np.ndarray:
+        """ Returns the sorted `int32` enumeration indices of the members. """
+        return self.view().indices
+
+    def view(self) -> CandidateSet:
+        """ Returns the members as a `solver.CandidateSet` (cached until the set changes), for strategies. """
+        if self._view is None:
+            members = np.flatnonzero(np.unpackbits(self.bits, count=num_permutations(self.num_digits),
+                                                   bitorder="little"))
+            self._view = CandidateSet(self.num_digits, self.feedback_table, members)
+            self._view.history = self.history
+        return self._view
+
+    def filter(self, guess: list[str] | Number, clues: list[str] | Clue) -> int:
+        """
+        Removes every candidate that is inconsistent with the given clues.
+
+        Args:
+            guess: The guess that was made (a `Number` or a list of digit strings).
+            clues: The clues received for that guess (a `Clue` or a list of 'T', 'S', 'F').
+
+        Returns:
+            The number of candidates remaining after filtering.
+
+        Raises:
+            ValueError: If guess or clues do not have `num_digits` entries.
+        """
+        if len(guess) != self.num_digits or len(clues) != self.num_digits:
+            raise ValueError(f"Guess and clues must both have {self.num_digits} entries.")
+        guess_index = rank(guess) if isinstance(guess, Number) else rank(encode_digits(guess))
+        code = clues.code if isinstance(clues, Clue) else encode_clues(clues)
+        step = (guess_index, code)
+
+        consistent = self.cache.get(self.num_digits, guess_index, code)
+        if consistent is None and self._count >= CACHED_FILTER_MIN_FRACTION * num_permutations(self.num_digits):
+            consistent = self.cache.consistent(self.num_digits, guess_index, code, self.feedback_table)
+        if consistent is not None:
+            self.history += (step,)
+            self._set_bits(self.bits & consistent)
+        else:
+            # Few candidates left: score just those and keep the narrowed view.
+            view = self.view()
+            guess_digits = np.array(unrank(guess_index, self.num_digits), dtype=np.uint8)
+            narrowed = view.subset(view.scores(guess_digits) == code, step)
+            self.history = narrowed.history
+            self.bits = to_bitset(narrowed.indices, self.num_digits)
+            self._count = len(narrowed)
+            self._view = narrowed
+        return self._count
+
+    def _set_bits(self, bits: np.ndarray):
+        self.bits = bits
+        self._count = popcount(bits)
+        self._view = None
@@ -4,33 +4,170 @@ Core logic for the TSF (Ten Sefirot Finder) game.
 This module provides functions to generate the secret number for the game
 and to calculate clues based on a player's guess compared to the secret number.
 It is used by both the command-line interface (TSF_Game.py) and the GUI (tsf_gui.py).
+
+For solvers and simulators it also provides a vectorized batch API: secrets and
+guesses are encoded as NumPy arrays of digit values (one row per number), and
+clues are packed into integer feedback codes, each per-position clue value
+('F' = 0, 'S' = 1, 'T' = 2) being one base-3 digit, position 0 least significant.
+`generate_secrets` draws many secrets in one call from a NumPy generator, and
+`secret_streams` derives independent, reproducible generators from one seed.
+
+Single games pass guesses, secrets and clues around as the immutable value
+types `Number` (digits packed into one int) and `Clue` (a feedback code), and
+score them with `score_guess`. Digit and clue strings only appear at the user
+interface edges (`Number.from_digits`, `Clue.from_symbols`, `str()`).
+
+The classic game uses the ten digits 0-9, each at most once. A `Variant`
+selects another alphabet of up to 16 symbols (digit values 10-15 are written
+'a'-'f', as in hexadecimal) and whether symbols may repeat. The per-position
+clue rules are the same in every variant: 'T' if the symbol is in the right
+place, otherwise 'S' if it appears anywhere in the secret, otherwise 'F'.
 """
+import math
 import random
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Per-position values of each clue in a packed feedback code.
+CLUE_VALUES: dict[str, int] = {'F': 0, 'S': 1, 'T': 2}
+CLUE_SYMBOLS: str = 'FST'
+
+# Weight of each position's clue value in a packed feedback code.
+_PLACE_VALUES: tuple[int, ...] = tuple(3 ** i for i in range(10))
+
+# Symbols for digit values 0-15; a `Number` packs 4 bits per digit, so no alphabet can be larger.
+SYMBOLS: str = "0123456789abcdef"
+MAX_SYMBOLS: int = len(SYMBOLS)
+MAX_POSITIONS: int = len(_PLACE_VALUES) # Feedback codes for more positions would not fit in a uint16
+
+
+@dataclass(frozen=True)
+class Variant:
+    """
+    The symbol alphabet and repeat policy of a game.
+
+    Attributes:
+        alphabet_size (int): Number of symbols; digit values run from 0 to alphabet_size - 1.
+        allow_repeats (bool): True if a secret (and a guess) may use a symbol more than once.
+    """
+    alphabet_size: int = 10
+    allow_repeats: bool = False
+
+    @property
+    def symbols(self) -> str:
+        """ The symbols of the alphabet, e.g. "0123456789abcdef" for 16 symbols. """
+        return SYMBOLS[:self.alphabet_size]
+
+    def max_digits(self) -> int:
+        """ Returns the largest supported number of digits in a secret. """
+        return MAX_POSITIONS if self.allow_repeats else min(self.alphabet_size, MAX_POSITIONS)
+
+    def validate(self, num_digits: int):
+        """
+        Checks the variant, and a digit count for it.
 
-def generate_secret_number(num_digits: int) -> list[str]:
+        Raises:
+            ValueError: If the alphabet size or the digit count is out of range.
+        """
+        if not isinstance(self.alphabet_size, int) or not (2 <= self.alphabet_size <= MAX_SYMBOLS):
+            raise ValueError(f"Alphabet size must be between 2 and {MAX_SYMBOLS}.")
+        if not isinstance(num_digits, int) or not (1 <= num_digits <= self.max_digits()):
+            if self.allow_repeats:
+                raise ValueError(f"Number of digits must be between 1 and {MAX_POSITIONS}.")
+            raise ValueError(f"Number of digits must be between 1 and {self.max_digits()}, as digits must be unique.")
+
+    def space_size(self, num_digits: int) -> int:
+        """ Returns the number of possible secrets with `num_digits` digits. """
+        if self.allow_repeats:
+            return self.alphabet_size ** num_digits
+        return math.perm(self.alphabet_size, num_digits)
+
+
+CLASSIC: Variant = Variant() # Ten digits, no repeats
+
+
+def generate_secret_number(num_digits: int, variant: Variant = CLASSIC) -> list[str]:
     """
-    Generates a secret number composed of unique random digits.
+    Generates a secret number composed of random digits.
 
     Args:
         num_digits: The desired number of digits in the secret number.
-                    Must be a positive integer between 1 and 10 (inclusive).
+                    Must be a positive integer between 1 and 10 (inclusive),
+                    and no more than the alphabet size unless repeats are allowed.
+        variant: The alphabet and repeat policy. Defaults to unique digits 0-9.
 
     Returns:
         A list of strings, where each string is a digit of the secret number.
         For example, if num_digits is 3, could return ['1', '2', '3'].
 
     Raises:
-        ValueError: If num_digits is not a positive integer or is greater than 10.
-    """
-    if not isinstance(num_digits, int) or num_digits <= 0:
-        raise ValueError("Number of digits must be a positive integer.")
-    if num_digits > 10: # Max 10 unique digits (0-9)
-        raise ValueError("Number of digits cannot exceed 10, as digits must be unique.")
-    
-    # Generate a sample of unique digits from 0-9
-    digits = random.sample(range(10), num_digits)
+        ValueError: If num_digits is out of range for the variant.
+    """
+    if variant == CLASSIC:
+        if not isinstance(num_digits, int) or num_digits <= 0:
+            raise ValueError("Number of digits must be a positive integer.")
+        if num_digits > 10: # Max 10 unique digits (0-9)
+            raise ValueError("Number of digits cannot exceed 10, as digits must be unique.")
+    else:
+        variant.validate(num_digits)
+
+    if variant.allow_repeats:
+        digits = [random.randrange(variant.alphabet_size) for _ in range(num_digits)]
+    else:
+        # Generate a sample of unique digits from the alphabet
+        digits = random.sample(range(variant.alphabet_size), num_digits)
     # Convert digits to strings to maintain consistency (e.g., for comparison with guesses)
-    return [str(digit) for digit in digits]
+    return [SYMBOLS[digit] for digit in digits]
+
+def generate_secrets(count: int, num_digits: int, rng: np.random.Generator,
+                     variant: Variant = CLASSIC) -> np.ndarray:
+    """
+    Generates many secret numbers at once, each a uniform random choice from the variant's secrets.
+
+    Args:
+        count: The number of secrets to generate.
+        num_digits: The number of digits in each secret (1 to 10).
+        rng: The random generator to draw from (see `secret_streams` for seeded,
+             independent generators).
+        variant: The alphabet and repeat policy. Defaults to unique digits 0-9.
+
+    Returns:
+        A `uint8` array of shape (count, num_digits), one secret per row.
+
+    Raises:
+        ValueError: If num_digits is out of range for the variant or count is negative.
+    """
+    if variant == CLASSIC:
+        if not isinstance(num_digits, int) or not (1 <= num_digits <= 10):
+            raise ValueError("Number of digits must be between 1 and 10.")
+    else:
+        variant.validate(num_digits)
+    if count < 0:
+        raise ValueError("Count must not be negative.")
+    if variant.allow_repeats:
+        return rng.integers(0, variant.alphabet_size, size=(count, num_digits), dtype=np.uint8)
+    # Shuffle each row of the alphabet independently; the first num_digits columns are a uniform partial permutation.
+    rows = np.broadcast_to(np.arange(variant.alphabet_size, dtype=np.uint8), (count, variant.alphabet_size))
+    return np.ascontiguousarray(rng.permuted(rows, axis=1)[:, :num_digits])
+
+def secret_streams(seed: int | np.random.SeedSequence | None, num_streams: int) -> list[np.random.Generator]:
+    """
+    Creates independent random generators derived from one seed.
+
+    Give each parallel worker (or each batch of games) its own stream: the
+    streams never overlap, and the same seed always reproduces the same streams.
+
+    Args:
+        seed: The root seed, or a `SeedSequence` to spawn from.
+        num_streams: The number of generators to create.
+
+    Returns:
+        A list of `num_streams` generators.
+    """
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in root.spawn(num_streams)]
 
 def calculate_clues(guess: list[str], secret_number: list[str]) -> list[str]:
     """
@@ -72,3 +209,250 @@ def calculate_clues(guess: list[str], secret_number: list[str]) -> list[str]:
         else:
             clues.append('F')  # Incorrect digit
     return clues
+
+@dataclass(frozen=True, slots=True)
+class Number:
+    """
+    A guess or secret number with its digits packed into one int.
+
+    Digit `i` occupies bits 4*i to 4*i + 3 of `packed`, position 0 in the
+    lowest bits. Instances are immutable and hash in O(1) on two ints, so they
+    can be used as dict keys.
+
+    Attributes:
+        packed (int): The packed digits.
+        num_digits (int): The number of digits.
+        mask (int): Mask of the digits present, bit d for digit d (see `digit_masks`); computed
+            from `packed` if omitted.
+    """
+    packed: int
+    num_digits: int
+    mask: int = field(default=-1, compare=False, repr=False)
+
+    def __post_init__(self):
+        if self.mask >= 0:
+            return
+        mask = 0
+        packed = self.packed
+        for _ in range(self.num_digits):
+            mask |= 1 << (packed & 15)
+            packed >>= 4
+        object.__setattr__(self, "mask", mask)
+
+    @classmethod
+    def from_digits(cls, digits: Iterable[int | str]) -> "Number":
+        """
+        Packs a sequence of digits, e.g. ['1', '2', '3'], "123", "1a3" or [1, 2, 3].
+
+        The digits are not validated; use `game_session.parse_guess` for player input.
+        """
+        packed = 0
+        mask = 0
+        num_digits = 0
+        for digit in digits:
+            digit = int(digit, 16) if isinstance(digit, str) else int(digit)
+            packed |= digit << (4 * num_digits)
+            mask |= 1 << digit
+            num_digits += 1
+        return cls(packed, num_digits, mask)
+
+    @classmethod
+    def from_array(cls, digits: np.ndarray) -> "Number":
+        """ Packs an encoded number, e.g. a row of `generate_secrets` or `solver.enumerate_secrets`. """
+        return cls.from_digits(digits.tolist())
+
+    @property
+    def digits(self) -> tuple[int, ...]:
+        """ The digit values, position 0 first. """
+        return tuple((self.packed >> (4 * i)) & 15 for i in range(self.num_digits))
+
+    def __len__(self) -> int:
+        return self.num_digits
+
+    def __getitem__(self, position: int) -> int:
+        if not 0 <= position < self.num_digits:
+            raise IndexError("digit position out of range")
+        return (self.packed >> (4 * position)) & 15
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.digits)
+
+    def __str__(self) -> str:
+        return "".join(SYMBOLS[d] for d in self.digits)
+
+    def to_list(self) -> list[str]:
+        """ Returns the digits as a list of digit strings, e.g. ['1', '2', '3']. """
+        return [SYMBOLS[d] for d in self.digits]
+
+    def to_array(self) -> np.ndarray:
+        """ Returns the digits as a `uint8` array (see `encode_digits`). """
+        return np.array(self.digits, dtype=np.uint8)
+
+
+@dataclass(frozen=True, slots=True)
+class Clue:
+    """
+    The clues for one guess, as a base-3 feedback code (see `encode_clues`).
+
+    Instances are immutable and hash in O(1), so they can be used as dict keys.
+
+    Attributes:
+        code (int): The feedback code.
+        num_digits (int): The number of positions encoded in `code`.
+    """
+    code: int
+    num_digits: int
+
+    @classmethod
+    def from_symbols(cls, clues: Iterable[str]) -> "Clue":
+        """ Packs clue symbols such as ['S', 'T', 'F'] or "STF". """
+        clues = list(clues)
+        return cls(encode_clues(clues), len(clues))
+
+    @classmethod
+    def win(cls, num_digits: int) -> "Clue":
+        """ Returns the all-'T' clue for `num_digits` positions. """
+        return cls(winning_clue_code(num_digits), num_digits)
+
+    @property
+    def is_win(self) -> bool:
+        """ True if every digit is correct and in the correct position. """
+        return self.code == 3 ** self.num_digits - 1
+
+    def __len__(self) -> int:
+        return self.num_digits
+
+    def __str__(self) -> str:
+        return "".join(self.symbols())
+
+    def symbols(self) -> list[str]:
+        """ Returns the clues as a list of 'T', 'S' and 'F' strings. """
+        return decode_clues(self.code, self.num_digits)
+
+
+def score_guess(guess: Number, secret: Number) -> Clue:
+    """
+    Scores a guess against a secret; the typed equivalent of `calculate_clues`.
+
+    Args:
+        guess: The guess.
+        secret: The secret number.
+
+    Returns:
+        The clues for the guess.
+
+    Raises:
+        ValueError: If the guess and the secret have different lengths.
+    """
+    num_digits = guess.num_digits
+    if num_digits != secret.num_digits:
+        raise ValueError("Guess and secret number must have the same length.")
+    guess_packed, secret_mask = guess.packed, secret.mask
+    differences = guess_packed ^ secret.packed # A zero nibble marks a digit in the right place
+    code = 0
+    for place in _PLACE_VALUES[:num_digits]:
+        if not differences & 15:
+            code += 2 * place # 'T'
+        elif secret_mask >> (guess_packed & 15) & 1:
+            code += place # 'S'
+        guess_packed >>= 4
+        differences >>= 4
+    return Clue(code, num_digits)
+
+def encode_digits(number: list[str]) -> np.ndarray:
+    """
+    Converts a guess or secret such as ['1', '2', '3'] into a `uint8` digit array.
+
+    Args:
+        number: A list of digit strings.
+
+    Returns:
+        A `uint8` array of shape (len(number),).
+    """
+    return np.array([int(d, 16) for d in number], dtype=np.uint8)
+
+def digit_masks(numbers: np.ndarray) -> np.ndarray:
+    """
+    Computes a mask of the digits present in each encoded number.
+
+    Args:
+        numbers: A `uint8` array of shape (K, num_digits).
+
+    Returns:
+        A `uint16` array of shape (K,) where bit `d` is set if digit `d`
+        appears in the corresponding number.
+    """
+    return np.bitwise_or.reduce(np.left_shift(1, numbers, dtype=np.uint16), axis=1)
+
+def encode_clues(clues: list[str]) -> int:
+    """
+    Packs a clue list into its base-3 feedback code.
+
+    Args:
+        clues: A list of 'T', 'S' and 'F' strings, e.g. ['S', 'T', 'F'].
+
+    Returns:
+        The feedback code, e.g. 1 + 2*3 + 0*9 = 7 for ['S', 'T', 'F'].
+    """
+    code = 0
+    for clue in reversed(clues):
+        code = code * 3 + CLUE_VALUES[clue]
+    return code
+
+def decode_clues(code: int, num_digits: int) -> list[str]:
+    """
+    Unpacks a base-3 feedback code into a clue list.
+
+    Args:
+        code: A feedback code as returned by `encode_clues` or `score_guesses`.
+        num_digits: The number of positions encoded in `code`.
+
+    Returns:
+        A list of 'T', 'S' and 'F' strings.
+    """
+    clues = []
+    for _ in range(num_digits):
+        code, value = divmod(int(code), 3)
+        clues.append(CLUE_SYMBOLS[value])
+    return clues
+
+def winning_clue_code(num_digits: int) -> int:
+    """ Returns the feedback code of an all-'T' clue list for `num_digits` positions. """
+    return 3 ** num_digits - 1
+
+def score_guesses(guesses: np.ndarray, secrets: np.ndarray, secret_masks: np.ndarray | None = None) -> np.ndarray:
+    """
+    Scores one or many guesses against an array of secrets at once.
+
+    This is the vectorized equivalent of calling `calculate_clues` for every
+    (guess, secret) pair and packing the result with `encode_clues`. Inputs are
+    not validated, so callers are responsible for passing well-formed arrays.
+
+    Args:
+        guesses: A `uint8` array of shape (num_digits,) for a single guess, or
+                 (G, num_digits) for several guesses.
+        secrets: A `uint8` array of shape (K, num_digits).
+        secret_masks: Optional precomputed `digit_masks(secrets)`, which saves
+                      recomputing them when the same secrets are scored often.
+
+    Returns:
+        A `uint16` array of feedback codes with shape (K,) for a single guess,
+        or (G, K) for several guesses.
+    """
+    guesses = np.asarray(guesses, dtype=np.uint8)
+    if secret_masks is None:
+        secret_masks = digit_masks(secrets)
+
+    single = guesses.ndim == 1
+    guess_rows = guesses.reshape(1, -1) if single else guesses
+    codes = np.zeros((len(guess_rows), len(secrets)), dtype=np.uint16)
+    place = 1
+    for i in range(guess_rows.shape[1]):
+        column = guess_rows[:, i, None]
+        # A digit in the right place is also present, so T contributes 1 + 1 = 2,
+        # S contributes 1 (present only) and F contributes 0.
+        present = (secret_masks[None, :] >> column.astype(np.uint16)) & 1
+        exact = secrets[None, :, i] == column
+        codes += (present + exact) * np.uint16(place)
+        place *= 3
+    return codes[0] if single else codes
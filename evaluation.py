@@ -0,0 +1,181 @@
+"""
+TSF Game - Exhaustive Strategy Evaluation
+
+For small digit counts every possible secret can be enumerated (10P4 = 5,040,
+10P5 = 30,240). This module runs a guess-selection strategy against all of
+them and reports the exact average, worst case and full distribution of
+guesses-to-solve.
+
+Instead of playing thousands of independent games, it walks the strategy's
+decision tree once: at each node the strategy picks a guess for the current
+candidate set, the candidates are partitioned by feedback code, and each
+partition becomes a child node. Every secret that reaches the same clue
+history shares that node, so its next guess is computed only once. The
+resulting `DecisionTree` can be reused by later evaluations.
+
+Run it from the command line, e.g.:
+    python evaluation.py --digits 4 --strategy minimax
+"""
+import argparse
+import json
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from core_game_logic import winning_clue_code
+from feedback_table import MAX_TABLE_DIGITS, load_feedback_table
+from permutation_index import rank
+from solver import CandidateSet, History, enumerate_secrets
+from strategies import STRATEGIES, GuessStrategy, make_strategy
+
+
+class DecisionTree:
+    """
+    A strategy's decisions, keyed by clue history.
+
+    Attributes:
+        num_digits (int): The number of digits in the game.
+        guesses (dict[History, int]): The enumeration index of the guess made
+            after each clue history (see `solver.enumerate_secrets`).
+    """
+    def __init__(self, num_digits: int):
+        self.num_digits: int = num_digits
+        self.guesses: dict[History, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.guesses)
+
+    def lookup(self, history: History) -> np.ndarray | None:
+        """ Returns the guess digits stored for `history`, or None if it is not in the tree. """
+        index = self.guesses.get(history)
+        return None if index is None else enumerate_secrets(self.num_digits)[index]
+
+    def record(self, history: History, guess: np.ndarray):
+        """ Stores the guess made after `history`. """
+        self.guesses[history] = rank(guess)
+
+
+@dataclass
+class EvaluationResult:
+    """ Exact statistics of a strategy over every possible secret. """
+    num_digits: int
+    strategy: str
+    secrets: int
+    solved: int
+    mean_guesses: float
+    worst_case: int
+    guess_distribution: dict[int, int]
+    tree_nodes: int
+    elapsed_seconds: float
+
+    def to_dict(self) -> dict:
+        """ Returns the result as a JSON-serializable dict. """
+        return dict(self.__dict__)
+
+
+def walk_decision_tree(candidates: CandidateSet, strategy: GuessStrategy, tree: DecisionTree,
+                       max_guesses: int, history: History = (), depth: int = 1,
+                       distribution: dict[int, int] | None = None) -> dict[int, int]:
+    """
+    Walks the strategy's decision tree below `history`, filling `tree` as it goes.
+
+    Args:
+        candidates: The secrets consistent with `history`.
+        strategy: The strategy choosing each guess (only asked for nodes missing from `tree`).
+        tree: Decision cache; existing entries are reused, new ones are added.
+        max_guesses: Secrets not solved within this many guesses count as unsolved.
+        history: The clue history leading to this node.
+        depth: The guess number made at this node.
+        distribution: Accumulator mapping guesses-to-solve to number of secrets.
+
+    Returns:
+        The distribution, mapping guesses-to-solve to number of secrets; unsolved
+        secrets are counted under key 0.
+    """
+    if distribution is None:
+        distribution = {}
+    if depth > max_guesses:
+        distribution[0] = distribution.get(0, 0) + len(candidates)
+        return distribution
+
+    guess = tree.lookup(history)
+    if guess is None:
+        guess = strategy.choose_guess(candidates)
+        tree.record(history, guess)
+    guess_index = tree.guesses[history]
+
+    codes = candidates.scores(guess)
+    win_code = winning_clue_code(candidates.num_digits)
+    # Group candidate rows by feedback code in one sort instead of one scan per code.
+    order = np.argsort(codes, kind="stable")
+    unique_codes, starts = np.unique(codes[order], return_index=True)
+    for code, rows in zip(unique_codes, np.split(order, starts[1:])):
+        if code == win_code:
+            distribution[depth] = distribution.get(depth, 0) + len(rows)
+            continue
+        step = (guess_index, int(code))
+        walk_decision_tree(candidates.subset(rows, step), strategy, tree, max_guesses,
+                           history + (step,), depth + 1, distribution)
+    return distribution
+
+
+def evaluate_all_secrets(num_digits: int, strategy_name: str = "entropy", max_guesses: int = 100,
+                         tree: DecisionTree | None = None, use_feedback_table: bool = False,
+                         seed: int = 0, **strategy_kwargs) -> tuple[EvaluationResult, DecisionTree]:
+    """
+    Evaluates a strategy against every possible secret with `num_digits` digits.
+
+    Args:
+        num_digits: The number of digits in the game.
+        strategy_name: A name from `strategies.STRATEGIES`.
+        max_guesses: Secrets not solved within this many guesses count as unsolved.
+        tree: An existing decision tree to reuse (and extend).
+        use_feedback_table: Use the cached feedback table when `num_digits` allows it.
+        seed: Seed for the strategy's random generator.
+        **strategy_kwargs: Passed to the strategy's constructor.
+
+    Returns:
+        A tuple (exact statistics, the decision tree that produced them).
+    """
+    strategy = make_strategy(strategy_name, seed=seed, **strategy_kwargs)
+    table = load_feedback_table(num_digits) if use_feedback_table and num_digits <= MAX_TABLE_DIGITS else None
+    tree = tree if tree is not None else DecisionTree(num_digits)
+
+    start = time.perf_counter()
+    distribution = walk_decision_tree(CandidateSet(num_digits, table), strategy, tree, max_guesses)
+    elapsed = time.perf_counter() - start
+
+    unsolved = distribution.pop(0, 0)
+    solved = sum(distribution.values())
+    result = EvaluationResult(
+        num_digits=num_digits,
+        strategy=strategy_name,
+        secrets=solved + unsolved,
+        solved=solved,
+        mean_guesses=sum(d * n for d, n in distribution.items()) / solved if solved else float("nan"),
+        worst_case=max(distribution) if distribution else 0,
+        guess_distribution=dict(sorted(distribution.items())),
+        tree_nodes=len(tree),
+        elapsed_seconds=elapsed,
+    )
+    return result, tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a bot strategy against every possible secret.")
+    parser.add_argument("--digits", type=int, default=4, help="Number of digits in the secret (1-5 recommended).")
+    parser.add_argument("--strategy", default="entropy", choices=list(STRATEGIES), help="Strategy to evaluate.")
+    parser.add_argument("--max-guesses", type=int, default=100, help="Maximum guesses per game.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the strategy's random generator.")
+    parser.add_argument("--feedback-table", action="store_true",
+                        help="Use the cached feedback table (up to 5 digits).")
+    args = parser.parse_args()
+
+    result, _ = evaluate_all_secrets(args.digits, args.strategy, args.max_guesses,
+                                     use_feedback_table=args.feedback_table, seed=args.seed)
+    print(json.dumps(result.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
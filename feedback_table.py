@@ -0,0 +1,130 @@
+"""
+TSF Game - Precomputed Feedback Tables
+
+For small and medium digit counts the full guess x secret feedback matrix is
+cheap enough to precompute: entry [g, s] is the packed feedback code (see
+`core_game_logic.score_guesses`) for guess `g` against secret `s`, both indexed
+in `solver.enumerate_secrets` order (see `permutation_index`).
+
+Tables are built once per digit count, saved as `.npy` files in a cache
+directory and reopened with mmap on later runs, so separate CLI sessions and
+parallel worker processes share a single page-cached copy instead of each
+rebuilding it.
+"""
+import os
+import tempfile
+
+import numpy as np
+
+from core_game_logic import digit_masks, score_guesses
+from permutation_index import num_permutations
+from solver import enumerate_secrets
+
+# Largest digit count for which a full table is built (30,240 x 30,240 entries).
+MAX_TABLE_DIGITS: int = 5
+
+# Environment variable that overrides the default cache directory.
+CACHE_DIR_ENV_VAR: str = "TSF_CACHE_DIR"
+
+# Number of guess rows scored per batch while building a table.
+_BUILD_CHUNK_ROWS: int = 256
+
+# Tables already opened by this process, keyed by (cache directory, num_digits).
+_open_tables: dict[tuple[str, int], np.ndarray] = {}
+
+
+def default_cache_dir() -> str:
+    """
+    Returns the directory where feedback tables are cached.
+
+    This is `$TSF_CACHE_DIR` if set, otherwise `~/.cache/tsf_game`.
+    """
+    return os.environ.get(CACHE_DIR_ENV_VAR) or os.path.join(os.path.expanduser("~"), ".cache", "tsf_game")
+
+
+def table_dtype(num_digits: int) -> np.dtype:
+    """
+    Returns the smallest unsigned integer dtype that can hold every feedback code.
+
+    Codes range from 0 to 3**num_digits - 1, so up to 5 digits fit in `uint8`.
+    """
+    return np.dtype(np.uint8) if 3 ** num_digits <= 256 else np.dtype(np.uint16)
+
+
+def table_path(num_digits: int, cache_dir: str | None = None) -> str:
+    """ Returns the path of the cached table file for `num_digits`. """
+    return os.path.join(cache_dir or default_cache_dir(), f"feedback_{num_digits}.npy")
+
+
+def build_feedback_table(num_digits: int, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Computes the full feedback matrix for `num_digits`.
+
+    Args:
+        num_digits: The number of digits in the game (1 to MAX_TABLE_DIGITS).
+        out: Optional preallocated (P, P) array to fill, e.g. a writable memmap.
+
+    Returns:
+        A (P, P) array of feedback codes in `table_dtype(num_digits)`, where P is
+        the number of possible secrets.
+
+    Raises:
+        ValueError: If num_digits is outside 1 to MAX_TABLE_DIGITS.
+    """
+    if not isinstance(num_digits, int) or not (1 <= num_digits <= MAX_TABLE_DIGITS):
+        raise ValueError(f"Feedback tables are only supported for 1 to {MAX_TABLE_DIGITS} digits.")
+
+    secrets = enumerate_secrets(num_digits)
+    masks = digit_masks(secrets)
+    if out is None:
+        out = np.empty((len(secrets), len(secrets)), dtype=table_dtype(num_digits))
+    for start in range(0, len(secrets), _BUILD_CHUNK_ROWS):
+        stop = start + _BUILD_CHUNK_ROWS
+        out[start:stop] = score_guesses(secrets[start:stop], secrets, masks)
+    return out
+
+
+def load_feedback_table(num_digits: int, cache_dir: str | None = None) -> np.ndarray:
+    """
+    Returns the read-only, memory-mapped feedback table for `num_digits`.
+
+    The table is read from the cache directory if present; otherwise it is built,
+    written to a temporary file and atomically renamed into place, so concurrent
+    processes never see a partially written table.
+
+    Args:
+        num_digits: The number of digits in the game (1 to MAX_TABLE_DIGITS).
+        cache_dir: Directory holding cached tables. Defaults to `default_cache_dir()`.
+
+    Returns:
+        A read-only (P, P) `np.memmap` of feedback codes.
+
+    Raises:
+        ValueError: If num_digits is outside 1 to MAX_TABLE_DIGITS.
+        OSError: If the cache directory cannot be created or written.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    key = (cache_dir, num_digits)
+    if key in _open_tables:
+        return _open_tables[key]
+
+    path = table_path(num_digits, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        size = num_permutations(num_digits)
+        fd, tmp_path = tempfile.mkstemp(prefix=f"feedback_{num_digits}.", suffix=".tmp", dir=cache_dir)
+        os.close(fd)
+        try:
+            os.chmod(tmp_path, 0o644) # Readable by every process sharing the cache
+            table = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=table_dtype(num_digits), shape=(size, size))
+            build_feedback_table(num_digits, out=table)
+            table.flush()
+            del table
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    table = np.load(path, mmap_mode="r")
+    _open_tables[key] = table
+    return table
@@ -0,0 +1,224 @@
+"""
+TSF Game - Game Logs
+
+An append-only binary log of played games. Each record stores a game's
+settings, its secret, and its (guess, clues) sequence, with every guess and
+secret as its enumeration index (see `permutation_index`) and every
+clue list as its base-3 feedback code (see `core_game_logic.encode_clues`),
+so a typical game takes a few dozen bytes.
+
+`GameLogWriter` buffers records in memory and appends them in bulk; each flush
+is a single write of whole records, so the CLI and the GUI can append to the
+same file. `read_game_log` streams records back one at a time from fixed-size
+chunks, so logs of any size are read in constant memory.
+
+File layout (little-endian):
+    header:  magic b"TSFL", version (uint8)
+    records: mode (uint8), source (uint8), num_digits (uint8), max_guesses (uint8),
+             number of moves (uint8), secret index (uint32, 0xFFFFFFFF if unknown),
+             start time (float64, Unix time),
+             then per move: guess index (uint32), feedback code (uint16)
+
+The log is written to `game_log_path()` (in the cache directory, or the file
+named by TSF_GAME_LOG; set TSF_GAME_LOG=off to disable logging).
+"""
+import atexit
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from core_game_logic import Clue, Number
+from feedback_table import default_cache_dir
+from permutation_index import rank, unrank
+
+LOG_MAGIC: bytes = b"TSFL"
+LOG_VERSION: int = 1
+LOG_ENV_VAR: str = "TSF_GAME_LOG"
+
+# Who made the guesses.
+HUMAN_GUESSER: int = 0
+BOT_GUESSER: int = 1
+# A human against the adversarial host (see `adversary.py`), whose secret was only picked after the game.
+HARD_HUMAN_GUESSER: int = 2
+
+# Which interface recorded the game.
+SOURCE_CLI: int = 0
+SOURCE_GUI: int = 1
+
+NO_SECRET: int = 0xFFFFFFFF
+
+_FILE_HEADER = struct.Struct("<4sB")
+_RECORD_HEADER = struct.Struct("<BBBBBId")
+_MOVE = struct.Struct("<IH")
+_READ_CHUNK_BYTES = 1 << 20
+
+
+@dataclass
+class GameRecord:
+    """
+    One logged game.
+
+    Attributes:
+        mode (int): HUMAN_GUESSER, HARD_HUMAN_GUESSER or BOT_GUESSER.
+        source (int): SOURCE_CLI or SOURCE_GUI.
+        num_digits (int): The number of digits in the secret number.
+        max_guesses (int): The maximum number of guesses allowed.
+        secret (int | None): Enumeration index of the secret, or None if it was never revealed.
+        started_at (float): Unix time at which the game started.
+        moves (list[tuple[int, int]]): (guess enumeration index, feedback code) per guess.
+    """
+    mode: int
+    source: int
+    num_digits: int
+    max_guesses: int
+    secret: int | None
+    started_at: float
+    moves: list[tuple[int, int]]
+
+    def secret_number(self) -> Number | None:
+        """ Returns the secret, or None if unknown. """
+        if self.secret is None:
+            return None
+        return Number.from_digits(unrank(self.secret, self.num_digits))
+
+    def guesses(self) -> list[Number]:
+        """ Returns every guess, in order. """
+        return [Number.from_digits(unrank(guess, self.num_digits)) for guess, _ in self.moves]
+
+
+def encode_moves(history: Iterable[tuple[Number, Clue]]) -> list[tuple[int, int]]:
+    """ Encodes (guess, clues) pairs as (guess index, feedback code) pairs. """
+    return [(rank(guess), clues.code) for guess, clues in history]
+
+
+def game_log_path() -> str | None:
+    """ Returns the log file selected by TSF_GAME_LOG (default: the cache directory), or None if disabled. """
+    path = os.environ.get(LOG_ENV_VAR)
+    if path is not None and path.lower() in ("", "off"):
+        return None
+    return path or os.path.join(default_cache_dir(), "games.tsflog")
+
+
+class GameLogWriter:
+    """
+    Appends game records to a log file in buffered bulk writes.
+
+    Attributes:
+        path (str): The log file.
+        buffer_bytes (int): Buffered record bytes that trigger a write.
+    """
+    def __init__(self, path: str, buffer_bytes: int = 64 * 1024):
+        """
+        Opens (or creates) the log for appending and registers a flush at exit.
+
+        Raises:
+            OSError: If the file cannot be opened.
+        """
+        self.path: str = path
+        self.buffer_bytes: int = buffer_bytes
+        self._buffer = bytearray()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_FILE_HEADER.pack(LOG_MAGIC, LOG_VERSION))
+            self._file.flush()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "GameLogWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_game(self, mode: int, source: int, num_digits: int, max_guesses: int,
+                    secret: Number | None, moves: list[tuple[int, int]], started_at: float):
+        """
+        Buffers one game record.
+
+        Args:
+            mode: HUMAN_GUESSER, HARD_HUMAN_GUESSER or BOT_GUESSER.
+            source: SOURCE_CLI or SOURCE_GUI.
+            num_digits: The number of digits in the secret number.
+            max_guesses: The maximum number of guesses allowed.
+            secret: The secret number, or None if it was never revealed.
+            moves: (guess index, feedback code) pairs (see `encode_moves`).
+            started_at: Unix time at which the game started.
+        """
+        secret_code = NO_SECRET if secret is None else rank(secret)
+        self._buffer += _RECORD_HEADER.pack(mode, source, num_digits, max_guesses, len(moves), secret_code, started_at)
+        for guess, code in moves:
+            self._buffer += _MOVE.pack(guess, code)
+        if len(self._buffer) >= self.buffer_bytes:
+            self.flush()
+
+    def flush(self):
+        """ Appends the buffered records to the file in one write. """
+        if self._buffer and not self._file.closed:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def read_game_log(path: str, chunk_bytes: int = _READ_CHUNK_BYTES) -> Iterator[GameRecord]:
+    """
+    Streams the records of a log file.
+
+    Args:
+        path: The log file.
+        chunk_bytes: Bytes read from disk at a time.
+
+    Yields:
+        Each `GameRecord`, in file order. A truncated final record (from a
+        writer that was killed mid-write) is ignored.
+
+    Raises:
+        ValueError: If the file is not a game log.
+        OSError: If the file cannot be read.
+    """
+    with open(path, "rb") as f:
+        header = f.read(_FILE_HEADER.size)
+        magic, version = _FILE_HEADER.unpack(header) if len(header) == _FILE_HEADER.size else (b"", 0)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise ValueError(f"{path} is not a TSF game log (version {LOG_VERSION}).")
+
+        data = b""
+        offset = 0
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                return
+            data = data[offset:] + chunk
+            offset = 0
+            while len(data) - offset >= _RECORD_HEADER.size:
+                mode, source, num_digits, max_guesses, num_moves, secret, started_at = \
+                    _RECORD_HEADER.unpack_from(data, offset)
+                end = offset + _RECORD_HEADER.size + num_moves * _MOVE.size
+                if end > len(data):
+                    break # Record continues in the next chunk
+                moves = list(_MOVE.iter_unpack(data[offset + _RECORD_HEADER.size:end]))
+                yield GameRecord(mode, source, num_digits, max_guesses, None if secret == NO_SECRET else secret,
+                                 started_at, moves)
+                offset = end
+
+
+def open_game_log() -> GameLogWriter | None:
+    """
+    Opens the log at `game_log_path()` for the game interfaces.
+
+    Returns:
+        The writer, or None if logging is disabled or the file cannot be opened
+        (a warning is printed; the game goes on without a log).
+    """
+    path = game_log_path()
+    if path is None:
+        return None
+    try:
+        return GameLogWriter(path)
+    except OSError as e:
+        print(f"Could not open the game log ({e}). Games will not be recorded.")
+        return None
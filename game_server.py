@@ -0,0 +1,289 @@
+"""
+TSF Game - Network Game Server
+
+This module hosts many "player guesses the computer's number" games at once
+behind an asyncio TCP server. All sessions are multiplexed on one event loop:
+each connection is a lightweight coroutine, and game state lives in a
+compact column-oriented `SessionStore`, so a client may reconnect and
+continue a game by its session id. With `--snapshot`, the store is saved
+periodically and reloaded on restart, so open games survive a restart.
+
+Line protocol (one UTF-8 command per line, one reply line per command):
+    NEW <digits> <max_guesses>   ->  OK <session_id> <digits> <max_guesses>
+    GUESS <session_id> <guess>   ->  CLUES <session_id> <clues> <guesses_remaining>
+                                     WIN <session_id> <guesses_taken>
+                                     LOSE <session_id> <clues> <secret_number>
+    QUIT <session_id>            ->  BYE <session_id>
+    PING                         ->  PONG
+Any failure is answered with `ERR <message>`. A session ends (and is
+removed) when it is won, lost or quit.
+
+Resource limits:
+- Sessions idle for longer than `idle_timeout` seconds are expired by a
+  background sweeper task.
+- Connections that send nothing for `read_timeout` seconds are closed.
+- Lines longer than `MAX_LINE_BYTES` are rejected, and replies are only
+  written once the client has drained the previous ones (`writer.drain()`),
+  so a slow reader cannot make the server buffer without bound.
+- New sessions are refused with `ERR server busy` once `max_sessions` are open.
+- Snapshots are serialized on the event loop (a memory copy of the columns)
+  and written to disk in a worker thread.
+
+Run the server from the command line, e.g.:
+    python game_server.py --host 127.0.0.1 --port 8765 --snapshot sessions.bin
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from game_session import parse_guess
+from session_store import LOST, WON, SessionStore, write_snapshot
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+DEFAULT_MAX_SESSIONS: int = 1_000_000
+DEFAULT_IDLE_TIMEOUT: float = 600.0
+DEFAULT_READ_TIMEOUT: float = 300.0
+DEFAULT_SNAPSHOT_INTERVAL: float = 60.0
+MAX_LINE_BYTES: int = 256
+
+
+class GameServer:
+    """
+    Asyncio TCP server speaking the line protocol described in the module docstring.
+
+    Attributes:
+        store (SessionStore): The open game sessions.
+        idle_timeout (float): Seconds without a command after which a session expires.
+        read_timeout (float): Seconds a connection may stay silent before it is closed.
+        snapshot_path (str | None): File the store is periodically saved to, if any.
+        snapshot_interval (float): Seconds between snapshots.
+    """
+    def __init__(self, store: SessionStore | None = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT, snapshot_path: str | None = None,
+                 snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL):
+        self.store: SessionStore = store if store is not None else SessionStore()
+        self.idle_timeout: float = idle_timeout
+        self.read_timeout: float = read_timeout
+        self.snapshot_path: str | None = snapshot_path
+        self.snapshot_interval: float = snapshot_interval
+        self._server: asyncio.AbstractServer | None = None
+        self._background: list[asyncio.Task] = []
+        self._connections: set[asyncio.Task] = set()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """ Starts listening, the idle-session sweeper and periodic snapshots. Port 0 picks a free port. """
+        self._server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE_BYTES)
+        self._background.append(asyncio.create_task(self._sweep_idle_sessions()))
+        if self.snapshot_path is not None:
+            self._background.append(asyncio.create_task(self._snapshot_periodically()))
+
+    @property
+    def port(self) -> int:
+        """ The port the server is listening on. """
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def stop(self):
+        """ Stops accepting connections, closes open ones, cancels background tasks and saves a final snapshot. """
+        for task in self._background:
+            task.cancel()
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        if self.snapshot_path is not None:
+            await self.save_snapshot()
+
+    async def save_snapshot(self):
+        """ Saves the store to `snapshot_path`, writing the file in a worker thread. """
+        data = self.store.to_bytes()
+        await asyncio.get_running_loop().run_in_executor(None, write_snapshot, data, self.snapshot_path)
+
+    async def _snapshot_periodically(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.save_snapshot()
+            except OSError as e:
+                print(f"Could not save session snapshot: {e}")
+
+    async def _sweep_idle_sessions(self):
+        interval = max(min(self.idle_timeout / 4, 60.0), 0.01)
+        while True:
+            await asyncio.sleep(interval)
+            self.store.expire_idle(self.idle_timeout)
+
+    def handle_command(self, line: str) -> str:
+        """
+        Executes one protocol command.
+
+        Args:
+            line: The command line, without its line terminator.
+
+        Returns:
+            The reply line, without its line terminator.
+        """
+        parts = line.split()
+        if not parts:
+            return "ERR empty command"
+        command, args = parts[0].upper(), parts[1:]
+        try:
+            if command == "NEW" and len(args) == 2:
+                if not (args[0].isdigit() and args[1].isdigit()):
+                    raise ValueError("settings must be integers")
+                session_id = self.store.create(int(args[0]), int(args[1]))
+                return f"OK {session_id} {args[0]} {args[1]}"
+            if command == "GUESS" and len(args) == 2:
+                session_id = args[0]
+                slot = self.store.lookup(session_id)
+                guess = parse_guess(args[1], int(self.store.num_digits[slot]))
+                clues = str(self.store.submit_guess(slot, guess))
+                status = self.store.status[slot]
+                if status == WON:
+                    self.store.close(slot)
+                    return f"WIN {session_id} {self.store.guesses_taken[slot]}"
+                if status == LOST:
+                    secret = str(self.store.secret_number(slot))
+                    self.store.close(slot)
+                    return f"LOSE {session_id} {clues} {secret}"
+                remaining = int(self.store.max_guesses[slot]) - int(self.store.guesses_taken[slot])
+                return f"CLUES {session_id} {clues} {remaining}"
+            if command == "QUIT" and len(args) == 1:
+                self.store.close(self.store.lookup(args[0]))
+                return f"BYE {args[0]}"
+            if command == "PING" and not args:
+                return "PONG"
+        except ValueError as e:
+            return f"ERR {e}"
+        return f"ERR bad command: {line[:32]}"
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """ Serves one client connection until it disconnects, times out or misbehaves. """
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    raw = await asyncio.wait_for(reader.readline(), self.read_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except (asyncio.LimitOverrunError, ValueError):
+                    # Over-long line: the stream cannot be resynchronized, so drop the client.
+                    writer.write(b"ERR line too long\n")
+                    await writer.drain()
+                    break
+                if not raw:
+                    break
+                reply = self.handle_command(raw.decode("utf-8", errors="replace").strip())
+                writer.write(reply.encode() + b"\n")
+                await writer.drain() # Backpressure: wait while the client is not reading
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+class GameClient:
+    """
+    Minimal asyncio client for the game server, used for local testing and scripting.
+
+    Example:
+        client = await GameClient.connect("127.0.0.1", 8765)
+        reply = await client.new_game(3, 10)   # ['OK', session_id, '3', '10']
+        reply = await client.guess(reply[1], "123")
+        await client.close()
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> "GameClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, line: str) -> list[str]:
+        """
+        Sends one command and waits for its reply.
+
+        Returns:
+            The reply split into words, e.g. ['CLUES', session_id, 'SFF', '9'].
+
+        Raises:
+            ConnectionError: If the server closed the connection.
+        """
+        self.writer.write(line.encode() + b"\n")
+        await self.writer.drain()
+        reply = await self.reader.readline()
+        if not reply:
+            raise ConnectionError("Server closed the connection.")
+        return reply.decode().split()
+
+    async def new_game(self, num_digits: int, max_guesses: int) -> list[str]:
+        return await self.request(f"NEW {num_digits} {max_guesses}")
+
+    async def guess(self, session_id: str, guess: str) -> list[str]:
+        return await self.request(f"GUESS {session_id} {guess}")
+
+    async def quit(self, session_id: str) -> list[str]:
+        return await self.request(f"QUIT {session_id}")
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def run_server(host: str, port: int, max_sessions: int, idle_timeout: float, read_timeout: float,
+                     snapshot_path: str | None = None, snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL):
+    store = None
+    if snapshot_path is not None and os.path.exists(snapshot_path):
+        start = time.perf_counter()
+        store = SessionStore.load_snapshot(snapshot_path, max_sessions)
+        print(f"Restored {len(store)} sessions from {snapshot_path} in {time.perf_counter() - start:.2f}s")
+    server = GameServer(store if store is not None else SessionStore(max_sessions), idle_timeout,
+                        read_timeout, snapshot_path, snapshot_interval)
+    await server.start(host, port)
+    print(f"TSF game server listening on {host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host TSF games over TCP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on.")
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS,
+                        help="Maximum number of open game sessions.")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="Seconds before an idle session expires.")
+    parser.add_argument("--read-timeout", type=float, default=DEFAULT_READ_TIMEOUT,
+                        help="Seconds before a silent connection is closed.")
+    parser.add_argument("--snapshot", default=None,
+                        help="Session snapshot file, restored on start and saved periodically.")
+    parser.add_argument("--snapshot-interval", type=float, default=DEFAULT_SNAPSHOT_INTERVAL,
+                        help="Seconds between session snapshots.")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_server(args.host, args.port, args.max_sessions, args.idle_timeout, args.read_timeout,
+                               args.snapshot, args.snapshot_interval))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+TSF Game - Game Sessions
+
+This module holds the state of one "player guesses the computer's number" game
+independently of any user interface. The CLI (TSF_Game.py) and the GUI
+(tsf_gui.py) drive their games through `GameSession`; the network server
+(game_server.py) keeps its many games in a compact `session_store.SessionStore`
+but validates settings and guesses with the same functions.
+"""
+import time
+
+from core_game_logic import CLASSIC, Clue, Number, Variant, generate_secret_number, score_guess
+
+# Limits offered by the user interfaces (core_game_logic itself allows up to 10 digits).
+# MAX_DIGITS caps the classic game only; other variants are bounded by `Variant.validate`.
+MIN_DIGITS: int = 1
+MAX_DIGITS: int = 9
+MIN_GUESSES: int = 1
+MAX_GUESSES: int = 100
+
+
+def validate_settings(num_digits: int, max_guesses: int, variant: Variant = CLASSIC):
+    """
+    Checks game settings against the limits offered to players.
+
+    Raises:
+        ValueError: If a setting is out of range.
+    """
+    if variant == CLASSIC and (not isinstance(num_digits, int) or not (MIN_DIGITS <= num_digits <= MAX_DIGITS)):
+        raise ValueError(f"Number of digits must be between {MIN_DIGITS} and {MAX_DIGITS}.")
+    variant.validate(num_digits)
+    if not isinstance(max_guesses, int) or not (MIN_GUESSES <= max_guesses <= MAX_GUESSES):
+        raise ValueError(f"Max guesses must be between {MIN_GUESSES} and {MAX_GUESSES}.")
+
+
+def parse_guess(guess_str: str, num_digits: int, variant: Variant = CLASSIC) -> Number:
+    """
+    Validates a guess typed by the player.
+
+    Args:
+        guess_str: The guess as typed, e.g. "123" (or "1A3" with a 16-symbol alphabet).
+        num_digits: The number of digits in the game.
+        variant: The game's alphabet and repeat policy.
+
+    Returns:
+        The guess.
+
+    Raises:
+        ValueError: With a message suitable for the player if the guess is invalid.
+    """
+    guess_str = guess_str.lower()
+    if len(guess_str) != num_digits:
+        raise ValueError(f"Guess must have {num_digits} digits.")
+    if variant == CLASSIC:
+        if not guess_str.isdigit():
+            raise ValueError("Guess must contain only digits.")
+    elif not all(symbol in variant.symbols for symbol in guess_str):
+        raise ValueError(f"Guess must contain only the symbols {variant.symbols}.")
+    if not variant.allow_repeats and len(set(guess_str)) != num_digits:
+        raise ValueError("Digits in guess must be unique.")
+    return Number.from_digits(guess_str)
+
+
+class GameSession:
+    """
+    One game in which a player tries to find a computer-generated secret number.
+
+    Attributes:
+        num_digits (int): The number of digits in the secret number.
+        max_guesses (int): The maximum number of guesses allowed.
+        variant (Variant): The alphabet and repeat policy.
+        secret_number (Number): The secret number.
+        history (list[tuple[Number, Clue]]): Each (guess, clues) pair so far.
+        won (bool): True once the player has guessed the secret number.
+        started_at (float): Unix time at which the game started.
+    """
+    def __init__(self, num_digits: int, max_guesses: int, secret_number: Number | None = None,
+                 variant: Variant = CLASSIC):
+        """
+        Starts a new game.
+
+        Args:
+            num_digits: The number of digits in the secret number.
+            max_guesses: The maximum number of guesses allowed.
+            secret_number: The secret to use; a random one is generated if omitted.
+            variant: The alphabet and repeat policy. Defaults to unique digits 0-9.
+
+        Raises:
+            ValueError: If the settings are out of range or the secret does not match them.
+        """
+        validate_settings(num_digits, max_guesses, variant)
+        if secret_number is not None and len(secret_number) != num_digits:
+            raise ValueError(f"Secret number must have {num_digits} digits.")
+        self.num_digits: int = num_digits
+        self.max_guesses: int = max_guesses
+        self.variant: Variant = variant
+        if secret_number is None:
+            secret_number = Number.from_digits(generate_secret_number(num_digits, variant))
+        self.secret_number: Number = secret_number
+        self.history: list[tuple[Number, Clue]] = []
+        self.won: bool = False
+        self.started_at: float = time.time()
+
+    @property
+    def guesses_taken(self) -> int:
+        return len(self.history)
+
+    @property
+    def guesses_remaining(self) -> int:
+        return self.max_guesses - len(self.history)
+
+    @property
+    def is_over(self) -> bool:
+        """ True once the game is won or the player has run out of guesses. """
+        return self.won or len(self.history) >= self.max_guesses
+
+    def parse_guess(self, guess_str: str) -> Number:
+        """ Validates a guess typed by the player (see `parse_guess`). """
+        return parse_guess(guess_str, self.num_digits, self.variant)
+
+    def submit_guess(self, guess: Number) -> Clue:
+        """
+        Scores a guess and records it.
+
+        Args:
+            guess: A validated guess (see `parse_guess`).
+
+        Returns:
+            The clues for the guess.
+
+        Raises:
+            ValueError: If the game is already over or the guess cannot be scored.
+        """
+        if self.is_over:
+            raise ValueError("The game is already over.")
+        clues = score_guess(guess, self.secret_number)
+        self.history.append((guess, clues))
+        self.won = clues.is_win
+        return clues
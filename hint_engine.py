@@ -0,0 +1,133 @@
+"""
+TSF Game - Hint Engine
+
+Background computation of the GUI's hints: how many secrets are still
+possible given the clues so far, and optionally the guess a solver strategy
+would play next.
+
+The engine keeps one `candidate_bitsets.BitsetCandidateSet` per game and
+narrows it incrementally: each new clue filters the previous set instead of
+replaying the whole history, and the bitsets of common opening clues are
+shared with every other game in the process. All filtering and strategy work happens on a daemon worker
+thread fed by a task queue. Results are put on a result queue that the GUI
+drains from the Tk main loop (see `TSFGameGUI._poll_hints`, scheduled with
+`master.after`), so the interface stays responsive even while a 9-digit game's
+3.6 million candidates are being filtered. Tk widgets are never touched from
+the worker thread.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+from candidate_bitsets import BitsetCandidateSet
+from core_game_logic import Clue, Number
+from strategies import GuessStrategy, make_strategy
+
+
+@dataclass
+class HintResult:
+    """ Hints for one game after its latest clue. """
+    game_id: int
+    guesses_applied: int
+    remaining: int
+    best_guess: str | None
+    elapsed_seconds: float
+
+
+class HintEngine:
+    """
+    Computes GUI hints on a background thread.
+
+    Tasks are processed strictly in submission order, so clues are always
+    applied to the candidate set of the game they belong to. Every game gets a
+    new `game_id`; results for earlier games are dropped rather than reported.
+
+    Attributes:
+        strategy (GuessStrategy): Chooses the suggested next guess.
+        game_id (int): Id of the current game (incremented by `new_game`).
+    """
+    def __init__(self, strategy: GuessStrategy | None = None):
+        """
+        Starts the worker thread.
+
+        Args:
+            strategy: Strategy for the "best next guess" hint. Defaults to a
+                sampled max-entropy strategy, which keeps 9-digit games fast.
+        """
+        self.strategy: GuessStrategy = strategy if strategy is not None else make_strategy(
+            "entropy", max_guesses_scored=300, max_secrets_sampled=2000)
+        self.game_id: int = 0
+        self._tasks: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="tsf-hint-engine", daemon=True)
+        self._worker.start()
+
+    def new_game(self, num_digits: int, want_best_guess: bool = False) -> int:
+        """
+        Starts tracking a new game; its initial candidate set is built on the worker.
+
+        Returns:
+            The new game's id.
+        """
+        self.game_id += 1
+        self._tasks.put(("new", self.game_id, num_digits, want_best_guess))
+        return self.game_id
+
+    def add_clue(self, guess: Number, clues: Clue, want_best_guess: bool = False):
+        """ Narrows the current game's candidates with the newest guess and its clues. """
+        self._tasks.put(("clue", self.game_id, (guess, clues), want_best_guess))
+
+    def request_best_guess(self):
+        """ Asks for the best next guess of the current game without adding a clue. """
+        self._tasks.put(("hint", self.game_id, None, True))
+
+    def poll(self) -> list[HintResult]:
+        """
+        Returns the results finished since the last call, for the current game only.
+
+        Never blocks; call it from the GUI thread.
+        """
+        results = []
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return results
+            if result.game_id == self.game_id:
+                results.append(result)
+
+    def shutdown(self):
+        """ Stops the worker thread once the queued tasks are done. """
+        self._tasks.put(None)
+
+    def _run(self):
+        candidates: BitsetCandidateSet | None = None
+        candidates_game = 0
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            kind, game_id, payload, want_best_guess = task
+            if game_id != self.game_id:
+                continue # A newer game has started; this task is stale
+            start = time.perf_counter()
+            try:
+                if kind == "new":
+                    candidates = BitsetCandidateSet(payload)
+                    candidates_game = game_id
+                elif candidates is None or candidates_game != game_id:
+                    continue
+                elif kind == "clue":
+                    guess, clues = payload
+                    candidates.filter(guess, clues)
+
+                best_guess = None
+                if want_best_guess and len(candidates) > 0:
+                    best_guess = "".join(str(d) for d in self.strategy.choose_guess(candidates.view()))
+            except Exception as e:
+                # Any failure only costs this hint; the worker must keep serving later tasks.
+                print(f"Hint engine error: {type(e).__name__}: {e}")
+                continue
+            self._results.put(HintResult(game_id, len(candidates.history), len(candidates),
+                                         best_guess, time.perf_counter() - start))
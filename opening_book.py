@@ -0,0 +1,206 @@
+"""
+TSF Game - Opening Books
+
+The bot's first guesses are the most expensive to compute, because the
+candidate set is still at its largest, yet they are the same in every game.
+This module precomputes a strategy's decision tree offline, down to a depth
+limit and a node budget, and stores it in a compact binary file. At runtime
+`OpeningBook` loads the file lazily on first use, so the bot's early moves
+become dictionary lookups keyed by clue history, and it only falls back to
+live search once the game leaves the book.
+
+Book file layout (little-endian):
+    header:  magic b"TSFB", version (uint8), num_digits (uint8),
+             strategy name length (uint8), strategy name (ASCII)
+    body:    zlib-compressed sequence of entries, each being
+             history length (uint8),
+             history length x (guess index uint32, feedback code uint16),
+             guess index (uint32)
+
+Generate a book from the command line, e.g.:
+    python opening_book.py --digits 6 --strategy entropy --depth 2 --max-nodes 2000
+"""
+import argparse
+import os
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+
+from core_game_logic import winning_clue_code
+from evaluation import DecisionTree
+from feedback_table import MAX_TABLE_DIGITS, default_cache_dir, load_feedback_table
+from solver import CandidateSet, History
+from strategies import STRATEGIES, make_strategy
+
+BOOK_MAGIC: bytes = b"TSFB"
+BOOK_VERSION: int = 1
+
+_HEADER = struct.Struct("<4sBBB")
+_STEP = struct.Struct("<IH")
+_INDEX = struct.Struct("<I")
+
+
+def book_path(num_digits: int, strategy_name: str, cache_dir: str | None = None) -> str:
+    """ Returns the default path of the opening book for a digit count and strategy. """
+    return os.path.join(cache_dir or default_cache_dir(), f"book_{strategy_name}_{num_digits}.bin")
+
+
+def generate_opening_book(num_digits: int, strategy_name: str = "entropy", depth: int = 2,
+                          max_nodes: int = 5000, use_feedback_table: bool = False,
+                          seed: int = 0, **strategy_kwargs) -> DecisionTree:
+    """
+    Computes a strategy's decision tree down to `depth` guesses.
+
+    Nodes are expanded breadth-first, so when `max_nodes` is reached the book
+    holds complete shallow levels rather than a few deep lines.
+
+    Args:
+        num_digits: The number of digits in the game.
+        strategy_name: A name from `strategies.STRATEGIES`.
+        depth: The number of guesses stored along each line (1 = opening move only).
+        max_nodes: The maximum number of positions stored in the book.
+        use_feedback_table: Use the cached feedback table when `num_digits` allows it.
+        seed: Seed for the strategy's random generator.
+        **strategy_kwargs: Passed to the strategy's constructor.
+
+    Returns:
+        The decision tree, mapping each stored clue history to its guess.
+
+    Raises:
+        ValueError: If depth or max_nodes is not positive.
+    """
+    if depth <= 0 or max_nodes <= 0:
+        raise ValueError("Depth and node limit must be positive integers.")
+
+    strategy = make_strategy(strategy_name, seed=seed, **strategy_kwargs)
+    table = load_feedback_table(num_digits) if use_feedback_table and num_digits <= MAX_TABLE_DIGITS else None
+    tree = DecisionTree(num_digits)
+    win_code = winning_clue_code(num_digits)
+
+    pending: deque[tuple[History, CandidateSet]] = deque([((), CandidateSet(num_digits, table))])
+    while pending and len(tree) < max_nodes:
+        history, candidates = pending.popleft()
+        guess = strategy.choose_guess(candidates)
+        tree.record(history, guess)
+        if len(history) + 1 >= depth:
+            continue
+
+        guess_index = tree.guesses[history]
+        codes = candidates.scores(guess)
+        for code in np.unique(codes):
+            keep = codes == code
+            # Single-candidate positions are trivial to play live, so skip them.
+            if code != win_code and np.count_nonzero(keep) > 1:
+                step = (guess_index, int(code))
+                pending.append((history + (step,), candidates.subset(keep, step)))
+    return tree
+
+
+def save_opening_book(tree: DecisionTree, strategy_name: str, path: str):
+    """
+    Writes a decision tree to `path` in the compact book format.
+
+    Args:
+        tree: The decision tree to store.
+        strategy_name: The strategy that produced it (recorded in the header).
+        path: Destination file; parent directories are created as needed.
+    """
+    body = bytearray()
+    for history, guess_index in tree.guesses.items():
+        body.append(len(history))
+        for step_guess, step_code in history:
+            body += _STEP.pack(step_guess, step_code)
+        body += _INDEX.pack(guess_index)
+
+    name = strategy_name.encode("ascii")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, tree.num_digits, len(name)))
+        f.write(name)
+        f.write(zlib.compress(bytes(body), 9))
+
+
+def read_opening_book(path: str) -> tuple[DecisionTree, str]:
+    """
+    Reads a book file written by `save_opening_book`.
+
+    Args:
+        path: The book file.
+
+    Returns:
+        A tuple (decision tree, name of the strategy that produced it).
+
+    Raises:
+        ValueError: If the file is not a supported book file.
+        OSError: If the file cannot be read.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, num_digits, name_length = _HEADER.unpack_from(data)
+    if magic != BOOK_MAGIC or version != BOOK_VERSION:
+        raise ValueError(f"{path} is not a TSF opening book (version {BOOK_VERSION}).")
+    offset = _HEADER.size
+    strategy_name = data[offset:offset + name_length].decode("ascii")
+    body = zlib.decompress(data[offset + name_length:])
+
+    tree = DecisionTree(num_digits)
+    offset = 0
+    while offset < len(body):
+        history_length = body[offset]
+        offset += 1
+        history = tuple(_STEP.unpack_from(body, offset + i * _STEP.size) for i in range(history_length))
+        offset += history_length * _STEP.size
+        tree.guesses[history] = _INDEX.unpack_from(body, offset)[0]
+        offset += _INDEX.size
+    return tree, strategy_name
+
+
+class OpeningBook:
+    """
+    A lazily loaded opening book.
+
+    The file is only read on the first `lookup`, so creating a book for a
+    game that never consults it costs nothing.
+
+    Attributes:
+        path (str): The book file.
+    """
+    def __init__(self, path: str):
+        self.path: str = path
+        self._tree: DecisionTree | None = None
+
+    @property
+    def tree(self) -> DecisionTree:
+        """ The book's decision tree, read from disk on first access. """
+        if self._tree is None:
+            self._tree, _ = read_opening_book(self.path)
+        return self._tree
+
+    def lookup(self, history: History) -> np.ndarray | None:
+        """ Returns the book guess after `history`, or None if the game has left the book. """
+        return self.tree.lookup(history)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute a bot strategy's opening book.")
+    parser.add_argument("--digits", type=int, default=4, help="Number of digits in the secret (1-9).")
+    parser.add_argument("--strategy", default="entropy", choices=list(STRATEGIES), help="Strategy to precompute.")
+    parser.add_argument("--depth", type=int, default=2, help="Guesses stored along each line.")
+    parser.add_argument("--max-nodes", type=int, default=5000, help="Maximum positions stored in the book.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the strategy's random generator.")
+    parser.add_argument("--feedback-table", action="store_true",
+                        help="Use the cached feedback table (up to 5 digits).")
+    parser.add_argument("--output", default=None, help="Book file (default: the cache directory).")
+    args = parser.parse_args()
+
+    tree = generate_opening_book(args.digits, args.strategy, args.depth, args.max_nodes,
+                                 args.feedback_table, args.seed)
+    path = args.output or book_path(args.digits, args.strategy)
+    save_opening_book(tree, args.strategy, path)
+    print(f"Wrote {len(tree)} positions to {path} ({os.path.getsize(path)} bytes).")
+
+
+if __name__ == "__main__":
+    main()
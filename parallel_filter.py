@@ -0,0 +1,240 @@
+"""
+TSF Game - Parallel Candidate Filtering
+
+`SharedCandidateSet` is an alternative to `candidate_bitsets.BitsetCandidateSet`
+for `bots.SolverBotPlayer` in 8-9 digit games. There the candidate set holds
+millions of secrets (3,628,800 for 9 digits), and scoring all of them on one
+core after every clue is what limits the bot's time per move.
+
+The encoded candidates (digits, digit masks and enumeration indices) live in
+one `multiprocessing.shared_memory` block, split into disjoint contiguous
+shards. Applying a clue submits one task per shard, carrying only the block's
+name, the shard's offset and length, and the clue, to a persistent,
+process-wide worker pool. Each worker scores its shard, compacts the survivors
+to the front of the shard in place, and returns the survivor count. The parent
+then reads the compacted indices straight from shared memory, so no candidate
+list is ever pickled. Workers keep blocks mapped across tasks; every task also
+names the blocks still live, so a worker unmaps any block the parent has
+unlinked as soon as it runs its next task.
+
+Once few candidates remain, the pool's overhead outweighs the work, and the
+shards are filtered in the calling process with the same code.
+"""
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core_game_logic import Clue, Number, score_guesses
+from permutation_index import rank
+from solver import CandidateSet, History, all_secret_masks, enumerate_secrets
+
+PARALLEL_MIN_CANDIDATES: int = 1 << 18 # Smaller sets are filtered in the calling process
+PARALLEL_MIN_DIGITS: int = 8 # Digit counts from which the CLI bot filters in parallel
+_ATTACHED_LIMIT: int = 4 # Shared memory blocks each worker keeps mapped
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers: int = 0
+_live_blocks: tuple[str, ...] = () # Parent side: blocks not unlinked yet, sent with every task
+_attached: dict[str, shared_memory.SharedMemory] = {} # Worker side, least recently used first
+
+
+def filter_pool(workers: int | None = None) -> tuple[ProcessPoolExecutor, int]:
+    """
+    Returns the process-wide filtering pool and its number of workers, starting it on first use.
+
+    Args:
+        workers: Number of worker processes if the pool is not running yet (default: all CPUs).
+    """
+    global _pool, _pool_workers
+    if _pool is None:
+        _pool_workers = workers or os.cpu_count() or 1
+        _pool = ProcessPoolExecutor(max_workers=_pool_workers)
+    return _pool, _pool_workers
+
+
+def shutdown_filter_pool():
+    """ Stops the process-wide filtering pool; the next `filter_pool` call starts a new one. """
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+        _pool, _pool_workers = None, 0
+
+
+def _block_size(num_rows: int, num_digits: int) -> int:
+    return num_rows * (num_digits + 2 + 4)
+
+
+def _columns(buffer: memoryview, num_rows: int, num_digits: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Indices first, then masks, then digits, so every column is aligned to its item size.
+    indices = np.ndarray((num_rows,), dtype=np.int32, buffer=buffer)
+    masks = np.ndarray((num_rows,), dtype=np.uint16, buffer=buffer, offset=4 * num_rows)
+    digits = np.ndarray((num_rows, num_digits), dtype=np.uint8, buffer=buffer, offset=6 * num_rows)
+    return digits, masks, indices
+
+
+def filter_shard(digits: np.ndarray, masks: np.ndarray, indices: np.ndarray,
+                 start: int, length: int, guess: np.ndarray, code: int) -> int:
+    """
+    Filters one shard of a candidate array in place.
+
+    The candidates in rows [start, start + length) that give feedback `code` for
+    `guess` are moved, in order, to the front of that range.
+
+    Args:
+        digits: `uint8` array of shape (N, num_digits), one candidate per row.
+        masks: `uint16` array of shape (N,) with each candidate's digit mask.
+        indices: `int32` array of shape (N,) with each candidate's enumeration index.
+        start: The shard's first row.
+        length: The number of candidates currently in the shard.
+        guess: The guess as a `uint8` digit array.
+        code: The feedback code received.
+
+    Returns:
+        The number of candidates left in the shard.
+    """
+    stop = start + length
+    keep = score_guesses(guess, digits[start:stop], masks[start:stop]) == code
+    survivors = int(np.count_nonzero(keep))
+    if survivors < length:
+        for column in (digits, masks, indices):
+            column[start:start + survivors] = column[start:stop][keep]
+    return survivors
+
+
+def _attach(name: str, live: tuple[str, ...]) -> shared_memory.SharedMemory:
+    # Workers keep a few blocks mapped across tasks instead of mapping one per clue,
+    # and drop the mappings of blocks the parent has unlinked since their last task.
+    for stale in [cached for cached in _attached if cached not in live]:
+        _attached.pop(stale).close()
+    block = _attached.pop(name, None)
+    if block is None:
+        # Pool workers share the parent's resource tracker, so attaching registers
+        # nothing new and the parent's unlink stays the only cleanup.
+        block = shared_memory.SharedMemory(name=name)
+        while len(_attached) >= _ATTACHED_LIMIT:
+            _attached.pop(next(iter(_attached))).close()
+    _attached[name] = block
+    return block
+
+
+def _filter_task(name: str, live: tuple[str, ...], num_rows: int, num_digits: int, start: int, length: int,
+                 guess: bytes, code: int) -> int:
+    # Runs in a pool worker: only these few scalars and names and the survivor count are pickled.
+    digits, masks, indices = _columns(_attach(name, live).buf, num_rows, num_digits)
+    return filter_shard(digits, masks, indices, start, length, np.frombuffer(guess, dtype=np.uint8), code)
+
+
+def _release(block: shared_memory.SharedMemory):
+    # Rebinding an immutable tuple keeps concurrent readers safe; a lost update
+    # only costs a worker one extra unmap or a stale mapping until it is evicted.
+    global _live_blocks
+    _live_blocks = tuple(name for name in _live_blocks if name != block.name)
+    block.close()
+    block.unlink()
+
+
+class SharedCandidateSet:
+    """
+    The set of secrets still consistent with all clues received so far, filtered by a worker pool.
+
+    Attributes:
+        num_digits (int): The number of digits in each secret.
+        history (History): The (guess enumeration index, feedback code) pairs
+            that narrowed the set down to its current members.
+        min_parallel (int): Smallest set filtered by the worker pool.
+    """
+    def __init__(self, num_digits: int, workers: int | None = None,
+                 min_parallel: int = PARALLEL_MIN_CANDIDATES):
+        """
+        Initializes the set with every possible secret, copied into a new shared memory block.
+
+        Args:
+            num_digits: The number of unique digits in the secret number.
+            workers: Number of worker processes if the shared pool is not running yet
+                (see `filter_pool`). The set is split into one shard per worker.
+            min_parallel: Smallest set filtered by the worker pool; smaller ones are
+                filtered in the calling process.
+        """
+        secrets = enumerate_secrets(num_digits)
+        self.num_digits: int = num_digits
+        self.history: History = ()
+        self.min_parallel: int = min_parallel
+        self._pool, num_shards = filter_pool(workers)
+        self._num_rows: int = len(secrets)
+        self._block = shared_memory.SharedMemory(create=True, size=_block_size(self._num_rows, num_digits))
+        self._finalizer = weakref.finalize(self, _release, self._block)
+        global _live_blocks
+        _live_blocks += (self._block.name,)
+        self._digits, self._masks, self._indices = _columns(self._block.buf, self._num_rows, num_digits)
+        self._digits[:] = secrets
+        self._masks[:] = all_secret_masks(num_digits)
+        self._indices[:] = np.arange(self._num_rows, dtype=np.int32)
+        bounds = np.linspace(0, self._num_rows, num_shards + 1).astype(int)
+        self._starts: list[int] = bounds[:-1].tolist()
+        self._lengths: list[int] = np.diff(bounds).tolist()
+        self._count: int = self._num_rows
+        self._view: CandidateSet | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "SharedCandidateSet":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ Frees the shared memory block. The set cannot be filtered afterwards. """
+        self._digits = self._masks = self._indices = None
+        self._finalizer()
+
+    def indices(self) -> np.ndarray:
+        """ Returns the sorted `int32` enumeration indices of the members. """
+        return self.view().indices
+
+    def view(self) -> CandidateSet:
+        """ Returns the members as a `solver.CandidateSet` (cached until the set changes), for strategies. """
+        if self._view is None:
+            members = np.concatenate([self._indices[start:start + length]
+                                      for start, length in zip(self._starts, self._lengths)])
+            self._view = CandidateSet(self.num_digits, indices=members)
+            self._view.history = self.history
+        return self._view
+
+    def filter(self, guess: Number, clues: Clue) -> int:
+        """
+        Removes every candidate that is inconsistent with the given clues.
+
+        Args:
+            guess: The guess that was made.
+            clues: The clues received for that guess.
+
+        Returns:
+            The number of candidates remaining after filtering.
+
+        Raises:
+            ValueError: If guess or clues do not have `num_digits` entries.
+        """
+        if len(guess) != self.num_digits or len(clues) != self.num_digits:
+            raise ValueError(f"Guess and clues must both have {self.num_digits} entries.")
+        guess_digits = guess.to_array()
+        code = clues.code
+        shards = [(start, length) for start, length in zip(self._starts, self._lengths) if length]
+        if self._count >= self.min_parallel:
+            futures = {start: self._pool.submit(_filter_task, self._block.name, _live_blocks, self._num_rows,
+                                                self.num_digits, start, length, guess_digits.tobytes(), code)
+                       for start, length in shards}
+            survivors = {start: future.result() for start, future in futures.items()}
+        else:
+            survivors = {start: filter_shard(self._digits, self._masks, self._indices, start, length,
+                                             guess_digits, code)
+                         for start, length in shards}
+        self._lengths = [survivors.get(start, 0) for start in self._starts]
+        self._count = sum(self._lengths)
+        self.history += ((rank(guess_digits), code),)
+        self._view = None
+        return self._count
@@ -0,0 +1,177 @@
+"""
+TSF Game - Permutation Index
+
+Maps every number of `num_digits` unique digits (the numbers produced by
+`core_game_logic.generate_secret_number`) to a dense index in
+0 .. 10! / (10 - num_digits)! - 1 and back. Indices follow lexicographic
+order, so index k is row k of `solver.enumerate_secrets(num_digits)`; feedback
+tables, opening books, game logs and session snapshots all store numbers as
+these indices.
+
+`rank` and `unrank` convert one number in O(num_digits) using precomputed
+place values and a "k-th unused digit" lookup table; `rank_batch` and
+`unrank_batch` do the same for whole arrays with NumPy, one vectorized step
+per digit position.
+
+A set of numbers can be stored as a bitset over the index space with
+`to_bitset` / `from_bitset`: one bit per possible number, so even the
+3,628,800 numbers of a 9-digit game fit in about 450 KB.
+"""
+from collections.abc import Sequence
+
+import numpy as np
+
+NUM_SYMBOLS: int = 10 # Digits 0-9
+
+
+def _place_values(num_digits: int) -> tuple[int, ...]:
+    # Position i's weight is the number of ways to fill the positions after it:
+    # (10 - i - 1)! / (10 - num_digits)!.
+    values = []
+    for i in range(num_digits):
+        value = 1
+        for remaining in range(NUM_SYMBOLS - num_digits + 1, NUM_SYMBOLS - i):
+            value *= remaining
+        values.append(value)
+    return tuple(values)
+
+
+_PLACE_VALUES: tuple[tuple[int, ...], ...] = tuple(_place_values(n) for n in range(NUM_SYMBOLS + 1))
+
+# _NTH_UNUSED[used_mask][k] is the k-th smallest digit whose bit is not set in used_mask.
+_NTH_UNUSED: tuple[tuple[int, ...], ...] = tuple(
+    tuple(d for d in range(NUM_SYMBOLS) if not used >> d & 1) for used in range(1 << NUM_SYMBOLS))
+_NTH_UNUSED_TABLE: np.ndarray = np.full((1 << NUM_SYMBOLS, NUM_SYMBOLS), 255, dtype=np.uint8)
+for _used, _digits in enumerate(_NTH_UNUSED):
+    _NTH_UNUSED_TABLE[_used, :len(_digits)] = _digits
+_POPCOUNT_TABLE: np.ndarray = np.array([used.bit_count() for used in range(1 << NUM_SYMBOLS)], dtype=np.int64)
+
+
+def num_permutations(num_digits: int) -> int:
+    """
+    Returns the number of numbers with `num_digits` unique digits, 10! / (10 - num_digits)!.
+
+    Raises:
+        ValueError: If num_digits is not between 1 and 10.
+    """
+    if not isinstance(num_digits, int) or not (1 <= num_digits <= NUM_SYMBOLS):
+        raise ValueError("Number of digits must be an integer between 1 and 10.")
+    return _PLACE_VALUES[num_digits][0] * NUM_SYMBOLS
+
+
+def rank(digits: Sequence[int] | np.ndarray) -> int:
+    """
+    Returns the lexicographic index of a number among all numbers of its length.
+
+    Args:
+        digits: The digit values of a number with unique digits, e.g. [1, 2, 3],
+            a `uint8` digit array or a `core_game_logic.Number`. Not validated.
+
+    Returns:
+        The index, between 0 and `num_permutations(len(digits)) - 1`.
+    """
+    if isinstance(digits, np.ndarray):
+        digits = digits.tolist()
+    index = 0
+    used = 0
+    for digit, place in zip(digits, _PLACE_VALUES[len(digits)]):
+        # Each unused digit smaller than `digit` starts a block of `place` numbers that sort first.
+        index += (digit - (used & ((1 << digit) - 1)).bit_count()) * place
+        used |= 1 << digit
+    return index
+
+
+def unrank(index: int, num_digits: int) -> tuple[int, ...]:
+    """
+    Returns the digits of the number at a lexicographic index.
+
+    Args:
+        index: An index returned by `rank`.
+        num_digits: The number of digits.
+
+    Returns:
+        The digit values, position 0 first.
+
+    Raises:
+        ValueError: If num_digits or index is out of range.
+    """
+    if not 0 <= index < num_permutations(num_digits):
+        raise ValueError(f"Index {index} is out of range for {num_digits} digits.")
+    digits = []
+    used = 0
+    for place in _PLACE_VALUES[num_digits]:
+        smaller_unused, index = divmod(index, place)
+        digit = _NTH_UNUSED[used][smaller_unused]
+        digits.append(digit)
+        used |= 1 << digit
+    return tuple(digits)
+
+
+def rank_batch(numbers: np.ndarray) -> np.ndarray:
+    """
+    Ranks many numbers at once; the vectorized equivalent of `rank`.
+
+    Args:
+        numbers: A `uint8` array of shape (K, num_digits) with unique digits per row. Not validated.
+
+    Returns:
+        An `int64` array of shape (K,) with each row's index.
+    """
+    numbers = np.asarray(numbers, dtype=np.uint8)
+    indices = np.zeros(len(numbers), dtype=np.int64)
+    used = np.zeros(len(numbers), dtype=np.int64)
+    for i, place in enumerate(_PLACE_VALUES[numbers.shape[1]]):
+        digit = numbers[:, i].astype(np.int64)
+        indices += (digit - _POPCOUNT_TABLE[used & ((1 << digit) - 1)]) * place
+        used |= 1 << digit
+    return indices
+
+
+def unrank_batch(indices: np.ndarray, num_digits: int) -> np.ndarray:
+    """
+    Unranks many indices at once; the vectorized equivalent of `unrank`.
+
+    Args:
+        indices: An integer array of shape (K,).
+        num_digits: The number of digits.
+
+    Returns:
+        A `uint8` array of shape (K, num_digits), one number per row.
+
+    Raises:
+        ValueError: If num_digits or any index is out of range.
+    """
+    remaining = np.asarray(indices, dtype=np.int64)
+    if len(remaining) and (remaining.min() < 0 or remaining.max() >= num_permutations(num_digits)):
+        raise ValueError(f"Indices are out of range for {num_digits} digits.")
+    numbers = np.empty((len(remaining), num_digits), dtype=np.uint8)
+    used = np.zeros(len(remaining), dtype=np.int64)
+    for i, place in enumerate(_PLACE_VALUES[num_digits]):
+        smaller_unused, remaining = np.divmod(remaining, place)
+        digit = _NTH_UNUSED_TABLE[used, smaller_unused]
+        numbers[:, i] = digit
+        used |= 1 << digit.astype(np.int64)
+    return numbers
+
+
+def to_bitset(indices: np.ndarray, num_digits: int) -> np.ndarray:
+    """
+    Packs a set of indices into a bitset over the index space.
+
+    Args:
+        indices: Indices of the numbers in the set.
+        num_digits: The number of digits.
+
+    Returns:
+        A `uint8` array of ceil(num_permutations(num_digits) / 8) bytes; bit
+        `k % 8` of byte `k // 8` is set if index k is in the set.
+    """
+    members = np.zeros(num_permutations(num_digits), dtype=bool)
+    members[indices] = True
+    return np.packbits(members, bitorder="little")
+
+
+def from_bitset(bitset: np.ndarray, num_digits: int) -> np.ndarray:
+    """ Returns the sorted `int32` indices whose bits are set in a bitset made by `to_bitset`. """
+    members = np.unpackbits(bitset, count=num_permutations(num_digits), bitorder="little")
+    return np.flatnonzero(members).astype(np.int32)
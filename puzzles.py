@@ -0,0 +1,311 @@
+"""
+TSF Game - Puzzle Generator
+
+Generates "deduce the number" puzzles: a set of (guess, clues) pairs, scored
+by the normal game rules, that is consistent with exactly one secret. Each
+puzzle is built in two passes:
+
+1. Build: starting from the whole space, guesses are added one at a time
+   (the most narrowing of `pool_size` random guesses, scored against the
+   puzzle's secret) while the consistent candidates are filtered
+   incrementally, until only the secret is left.
+2. Prune: clues are dropped one by one, in random order, whenever the
+   remaining clues still have a unique solution. The result is minimal in the
+   sense that no single clue can be removed; it is not guaranteed to be the
+   smallest possible clue set.
+
+Every uniqueness check in the prune pass calls `count_solutions`. It starts
+from the smallest class of secrets given by any single clue (materialized by
+relabeling a cached partition instead of scoring the whole space, see
+`adversary.feedback_class`), applies the other clues chunk by chunk and
+stops as soon as two solutions are found.
+
+Difficulty knobs (`PuzzleSettings`): a smaller `pool_size` gives less
+informative guesses and so, after pruning, puzzles that need more reasoning
+per clue; `max_exact` limits how many 'T' clues any single guess may get;
+`min_clues` / `max_clues` reject puzzles outside a clue-count range (at
+least 2 by default, so no puzzle is a single clue). A clue set never contains
+the winning all-'T' clue, which would give the answer away.
+
+Batches of puzzles run on a process pool with per-batch seeds, so the output
+depends only on the seed and the batch size. Run it from the command line, e.g.:
+    python puzzles.py --digits 5 --count 365 --seed 2027 --output puzzles-5.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from adversary import feedback_class, opening_partition
+from core_game_logic import Clue, Number, digit_masks, generate_secrets, score_guesses, winning_clue_code
+from game_session import MAX_DIGITS, MIN_DIGITS
+from permutation_index import NUM_SYMBOLS, num_permutations
+
+DEFAULT_BATCH_SIZE: int = 8
+_SCAN_CHUNK: int = 1 << 14 # Secrets checked per step of `count_solutions`
+
+
+@dataclass
+class PuzzleSettings:
+    """
+    How puzzles are generated.
+
+    Attributes:
+        num_digits (int): The number of digits in the secret.
+        pool_size (int): Random guesses considered for each new clue; the one leaving
+            the fewest candidates is used. 1 picks guesses blindly.
+        max_exact (int | None): Maximum number of 'T' clues for any single guess, or None.
+        min_clues (int): Puzzles with fewer clues after pruning are rejected.
+        max_clues (int | None): Puzzles with more clues after pruning are rejected, or None.
+        max_attempts (int): Secrets tried per puzzle before giving up.
+    """
+    num_digits: int
+    pool_size: int = 16
+    max_exact: int | None = None
+    min_clues: int = 2
+    max_clues: int | None = None
+    max_attempts: int = 100
+
+    def validate(self):
+        """
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        if not isinstance(self.num_digits, int) or not (MIN_DIGITS <= self.num_digits <= MAX_DIGITS):
+            raise ValueError(f"Number of digits must be between {MIN_DIGITS} and {MAX_DIGITS}.")
+        if self.pool_size <= 0 or self.max_attempts <= 0 or self.min_clues <= 0:
+            raise ValueError("Pool size, attempts and minimum clues must be positive integers.")
+        if self.max_exact is not None and not 0 <= self.max_exact < self.num_digits:
+            raise ValueError("Maximum 'T' clues per guess must be between 0 and the number of digits - 1.")
+        if self.max_clues is not None and self.max_clues < self.min_clues:
+            raise ValueError("Maximum clues must not be less than minimum clues.")
+
+
+@dataclass
+class Puzzle:
+    """
+    A set of clues with exactly one consistent secret.
+
+    Attributes:
+        num_digits (int): The number of digits in the secret.
+        secret (Number): The unique solution.
+        clues (list[tuple[Number, Clue]]): The (guess, clues) pairs shown to the player.
+    """
+    num_digits: int
+    secret: Number
+    clues: list[tuple[Number, Clue]]
+
+    def to_dict(self) -> dict:
+        """ Returns the puzzle as a JSON-serializable dict, e.g. {"clues": [["0123", "FSTF"], ...], ...}. """
+        return {"num_digits": self.num_digits, "secret": str(self.secret),
+                "clues": [[str(guess), str(clues)] for guess, clues in self.clues]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Puzzle":
+        """ Rebuilds a puzzle written by `to_dict`. """
+        return cls(data["num_digits"], Number.from_digits(data["secret"]),
+                   [(Number.from_digits(guess), Clue.from_symbols(clues)) for guess, clues in data["clues"]])
+
+
+def count_solutions(clues: Sequence[tuple[np.ndarray, int]], num_digits: int, limit: int = 2) -> int:
+    """
+    Counts the secrets consistent with every clue, stopping early at `limit`.
+
+    Args:
+        clues: (guess digit array, feedback code) pairs.
+        num_digits: The number of digits in the game.
+        limit: Counting stops once this many solutions are found.
+
+    Returns:
+        The number of consistent secrets, capped at `limit`.
+    """
+    if not clues:
+        return min(num_permutations(num_digits), limit)
+    # Start from the smallest single-clue class (all guesses partition the space alike) and apply
+    # the other clues from the most to the least selective, so chunks empty out quickly.
+    _, class_sizes = opening_partition(num_digits)
+    order = sorted(range(len(clues)), key=lambda i: class_sizes[clues[i][1]])
+    universe = feedback_class(*clues[order[0]])
+    rest = [clues[i] for i in order[1:]]
+    found = 0
+    for start in range(0, len(universe), _SCAN_CHUNK):
+        chunk = universe[start:start + _SCAN_CHUNK]
+        masks = digit_masks(chunk)
+        for guess, code in rest:
+            keep = score_guesses(guess, chunk, masks) == code
+            chunk, masks = chunk[keep], masks[keep]
+            if not len(chunk):
+                break
+        found += len(chunk)
+        if found >= limit:
+            return limit
+    return found
+
+
+def _random_guesses(rng: np.random.Generator, count: int, num_digits: int) -> np.ndarray:
+    return rng.permuted(np.tile(np.arange(NUM_SYMBOLS, dtype=np.uint8), (count, 1)), axis=1)[:, :num_digits]
+
+
+def _build_clues(secret: np.ndarray, settings: PuzzleSettings, rng: np.random.Generator) -> list[tuple[np.ndarray, int]]:
+    # Adds the most narrowing of `pool_size` random guesses until only the secret is consistent.
+    num_digits = settings.num_digits
+    _, class_sizes = opening_partition(num_digits)
+    secret_row = secret.reshape(1, -1)
+    clues = []
+    candidates = None # Secrets consistent with the clues so far; None for the whole space
+    while candidates is None or len(candidates) > 1:
+        pool = _random_guesses(rng, settings.pool_size, num_digits)
+        codes = score_guesses(pool, secret_row)[:, 0]
+        exact = (pool == secret).sum(axis=1)
+        allowed = exact < num_digits if settings.max_exact is None else exact <= settings.max_exact
+        pool, codes = pool[allowed], codes[allowed]
+        if not len(pool):
+            continue
+        if candidates is None:
+            remaining = class_sizes[codes]
+        else:
+            remaining = (score_guesses(pool, candidates, digit_masks(candidates)) == codes[:, None]).sum(axis=1)
+        best = int(np.argmin(remaining))
+        if candidates is not None and remaining[best] == len(candidates):
+            continue # No guess in this pool narrows the candidates
+        guess, code = pool[best], int(codes[best])
+        if candidates is None:
+            candidates = feedback_class(guess, code)
+        else:
+            candidates = candidates[score_guesses(guess, candidates, digit_masks(candidates)) == code]
+        clues.append((guess, code))
+    return clues
+
+
+def _prune_clues(clues: list[tuple[np.ndarray, int]], num_digits: int,
+                 rng: np.random.Generator) -> list[tuple[np.ndarray, int]]:
+    # Drops every clue whose removal keeps the solution unique, in random order.
+    kept = list(range(len(clues)))
+    for i in rng.permutation(len(clues)).tolist():
+        trial = [j for j in kept if j != i]
+        if count_solutions([clues[j] for j in trial], num_digits) == 1:
+            kept = trial
+    return [clues[j] for j in kept]
+
+
+def generate_puzzle(settings: PuzzleSettings, rng: np.random.Generator) -> Puzzle:
+    """
+    Generates one puzzle.
+
+    Args:
+        settings: The generation settings.
+        rng: Random generator for the secret and the guesses.
+
+    Returns:
+        A puzzle whose clues have exactly one consistent secret.
+
+    Raises:
+        ValueError: If the settings are invalid or no puzzle within the clue range
+            was found in `max_attempts` secrets.
+    """
+    settings.validate()
+    num_digits = settings.num_digits
+    win_code = winning_clue_code(num_digits)
+    for _ in range(settings.max_attempts):
+        secret = generate_secrets(1, num_digits, rng)[0]
+        clues = _prune_clues(_build_clues(secret, settings, rng), num_digits, rng)
+        if any(code == win_code for _, code in clues):
+            continue
+        if len(clues) < settings.min_clues or (settings.max_clues is not None and len(clues) > settings.max_clues):
+            continue
+        return Puzzle(num_digits, Number.from_array(secret),
+                      [(Number.from_array(guess), Clue(code, num_digits)) for guess, code in clues])
+    raise ValueError(f"No puzzle with {settings.min_clues} to {settings.max_clues} clues "
+                     f"found in {settings.max_attempts} attempts.")
+
+
+def generate_batch(settings: PuzzleSettings, count: int, seed: np.random.SeedSequence) -> list[Puzzle]:
+    """ Generates `count` puzzles from one seed; the unit of work of `generate_puzzles`. """
+    rng = np.random.default_rng(seed)
+    return [generate_puzzle(settings, rng) for _ in range(count)]
+
+
+def generate_puzzles(settings: PuzzleSettings, count: int, workers: int | None = None, seed: int = 0,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> list[Puzzle]:
+    """
+    Generates many puzzles across a process pool.
+
+    Args:
+        settings: The generation settings.
+        count: The number of puzzles.
+        workers: Number of worker processes. Defaults to the number of CPUs;
+                 1 runs everything in the current process.
+        seed: Run seed. The same seed and batch size always give the same puzzles.
+        batch_size: Number of puzzles per task.
+
+    Returns:
+        The puzzles, in a reproducible order.
+
+    Raises:
+        ValueError: If the settings are invalid, a count is not positive, or a puzzle cannot be generated.
+    """
+    settings.validate()
+    if count <= 0 or batch_size <= 0:
+        raise ValueError("Puzzle and batch counts must be positive integers.")
+    batch_sizes = [min(batch_size, count - start) for start in range(0, count, batch_size)]
+    batch_seeds = np.random.SeedSequence([seed, settings.num_digits]).spawn(len(batch_sizes))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        batches = [generate_batch(settings, size, batch_seed) for size, batch_seed in zip(batch_sizes, batch_seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(generate_batch, settings, size, batch_seed)
+                       for size, batch_seed in zip(batch_sizes, batch_seeds)]
+            batches = [f.result() for f in futures]
+    return [puzzle for batch in batches for puzzle in batch]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate TSF puzzles: clue sets with exactly one solution.")
+    parser.add_argument("--digits", type=int, default=4, help=f"Number of digits ({MIN_DIGITS}-{MAX_DIGITS}).")
+    parser.add_argument("--count", type=int, default=365, help="Number of puzzles.")
+    parser.add_argument("--pool-size", type=int, default=16,
+                        help="Guesses considered per clue; smaller gives less informative clues.")
+    parser.add_argument("--max-exact", type=int, default=None, help="Maximum 'T' clues for any single guess.")
+    parser.add_argument("--min-clues", type=int, default=2, help="Reject puzzles with fewer clues.")
+    parser.add_argument("--max-clues", type=int, default=None, help="Reject puzzles with more clues.")
+    parser.add_argument("--max-attempts", type=int, default=100,
+                        help="Secrets tried per puzzle before giving up (bounds infeasible clue ranges).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs).")
+    parser.add_argument("--seed", type=int, default=0, help="Run seed for reproducible puzzles.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Puzzles per worker task.")
+    parser.add_argument("--output", default=None, help="Write the puzzles as JSON lines to this file (default: stdout).")
+    args = parser.parse_args()
+
+    settings = PuzzleSettings(args.digits, args.pool_size, args.max_exact, args.min_clues, args.max_clues,
+                              args.max_attempts)
+    try:
+        settings.validate()
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    try:
+        puzzles = generate_puzzles(settings, args.count, args.workers, args.seed, args.batch_size)
+    except ValueError as e:
+        parser.exit(1, f"Error: {e}\n")
+    lines = [json.dumps(puzzle.to_dict()) + "\n" for puzzle in puzzles]
+    if args.output:
+        with open(args.output, "w") as f:
+            f.writelines(lines)
+    else:
+        sys.stdout.writelines(lines)
+    clue_counts = [len(puzzle.clues) for puzzle in puzzles]
+    print(f"Generated {len(puzzles)} puzzles in {time.perf_counter() - start:.1f}s "
+          f"({min(clue_counts)}-{max(clue_counts)} clues, mean {np.mean(clue_counts):.2f}).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
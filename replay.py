@@ -0,0 +1,173 @@
+"""
+TSF Game - Game Log Replay
+
+Re-runs bot strategies offline against games recorded in game logs (see
+`game_log.py`). For every logged game whose secret is known, a fresh bot
+plays that same secret under the same settings, and its result is compared
+with the recorded player's.
+
+The replay is a pipeline of generators:
+
+    read_logs -> select_games -> replay_games -> summarize_replays
+
+Each stage consumes and yields one game at a time and the summary keeps only
+running totals, so multi-gigabyte logs are processed in constant memory.
+
+Run it from the command line, e.g.:
+    python replay.py --strategy entropy --mode human
+    python replay.py games.tsflog other.tsflog --strategy heuristic --digits 4
+"""
+import argparse
+import json
+import random
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+import numpy as np
+
+from core_game_logic import winning_clue_code
+from game_log import BOT_GUESSER, HARD_HUMAN_GUESSER, HUMAN_GUESSER, GameRecord, game_log_path, read_game_log
+from simulation import HEURISTIC_BOT, make_bot, play_game
+from strategies import STRATEGIES
+
+MODE_NAMES: dict[str, int | None] = {"human": HUMAN_GUESSER, "bot": BOT_GUESSER, "hard": HARD_HUMAN_GUESSER,
+                                     "all": None}
+
+
+@dataclass
+class ReplayResult:
+    """
+    A bot's replay of one logged game.
+
+    Attributes:
+        record (GameRecord): The logged game.
+        recorded_guesses (int | None): Guesses the recorded player took, or None if unsolved.
+        bot_guesses (int | None): Guesses the replaying bot took, or None if unsolved.
+    """
+    record: GameRecord
+    recorded_guesses: int | None
+    bot_guesses: int | None
+
+
+@dataclass
+class ReplaySummary:
+    """ Running totals over replayed games. """
+    strategy: str
+    games: int = 0
+    recorded_solved: int = 0
+    bot_solved: int = 0
+    both_solved: int = 0
+    recorded_guesses_total: int = 0
+    bot_guesses_total: int = 0
+    bot_better: int = 0
+    recorded_better: int = 0
+    ties: int = 0
+
+    def add(self, result: ReplayResult):
+        """ Adds one replayed game to the totals. """
+        self.games += 1
+        recorded, bot = result.recorded_guesses, result.bot_guesses
+        self.recorded_solved += recorded is not None
+        self.bot_solved += bot is not None
+        if recorded is not None and bot is not None:
+            self.both_solved += 1
+            self.recorded_guesses_total += recorded
+            self.bot_guesses_total += bot
+        # An unsolved game counts as worse than any solved one.
+        recorded_rank = recorded if recorded is not None else float("inf")
+        bot_rank = bot if bot is not None else float("inf")
+        if bot_rank < recorded_rank:
+            self.bot_better += 1
+        elif recorded_rank < bot_rank:
+            self.recorded_better += 1
+        else:
+            self.ties += 1
+
+    def to_dict(self) -> dict:
+        """ Returns the totals, plus mean guesses over games both sides solved, as a JSON-serializable dict. """
+        summary = dict(self.__dict__)
+        both = self.both_solved
+        summary["recorded_mean_guesses"] = self.recorded_guesses_total / both if both else float("nan")
+        summary["bot_mean_guesses"] = self.bot_guesses_total / both if both else float("nan")
+        return summary
+
+
+def read_logs(paths: Iterable[str]) -> Iterator[GameRecord]:
+    """ Streams the records of several log files, one file after another. """
+    for path in paths:
+        yield from read_game_log(path)
+
+
+def select_games(records: Iterable[GameRecord], num_digits: int | None = None,
+                 mode: int | None = None) -> Iterator[GameRecord]:
+    """
+    Keeps the games that can be replayed (secret known) and match the filters.
+
+    Args:
+        records: Logged games.
+        num_digits: Only keep games with this many digits, if given.
+        mode: Only keep games with this mode (`game_log.HUMAN_GUESSER`, `HARD_HUMAN_GUESSER` or
+            `BOT_GUESSER`), if given. Otherwise hard-mode games are skipped: their players faced an
+            adaptive host rather than the recorded secret, so they are only replayed on request.
+    """
+    for record in records:
+        if record.secret is None:
+            continue
+        if num_digits is not None and record.num_digits != num_digits:
+            continue
+        if record.mode != mode and (mode is not None or record.mode == HARD_HUMAN_GUESSER):
+            continue
+        yield record
+
+
+def replay_games(records: Iterable[GameRecord], strategy_name: str, seed: int = 0,
+                 **strategy_kwargs) -> Iterator[ReplayResult]:
+    """
+    Plays every record's secret again with a fresh bot.
+
+    Args:
+        records: Logged games with known secrets (see `select_games`).
+        strategy_name: See `simulation.make_bot`.
+        seed: Seed for the bots' random choices; replays are reproducible from it.
+        **strategy_kwargs: Passed to the strategy's constructor.
+    """
+    random.seed(seed)
+    seeds = np.random.SeedSequence(seed)
+    for record in records:
+        win_code = winning_clue_code(record.num_digits)
+        solved = bool(record.moves) and record.moves[-1][1] == win_code
+        bot = make_bot(record.num_digits, strategy_name, seeds.spawn(1)[0], **strategy_kwargs)
+        bot_guesses, _ = play_game(bot, record.secret_number(), record.max_guesses)
+        yield ReplayResult(record, len(record.moves) if solved else None, bot_guesses)
+
+
+def summarize_replays(results: Iterable[ReplayResult], strategy_name: str) -> ReplaySummary:
+    """ Consumes replay results into running totals. """
+    summary = ReplaySummary(strategy_name)
+    for result in results:
+        summary.add(result)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay logged games with a bot strategy.")
+    parser.add_argument("logs", nargs="*", help="Game log files (default: the game log in the cache directory).")
+    parser.add_argument("--strategy", default="entropy", choices=[HEURISTIC_BOT, *STRATEGIES],
+                        help="Bot strategy to replay with.")
+    parser.add_argument("--digits", type=int, default=None, help="Only replay games with this many digits.")
+    parser.add_argument("--mode", default="human", choices=list(MODE_NAMES),
+                        help="Which logged games to replay: played by humans, by bots, by humans in "
+                             "hard mode, or all but hard mode.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the bots' random choices.")
+    args = parser.parse_args()
+
+    paths = args.logs or [game_log_path()]
+    if paths == [None]:
+        parser.error("Game logging is disabled (TSF_GAME_LOG=off); pass log files explicitly.")
+    games = select_games(read_logs(paths), args.digits, MODE_NAMES[args.mode])
+    summary = summarize_replays(replay_games(games, args.strategy, args.seed), args.strategy)
+    print(json.dumps(summary.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+TSF Game - Compact Session Store
+
+`GameSession` keeps its secret and history as lists of digit strings, which
+costs hundreds of bytes per game. The game server instead keeps every open
+game in a `SessionStore`: one NumPy column per field, indexed by slot, with
+each secret and guess stored as its enumeration index (see
+`permutation_index`) and each clue list as its base-3 feedback code
+(see `core_game_logic.encode_clues`). An open game costs about 24 bytes plus
+10 bytes per guess made.
+
+Guesses go to an append-only move log (owner slot, guess index, feedback
+code). The log is compacted when it fills up, dropping the moves of closed
+games, and a slot's moves are those logged after the slot was last (re)used.
+
+Session ids encode the slot and a random token, e.g. "0000002a9f31c07e",
+so looking a session up needs no dictionary, and a stale id for a reused
+slot is rejected because its token no longer matches.
+
+Snapshots are single binary files that can be restored in well under a
+second per million games. Layout (little-endian):
+    header:  magic b"TSFS", version (uint8), slots (uint32), moves (uint32),
+             saved at (float64, Unix time)
+    body:    each slot column, then each move column, as raw arrays
+"""
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from core_game_logic import Clue, Number, score_guess
+from game_session import validate_settings
+from permutation_index import num_permutations, rank, unrank
+
+SNAPSHOT_MAGIC: bytes = b"TSFS"
+SNAPSHOT_VERSION: int = 1
+
+# Values of the `status` column.
+FREE: int = 0
+ACTIVE: int = 1
+WON: int = 2
+LOST: int = 3
+
+_HEADER = struct.Struct("<4sBIId")
+_INITIAL_CAPACITY = 1024
+
+# Column names and dtypes, in snapshot order.
+_SLOT_COLUMNS: dict[str, np.dtype] = {
+    "status": np.dtype(np.uint8),
+    "num_digits": np.dtype(np.uint8),
+    "max_guesses": np.dtype(np.uint8),
+    "guesses_taken": np.dtype(np.uint8),
+    "secret": np.dtype("<u4"),
+    "token": np.dtype("<u4"),
+    "first_move": np.dtype("<u4"),
+    "last_active": np.dtype("<f8"),
+}
+_MOVE_COLUMNS: dict[str, np.dtype] = {
+    "move_slot": np.dtype("<u4"),
+    "move_guess": np.dtype("<u4"),
+    "move_code": np.dtype("<u2"),
+}
+
+
+class SessionStore:
+    """
+    Column-oriented storage for many concurrent games.
+
+    Each game occupies one slot; slot columns (e.g. `status`, `secret`,
+    `guesses_taken`) are NumPy arrays of length `capacity`, and move columns
+    (`move_slot`, `move_guess`, `move_code`) hold the logged guesses.
+
+    Attributes:
+        max_sessions (int): The maximum number of games open at once.
+        num_slots (int): Slots ever used; free slots below it are reused first.
+        num_moves (int): Entries in use in the move log.
+    """
+    def __init__(self, max_sessions: int = 1_000_000, rng: np.random.Generator | None = None):
+        """
+        Args:
+            max_sessions: The maximum number of games open at once.
+            rng: Generator for the secrets of new games (a fresh, unseeded one by default).
+        """
+        self.max_sessions: int = max_sessions
+        self.rng: np.random.Generator = rng if rng is not None else np.random.default_rng()
+        self.num_slots: int = 0
+        self.num_moves: int = 0
+        self._free_slots: list[int] = []
+        self._open: int = 0
+        capacity = min(_INITIAL_CAPACITY, max_sessions)
+        for name, dtype in _SLOT_COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        for name, dtype in _MOVE_COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        """ The number of games holding a slot (active, or finished but not yet closed). """
+        return self._open
+
+    def nbytes(self) -> int:
+        """ Returns the memory held by all columns, in bytes. """
+        return sum(getattr(self, name).nbytes for name in (*_SLOT_COLUMNS, *_MOVE_COLUMNS))
+
+    # --- Sessions ---
+
+    def create(self, num_digits: int, max_guesses: int, secret_number: Number | None = None) -> str:
+        """
+        Opens a new game.
+
+        Args:
+            num_digits: The number of digits in the secret number.
+            max_guesses: The maximum number of guesses allowed.
+            secret_number: The secret to use; a random one is chosen if omitted.
+
+        Returns:
+            The new game's session id.
+
+        Raises:
+            ValueError: If the store is full or the settings are out of range.
+        """
+        validate_settings(num_digits, max_guesses)
+        if self._open >= self.max_sessions:
+            raise ValueError("server busy")
+        if secret_number is None:
+            secret = int(self.rng.integers(num_permutations(num_digits)))
+        else:
+            if len(secret_number) != num_digits:
+                raise ValueError(f"Secret number must have {num_digits} digits.")
+            secret = rank(secret_number)
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self.num_slots == len(self.status):
+                self._grow_slots()
+            slot = self.num_slots
+            self.num_slots += 1
+        token = int.from_bytes(os.urandom(4), "little")
+        self.status[slot] = ACTIVE
+        self.num_digits[slot] = num_digits
+        self.max_guesses[slot] = max_guesses
+        self.guesses_taken[slot] = 0
+        self.secret[slot] = secret
+        self.token[slot] = token
+        self.first_move[slot] = self.num_moves
+        self.last_active[slot] = time.time()
+        self._open += 1
+        return f"{slot:08x}{token:08x}"
+
+    def lookup(self, session_id: str) -> int:
+        """
+        Returns the slot of an open game and marks the game as active.
+
+        Raises:
+            ValueError: If no such game is open (it may have ended or expired).
+        """
+        try:
+            if len(session_id) != 16:
+                raise ValueError
+            slot, token = int(session_id[:8], 16), int(session_id[8:], 16)
+        except ValueError:
+            raise ValueError(f"unknown session {session_id}") from None
+        if slot >= self.num_slots or self.status[slot] != ACTIVE or self.token[slot] != token:
+            raise ValueError(f"unknown session {session_id}")
+        self.last_active[slot] = time.time()
+        return slot
+
+    def secret_number(self, slot: int) -> Number:
+        """ Returns a game's secret number. """
+        return Number.from_digits(unrank(int(self.secret[slot]), int(self.num_digits[slot])))
+
+    def submit_guess(self, slot: int, guess: Number) -> Clue:
+        """
+        Scores a guess for an open game and logs it.
+
+        Args:
+            slot: The game's slot (see `lookup`).
+            guess: A validated guess (see `game_session.parse_guess`).
+
+        Returns:
+            The clues for the guess. Check `status[slot]` for WON or LOST afterwards.
+
+        Raises:
+            ValueError: If the game is not open.
+        """
+        if self.status[slot] != ACTIVE:
+            raise ValueError("The game is already over.")
+        clues = score_guess(guess, self.secret_number(slot))
+        self._log_move(slot, rank(guess), clues.code)
+
+        self.guesses_taken[slot] += 1
+        if clues.is_win:
+            self.status[slot] = WON
+        elif self.guesses_taken[slot] >= self.max_guesses[slot]:
+            self.status[slot] = LOST
+        return clues
+
+    def history(self, slot: int) -> list[tuple[int, int]]:
+        """ Returns a game's moves as (guess enumeration index, feedback code) pairs. """
+        start = int(self.first_move[slot])
+        rows = start + np.nonzero(self.move_slot[start:self.num_moves] == slot)[0]
+        return [(int(g), int(c)) for g, c in zip(self.move_guess[rows], self.move_code[rows])]
+
+    def close(self, slot: int):
+        """ Frees a game's slot; its logged moves are dropped at the next compaction. """
+        if self.status[slot] == FREE:
+            return
+        self.status[slot] = FREE
+        self.token[slot] = 0
+        self._free_slots.append(slot)
+        self._open -= 1
+
+    def expire_idle(self, idle_timeout: float, now: float | None = None) -> int:
+        """
+        Closes every open game without a command in the last `idle_timeout` seconds.
+
+        Returns:
+            The number of games closed.
+        """
+        cutoff = (time.time() if now is None else now) - idle_timeout
+        used = slice(0, self.num_slots)
+        expired = np.nonzero((self.status[used] != FREE) & (self.last_active[used] < cutoff))[0]
+        for slot in expired.tolist():
+            self.close(slot)
+        return len(expired)
+
+    # --- Storage management ---
+
+    def _grow_slots(self):
+        capacity = min(max(2 * len(self.status), 1), max(self.max_sessions, self.num_slots + 1))
+        for name in _SLOT_COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def _log_move(self, slot: int, guess_index: int, code: int):
+        if self.num_moves == len(self.move_slot):
+            self.compact()
+            if 2 * self.num_moves >= len(self.move_slot):
+                capacity = 2 * len(self.move_slot)
+                for name in _MOVE_COLUMNS:
+                    column = getattr(self, name)
+                    grown = np.zeros(capacity, dtype=column.dtype)
+                    grown[:self.num_moves] = column[:self.num_moves]
+                    setattr(self, name, grown)
+        self.move_slot[self.num_moves] = slot
+        self.move_guess[self.num_moves] = guess_index
+        self.move_code[self.num_moves] = code
+        self.num_moves += 1
+
+    def compact(self):
+        """ Drops logged moves of closed games and of earlier users of reused slots. """
+        n = self.num_moves
+        owners = self.move_slot[:n]
+        live = (self.status[owners] != FREE) & (np.arange(n) >= self.first_move[owners])
+        kept = np.nonzero(live)[0]
+        for name in _MOVE_COLUMNS:
+            column = getattr(self, name)
+            column[:len(kept)] = column[kept]
+        self.num_moves = len(kept)
+        # Each open game's moves now start at or after its first kept move.
+        used = slice(0, self.num_slots)
+        self.first_move[used] = self.num_moves
+        np.minimum.at(self.first_move, self.move_slot[:self.num_moves], np.arange(self.num_moves, dtype=np.uint32))
+
+    # --- Snapshots ---
+
+    def to_bytes(self) -> bytes:
+        """ Compacts the store and serializes it in the snapshot format. """
+        self.compact()
+        parts = [_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.num_slots, self.num_moves, time.time())]
+        parts += [getattr(self, name)[:self.num_slots].tobytes() for name in _SLOT_COLUMNS]
+        parts += [getattr(self, name)[:self.num_moves].tobytes() for name in _MOVE_COLUMNS]
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_sessions: int = 1_000_000, now: float | None = None) -> "SessionStore":
+        """
+        Rebuilds a store from `to_bytes` output. Session ids remain valid.
+
+        Every game's last activity time is moved forward by the time elapsed
+        since the snapshot was saved, so the time the server was down does not
+        count towards the idle timeout (see `expire_idle`).
+
+        Args:
+            data: The snapshot.
+            max_sessions: The maximum number of games open at once.
+            now: The current Unix time (default: `time.time()`).
+
+        Raises:
+            ValueError: If `data` is not a supported snapshot.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Truncated session snapshot.")
+        magic, version, num_slots, num_moves, saved_at = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"Not a TSF session snapshot (version {SNAPSHOT_VERSION}).")
+        expected = _HEADER.size + sum(num_slots * d.itemsize for d in _SLOT_COLUMNS.values()) \
+            + sum(num_moves * d.itemsize for d in _MOVE_COLUMNS.values())
+        if len(data) != expected:
+            raise ValueError("Truncated session snapshot.")
+
+        store = cls(max(max_sessions, num_slots))
+        offset = _HEADER.size
+        for columns, count in ((_SLOT_COLUMNS, num_slots), (_MOVE_COLUMNS, num_moves)):
+            for name, dtype in columns.items():
+                column = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+                grown = np.zeros(max(count, _INITIAL_CAPACITY), dtype=dtype)
+                grown[:count] = column
+                setattr(store, name, grown)
+                offset += count * dtype.itemsize
+        store.num_slots = num_slots
+        store.num_moves = num_moves
+        store.last_active[:num_slots] += max(0.0, (time.time() if now is None else now) - saved_at)
+        store._free_slots = np.nonzero(store.status[:num_slots] == FREE)[0][::-1].tolist()
+        store._open = int(np.count_nonzero(store.status[:num_slots] != FREE))
+        return store
+
+    def save_snapshot(self, path: str):
+        """ Writes a snapshot to `path` atomically (see `write_snapshot`). """
+        write_snapshot(self.to_bytes(), path)
+
+    @classmethod
+    def load_snapshot(cls, path: str, max_sessions: int = 1_000_000) -> "SessionStore":
+        """
+        Restores a store saved with `save_snapshot` (see `from_bytes`).
+
+        Raises:
+            ValueError: If the file is not a supported snapshot.
+            OSError: If the file cannot be read.
+        """
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), max_sessions)
+
+
+def write_snapshot(data: bytes, path: str):
+    """
+    Writes snapshot bytes to a temporary file and renames it into place, so a
+    crash mid-write never leaves a partial snapshot at `path`.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
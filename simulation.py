@@ -0,0 +1,281 @@
+"""
+TSF Game - Headless Bot Simulation
+
+This module plays full bot-vs-secret games without any human input: secrets
+come from `core_game_logic.generate_secrets`, clues from
+`core_game_logic.score_guess`, and each clue is fed back into the bot's
+`update_strategy`. It records guesses-to-solve, per-move latency and CPU time.
+
+Games are split into fixed-size batches that run on a process pool. Every
+batch derives its own seed from the run seed and its batch number, so the
+aggregate results are reproducible regardless of how many workers are used.
+
+Run it from the command line, e.g.:
+    python simulation.py --digits 4 --games 10000 --strategy entropy --workers 8
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from bot_tracing import default_sink
+from bots import BotPlayer, SolverBotPlayer
+from core_game_logic import CLASSIC, Number, Variant, generate_secrets, score_guess, secret_streams
+from feedback_table import MAX_TABLE_DIGITS, load_feedback_table
+from strategies import STRATEGIES, PartitionStrategy, RandomConsistentStrategy, make_strategy
+
+# Name of the original heuristic `BotPlayer` in strategy listings.
+HEURISTIC_BOT: str = "heuristic"
+
+# Number of games played per task submitted to the process pool.
+DEFAULT_BATCH_SIZE: int = 200
+
+
+@dataclass
+class BatchResult:
+    """
+    Raw results of one batch of simulated games.
+
+    Attributes:
+        guesses (np.ndarray): `int16` guesses taken per game; -1 for games not solved
+            within `max_guesses`.
+        move_latencies (np.ndarray): `float32` seconds spent per move (guess generation
+            plus strategy update), for every move of every game.
+        cpu_seconds (float): CPU time spent playing the batch's games (bot creation excluded).
+    """
+    guesses: np.ndarray
+    move_latencies: np.ndarray
+    cpu_seconds: float
+
+
+@dataclass
+class SimulationSummary:
+    """ Aggregate statistics over all simulated games. """
+    num_digits: int
+    strategy: str
+    max_guesses: int
+    games: int
+    wins: int
+    mean_guesses: float
+    guess_percentiles: dict[str, float]
+    guess_distribution: dict[int, int]
+    latency_ms_percentiles: dict[str, float]
+    cpu_ms_per_move: float
+    elapsed_seconds: float
+
+    def to_dict(self) -> dict:
+        """ Returns the summary as a JSON-serializable dict. """
+        return dict(self.__dict__)
+
+
+def make_bot(num_digits: int, strategy_name: str, seed: np.random.SeedSequence | None = None,
+             use_feedback_table: bool = False, variant: Variant = CLASSIC, **strategy_kwargs) -> BotPlayer:
+    """
+    Creates a bot for the given strategy.
+
+    Args:
+        num_digits: The number of digits in the secret number.
+        strategy_name: `HEURISTIC_BOT` for the original `BotPlayer`, or a name from
+            `strategies.STRATEGIES` for a `SolverBotPlayer`.
+        seed: Seed for the strategy's random generator.
+        use_feedback_table: Use the cached feedback table when `num_digits` allows it (classic game only).
+        variant: The alphabet and repeat policy (see `bots.SolverBotPlayer` for the strategies it supports).
+        **strategy_kwargs: Passed to the strategy's constructor.
+
+    Returns:
+        The new bot.
+    """
+    if strategy_name == HEURISTIC_BOT:
+        return BotPlayer(num_digits, variant=variant)
+    use_feedback_table = use_feedback_table and variant == CLASSIC and num_digits <= MAX_TABLE_DIGITS
+    table = load_feedback_table(num_digits) if use_feedback_table else None
+    return SolverBotPlayer(num_digits, table, make_strategy(strategy_name, seed=seed, **strategy_kwargs),
+                           variant=variant)
+
+
+def play_game(bot: BotPlayer, secret: Number, max_guesses: int) -> tuple[int | None, list[float]]:
+    """
+    Plays one full game between a bot and a known secret.
+
+    Args:
+        bot: A freshly created bot.
+        secret: The secret number.
+        max_guesses: The maximum number of guesses allowed.
+
+    Returns:
+        A tuple (guesses taken, or None if not solved; seconds spent on each move).
+    """
+    latencies = []
+    for guess_number in range(1, max_guesses + 1):
+        start = time.perf_counter()
+        guess = bot.generate_guess()
+        clues = score_guess(guess, secret)
+        bot.update_strategy(guess, clues)
+        latencies.append(time.perf_counter() - start)
+        if clues.is_win:
+            return guess_number, latencies
+    return None, latencies
+
+
+def run_batch(num_digits: int, strategy_name: str, max_guesses: int, num_games: int,
+              seed: np.random.SeedSequence, use_feedback_table: bool = False,
+              strategy_kwargs: dict | None = None, variant: Variant = CLASSIC) -> BatchResult:
+    """
+    Plays a batch of games with a dedicated, reproducible random stream.
+
+    The batch's secrets are drawn in one call from a generator derived from
+    `seed`, the global `random` module (used by the heuristic `BotPlayer`) is
+    reseeded from a second derived stream, and each game's strategy gets a
+    child seed, so no random state is shared between batches.
+
+    Args:
+        num_digits: The number of digits in the secret number.
+        strategy_name: See `make_bot`.
+        max_guesses: The maximum number of guesses per game.
+        num_games: The number of games to play.
+        seed: The batch's seed sequence.
+        use_feedback_table: See `make_bot`.
+        strategy_kwargs: Extra keyword arguments for the strategy's constructor.
+        variant: The alphabet and repeat policy.
+
+    Returns:
+        The batch's raw results.
+    """
+    secret_rng, heuristic_rng = secret_streams(seed, 2)
+    random.seed(int(heuristic_rng.integers(2 ** 63)))
+    secrets = generate_secrets(num_games, num_digits, secret_rng, variant)
+    guesses = np.empty(num_games, dtype=np.int16)
+    latencies: list[float] = []
+    cpu_seconds = 0.0
+    for game, game_seed in enumerate(seed.spawn(num_games)):
+        bot = make_bot(num_digits, strategy_name, game_seed, use_feedback_table, variant, **(strategy_kwargs or {}))
+        cpu_start = time.process_time()
+        taken, move_latencies = play_game(bot, Number.from_array(secrets[game]), max_guesses)
+        cpu_seconds += time.process_time() - cpu_start
+        guesses[game] = -1 if taken is None else taken
+        latencies.extend(move_latencies)
+    default_sink().flush() # Pool workers exit without running atexit handlers
+    return BatchResult(guesses, np.array(latencies, dtype=np.float32), cpu_seconds)
+
+
+def summarize(results: list[BatchResult], num_digits: int, strategy_name: str, max_guesses: int,
+              elapsed_seconds: float) -> SimulationSummary:
+    """
+    Aggregates batch results into a `SimulationSummary`.
+    """
+    guesses = np.concatenate([r.guesses for r in results])
+    latencies_ms = np.concatenate([r.move_latencies for r in results]) * 1000.0
+    solved = guesses[guesses > 0]
+    values, counts = np.unique(solved, return_counts=True)
+    num_moves = len(latencies_ms)
+
+    def percentiles(values: np.ndarray) -> dict[str, float]:
+        if len(values) == 0:
+            return {}
+        return {f"p{p}": float(np.percentile(values, p)) for p in (50, 90, 99)} | {"max": float(values.max())}
+
+    return SimulationSummary(
+        num_digits=num_digits,
+        strategy=strategy_name,
+        max_guesses=max_guesses,
+        games=len(guesses),
+        wins=len(solved),
+        mean_guesses=float(solved.mean()) if len(solved) else float("nan"),
+        guess_percentiles=percentiles(solved),
+        guess_distribution={int(v): int(c) for v, c in zip(values, counts)},
+        latency_ms_percentiles=percentiles(latencies_ms),
+        cpu_ms_per_move=1000.0 * sum(r.cpu_seconds for r in results) / num_moves if num_moves else float("nan"),
+        elapsed_seconds=elapsed_seconds,
+    )
+
+
+def simulate(num_digits: int, num_games: int, strategy_name: str = "entropy", max_guesses: int = 100,
+             workers: int | None = None, seed: int = 0, batch_size: int = DEFAULT_BATCH_SIZE,
+             use_feedback_table: bool = False, strategy_kwargs: dict | None = None,
+             variant: Variant = CLASSIC) -> SimulationSummary:
+    """
+    Plays `num_games` headless games across a process pool and aggregates the results.
+
+    Args:
+        num_digits: The number of digits in the secret number.
+        num_games: The total number of games to play.
+        strategy_name: See `make_bot`.
+        max_guesses: The maximum number of guesses per game.
+        workers: Number of worker processes. Defaults to the number of CPUs;
+                 1 runs everything in the current process.
+        seed: Run seed. The same seed and batch size always give the same results.
+        batch_size: Number of games per task.
+        use_feedback_table: See `make_bot`.
+        strategy_kwargs: Extra keyword arguments for the strategy's constructor.
+        variant: The alphabet and repeat policy.
+
+    Returns:
+        The aggregate statistics.
+
+    Raises:
+        ValueError: If the strategy name is unknown or a count is not positive.
+    """
+    if strategy_name != HEURISTIC_BOT and strategy_name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy_name}'.")
+    if num_games <= 0 or batch_size <= 0 or max_guesses <= 0:
+        raise ValueError("Game, batch and guess counts must be positive integers.")
+
+    batch_sizes = [min(batch_size, num_games - start) for start in range(0, num_games, batch_size)]
+    batch_seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes)) # One independent stream per batch
+    common = (num_digits, strategy_name, max_guesses)
+
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [run_batch(*common, size, batch_seed, use_feedback_table, strategy_kwargs, variant)
+                   for size, batch_seed in zip(batch_sizes, batch_seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_batch, *common, size, batch_seed, use_feedback_table, strategy_kwargs, variant)
+                       for size, batch_seed in zip(batch_sizes, batch_seeds)]
+            results = [f.result() for f in futures]
+    return summarize(results, num_digits, strategy_name, max_guesses, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless TSF games between a bot and random secrets.")
+    parser.add_argument("--digits", type=int, default=4, help="Number of digits in the secret (1-10).")
+    parser.add_argument("--games", type=int, default=1000, help="Number of games to play.")
+    parser.add_argument("--max-guesses", type=int, default=100, help="Maximum guesses per game.")
+    parser.add_argument("--strategy", default="entropy", choices=[HEURISTIC_BOT, *STRATEGIES],
+                        help="Bot strategy to simulate.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs).")
+    parser.add_argument("--seed", type=int, default=0, help="Run seed for reproducible results.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Games per worker task.")
+    parser.add_argument("--feedback-table", action="store_true",
+                        help="Use the cached feedback table (up to 5 digits).")
+    parser.add_argument("--symmetry", action="store_true",
+                        help="Score one guess per symmetry class (entropy, minimax, expected-size, lookahead).")
+    parser.add_argument("--alphabet", type=int, default=CLASSIC.alphabet_size,
+                        help="Number of symbols (2-16; digits above 9 are a-f). Variants support the "
+                             f"{HEURISTIC_BOT} and {RandomConsistentStrategy.name} strategies.")
+    parser.add_argument("--repeats", action="store_true", help="Allow repeated symbols in the secret.")
+    args = parser.parse_args()
+
+    variant = Variant(args.alphabet, args.repeats)
+    try:
+        variant.validate(args.digits)
+    except ValueError as e:
+        parser.error(str(e))
+    if variant != CLASSIC and args.strategy not in (HEURISTIC_BOT, RandomConsistentStrategy.name):
+        parser.error(f"Game variants support the {HEURISTIC_BOT} and {RandomConsistentStrategy.name} strategies.")
+    if args.symmetry and not (args.strategy in STRATEGIES and issubclass(STRATEGIES[args.strategy], PartitionStrategy)):
+        parser.error(f"--symmetry is not supported by the {args.strategy} strategy.")
+    strategy_kwargs = {"symmetry": True} if args.symmetry else None
+    summary = simulate(args.digits, args.games, args.strategy, args.max_guesses, args.workers,
+                       args.seed, args.batch_size, args.feedback_table, strategy_kwargs, variant)
+    print(json.dumps(summary.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+TSF Game - Consistent-Candidate Solver
+
+This module keeps the exact set of secrets that are still consistent with every
+(guess, clues) pair seen so far. Secrets are stored as integer-encoded
+permutations in a NumPy array (one row of small ints per secret) rather than
+as lists of strings, so even the 3,628,800 permutations of a 9-digit game fit
+in a few tens of megabytes and can be filtered with vectorized operations.
+It is used by `bots.SolverBotPlayer`.
+"""
+import copy
+from functools import lru_cache
+
+import numpy as np
+
+from core_game_logic import Clue, Number, digit_masks, encode_clues, encode_digits, score_guesses
+from permutation_index import rank
+
+# A clue history: the (guess enumeration index, feedback code) pairs seen so far.
+History = tuple[tuple[int, int], ...]
+
+
+@lru_cache(maxsize=None)
+def enumerate_secrets(num_digits: int) -> np.ndarray:
+    """
+    Enumerates every secret number with `num_digits` unique digits.
+
+    The rows are produced in lexicographic order, so row `k` is the k-th
+    smallest secret, the one with index `k` in `permutation_index`. The returned array is cached and marked read-only;
+    callers must copy it before modifying it.
+
+    Args:
+        num_digits: The number of digits in each secret (1-10).
+
+    Returns:
+        A `uint8` array of shape (10! / (10 - num_digits)!, num_digits),
+        where each row holds the digits of one secret.
+
+    Raises:
+        ValueError: If num_digits is not between 1 and 10.
+    """
+    if not isinstance(num_digits, int) or not (1 <= num_digits <= 10):
+        raise ValueError("Number of digits must be an integer between 1 and 10.")
+
+    rows = np.arange(10, dtype=np.uint8).reshape(10, 1)
+    for _ in range(1, num_digits):
+        # For every partial secret, extend it with each digit it does not use yet.
+        # np.nonzero walks the (rows, digits) grid in row-major order, which keeps
+        # the result in lexicographic order.
+        used = np.zeros((len(rows), 10), dtype=bool)
+        np.put_along_axis(used, rows.astype(np.intp), True, axis=1)
+        row_idx, next_digit = np.nonzero(~used)
+        rows = np.column_stack((rows[row_idx], next_digit.astype(np.uint8)))
+    rows.setflags(write=False)
+    return rows
+
+
+@lru_cache(maxsize=None)
+def all_secret_masks(num_digits: int) -> np.ndarray:
+    """ Cached digit masks for `enumerate_secrets(num_digits)`. """
+    masks = digit_masks(enumerate_secrets(num_digits))
+    masks.setflags(write=False)
+    return masks
+
+
+class CandidateSet:
+    """
+    The set of secrets still consistent with all clues received so far.
+
+    Attributes:
+        num_digits (int): The number of digits in each secret.
+        digits (np.ndarray): `uint8` array of shape (K, num_digits) holding the
+            surviving secrets.
+        masks (np.ndarray): `uint16` array of shape (K,) with the digit mask of
+            each surviving secret (see `core_game_logic.digit_masks`).
+        indices (np.ndarray): `int32` array of shape (K,) with the row of each
+            surviving secret in `enumerate_secrets(num_digits)`.
+        feedback_table (np.ndarray | None): Optional precomputed feedback matrix
+            (see `feedback_table.load_feedback_table`) used instead of scoring.
+        history (History): The (guess enumeration index, feedback code) pairs that
+            narrowed the set down to its current members.
+    """
+    def __init__(self, num_digits: int, feedback_table: np.ndarray | None = None,
+                 indices: np.ndarray | None = None):
+        """
+        Initializes the candidate set with every possible secret, or with the given ones.
+
+        Args:
+            num_digits: The number of unique digits in the secret number.
+            feedback_table: Optional precomputed feedback matrix for `num_digits`.
+            indices: Optional sorted enumeration indices of the initial candidates.
+        """
+        self.num_digits: int = num_digits
+        self.digits: np.ndarray = enumerate_secrets(num_digits)
+        self.masks: np.ndarray = all_secret_masks(num_digits)
+        if indices is None:
+            self.indices: np.ndarray = np.arange(len(self.digits), dtype=np.int32)
+        else:
+            self.indices = np.asarray(indices, dtype=np.int32)
+            self.digits, self.masks = self.digits[self.indices], self.masks[self.indices]
+        self.feedback_table: np.ndarray | None = feedback_table
+        self.history: History = ()
+
+    def __len__(self) -> int:
+        return len(self.digits)
+
+    def scores(self, guess: list[str] | np.ndarray) -> np.ndarray:
+        """
+        Scores `guess` against every candidate.
+
+        Args:
+            guess: A guess, either as a list of digit strings or a `uint8` digit array.
+
+        Returns:
+            An array of shape (K,) with the feedback code each candidate would
+            give (see `core_game_logic.score_guesses`).
+        """
+        encoded_guess = guess if isinstance(guess, np.ndarray) else encode_digits(guess)
+        if self.feedback_table is not None:
+            return self.feedback_table[rank(encoded_guess), self.indices]
+        return score_guesses(encoded_guess, self.digits, self.masks)
+
+    def subset(self, keep: np.ndarray, step: tuple[int, int] | None = None) -> "CandidateSet":
+        """
+        Returns a new candidate set holding only the selected candidates.
+
+        Args:
+            keep: A boolean mask or an array of row numbers into this set.
+            step: The (guess enumeration index, feedback code) pair that selects
+                  these candidates, appended to the new set's history.
+
+        Returns:
+            A new `CandidateSet` sharing this set's feedback table.
+        """
+        child = copy.copy(self)
+        child.digits = self.digits[keep]
+        child.masks = self.masks[keep]
+        child.indices = self.indices[keep]
+        if step is not None:
+            child.history = self.history + (step,)
+        return child
+
+    def filter(self, guess: list[str] | Number, clues: list[str] | Clue) -> int:
+        """
+        Removes every candidate that is inconsistent with the given clues.
+
+        Args:
+            guess: The guess that was made (a `Number` or a list of digit strings).
+            clues: The clues received for that guess (a `Clue` or a list of 'T', 'S', 'F').
+
+        Returns:
+            The number of candidates remaining after filtering.
+
+        Raises:
+            ValueError: If guess or clues do not have `num_digits` entries.
+        """
+        if len(guess) != self.num_digits or len(clues) != self.num_digits:
+            raise ValueError(f"Guess and clues must both have {self.num_digits} entries.")
+        encoded_guess = guess.to_array() if isinstance(guess, Number) else encode_digits(guess)
+        code = clues.code if isinstance(clues, Clue) else encode_clues(clues)
+        keep = self.scores(encoded_guess) == code
+        self.history += ((rank(encoded_guess), code),)
+        self.digits = self.digits[keep]
+        self.masks = self.masks[keep]
+        self.indices = self.indices[keep]
+        return len(self.digits)
@@ -0,0 +1,453 @@
+"""
+TSF Game - Guess-Selection Strategies
+
+This module defines the pluggable strategy interface used by
+`bots.SolverBotPlayer` to pick its next guess from a `solver.CandidateSet`.
+
+Besides picking a random consistent candidate, it provides optimizing
+strategies that choose the guess which best splits the remaining candidates
+into partitions by feedback code:
+
+- max-entropy: maximizes the information (Shannon entropy) of the feedback.
+- minimax: minimizes the size of the largest partition (worst case).
+- expected-size: minimizes the expected number of remaining candidates.
+- lookahead: searches k moves ahead (expectimax or minimax over clue
+  responses), caching positions in a `transposition.TranspositionTable`.
+
+Scoring runs on the vectorized `core_game_logic.score_guesses` (or a
+precomputed feedback table) and partitions are counted with `np.bincount`, so
+there are no per-pair Python loops. Sampling caps bound the number of guesses
+scored and secrets they are scored against, which keeps 8-9 digit games fast.
+"""
+import math
+
+import numpy as np
+
+from core_game_logic import score_guesses, winning_clue_code
+from solver import CandidateSet, enumerate_secrets
+from symmetry import DEFAULT_MAX_SYMMETRY_SPACE, guess_representatives, orbit_representatives
+from transposition import TranspositionTable, candidate_key
+
+# Upper bound on the (guesses x secrets) codes held in memory at once while scoring.
+_MAX_BLOCK_ELEMENTS: int = 1 << 22
+
+
+class GuessStrategy:
+    """
+    Base class for guess-selection strategies.
+
+    Attributes:
+        name (str): Short identifier of the strategy, as used by `make_strategy`.
+        rng (np.random.Generator): Random source for sampling and tie-breaking.
+    """
+    name: str = "base"
+
+    def __init__(self, seed: int | np.random.SeedSequence | None = None):
+        """
+        Initializes the strategy.
+
+        Args:
+            seed: Seed for the strategy's random generator, for reproducible games.
+        """
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+    def choose_guess(self, candidates: CandidateSet) -> np.ndarray:
+        """
+        Picks the next guess.
+
+        Args:
+            candidates: The secrets still consistent with all clues. Must not be empty.
+
+        Returns:
+            The chosen guess as a `uint8` digit array.
+        """
+        raise NotImplementedError
+
+
+class RandomConsistentStrategy(GuessStrategy):
+    """ Guesses a uniformly random candidate that is still consistent with all clues. """
+    name = "random"
+
+    def choose_guess(self, candidates: CandidateSet) -> np.ndarray:
+        return candidates.digits[self.rng.integers(len(candidates))]
+
+
+class PartitionStrategy(GuessStrategy):
+    """
+    Base class for strategies that rank guesses by how they partition the candidates.
+
+    Each guess in a pool is scored against the candidates; the candidates are
+    grouped by the feedback code they would give, and `partition_score` turns the
+    partition sizes into a cost to minimize. Guesses that are themselves
+    candidates win ties, since they might be the answer.
+
+    Attributes:
+        max_guesses_scored (int): Maximum number of guesses scored per move.
+        max_secrets_sampled (int): Maximum number of candidates each guess is scored
+            against; larger candidate sets are estimated from a random sample.
+        consistent_only (bool): If True, only candidates are considered as guesses.
+        symmetry (bool): If True, only one guess per symmetry class is scored
+            (see `symmetry.py`).
+        max_symmetry_space (int): Largest guess space reduced by symmetry in full;
+            beyond it, only the sampled pool is reduced.
+    """
+    def __init__(self, max_guesses_scored: int = 1000, max_secrets_sampled: int = 5000,
+                 consistent_only: bool = False, seed: int | np.random.SeedSequence | None = None,
+                 symmetry: bool = False, max_symmetry_space: int = DEFAULT_MAX_SYMMETRY_SPACE):
+        """
+        Initializes the strategy.
+
+        Args:
+            max_guesses_scored: Maximum number of guesses scored per move.
+            max_secrets_sampled: Maximum number of candidates each guess is scored against.
+            consistent_only: If True, only candidates are considered as guesses.
+            seed: Seed for the strategy's random generator, for reproducible games.
+            symmetry: If True, only one guess per symmetry class is scored.
+            max_symmetry_space: Largest guess space reduced by symmetry in full.
+
+        Raises:
+            ValueError: If either cap is not a positive integer.
+        """
+        super().__init__(seed)
+        if max_guesses_scored <= 0 or max_secrets_sampled <= 0:
+            raise ValueError("Sampling caps must be positive integers.")
+        self.max_guesses_scored: int = max_guesses_scored
+        self.max_secrets_sampled: int = max_secrets_sampled
+        self.consistent_only: bool = consistent_only
+        self.symmetry: bool = symmetry
+        self.max_symmetry_space: int = max_symmetry_space
+
+    def partition_score(self, counts: np.ndarray, total: int) -> np.ndarray:
+        """
+        Converts partition sizes into costs (lower is better).
+
+        Args:
+            counts: Array of shape (G, 3**num_digits); row g holds how many sampled
+                candidates give each feedback code for guess g.
+            total: The number of sampled candidates (sum of each row).
+
+        Returns:
+            A float array of shape (G,) with the cost of each guess.
+        """
+        raise NotImplementedError
+
+    def choose_guess(self, candidates: CandidateSet) -> np.ndarray:
+        if len(candidates) <= 2:
+            # Any candidate splits one or two secrets perfectly.
+            return candidates.digits[0]
+
+        pool_digits, pool_indices, pool_is_candidate = self._guess_pool(candidates)
+        secret_rows = self._sample(len(candidates), self.max_secrets_sampled)
+        costs = self.score_pool(candidates, pool_digits, pool_indices, secret_rows)
+        # Tie-break in favour of candidates, which can end the game immediately.
+        costs = costs - pool_is_candidate * 1e-9
+        return pool_digits[int(np.argmin(costs))]
+
+    def score_pool(self, candidates: CandidateSet, pool_digits: np.ndarray,
+                   pool_indices: np.ndarray, secret_rows: np.ndarray | None) -> np.ndarray:
+        """
+        Computes the cost of every guess in a pool.
+
+        Args:
+            candidates: The secrets still consistent with all clues.
+            pool_digits: `uint8` array of shape (G, num_digits) of guesses to score.
+            pool_indices: Enumeration index of each guess (see `solver.enumerate_secrets`).
+            secret_rows: Rows of `candidates` to score against, or None for all of them.
+
+        Returns:
+            A float array of shape (G,) with the cost of each guess.
+        """
+        secrets = candidates.digits if secret_rows is None else candidates.digits[secret_rows]
+        masks = candidates.masks if secret_rows is None else candidates.masks[secret_rows]
+        secret_indices = candidates.indices if secret_rows is None else candidates.indices[secret_rows]
+        num_codes = 3 ** candidates.num_digits
+
+        costs = np.empty(len(pool_digits), dtype=np.float64)
+        block_rows = max(1, _MAX_BLOCK_ELEMENTS // max(len(secrets), num_codes))
+        for start in range(0, len(pool_digits), block_rows):
+            stop = min(start + block_rows, len(pool_digits))
+            if candidates.feedback_table is not None:
+                codes = candidates.feedback_table[pool_indices[start:stop, None], secret_indices[None, :]]
+            else:
+                codes = score_guesses(pool_digits[start:stop], secrets, masks)
+            counts = partition_counts(codes, num_codes)
+            costs[start:stop] = self.partition_score(counts, len(secrets))
+        return costs
+
+    def _guess_pool(self, candidates: CandidateSet) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Builds the guesses to score: candidates first, then any non-candidates.
+
+        With symmetry reduction enabled, the pool holds one guess per symmetry class,
+        taken from the whole guess space when it is small enough and from the
+        sampled pool otherwise.
+
+        Returns:
+            A tuple (digits, enumeration indices, is-candidate flags) for the pool.
+        """
+        if not self.symmetry:
+            return self._sampled_guess_pool(candidates)
+
+        representatives = guess_representatives(candidates.num_digits, candidates.history, self.max_symmetry_space)
+        if representatives is None:
+            pool_digits, pool_indices, is_candidate = self._sampled_guess_pool(candidates)
+            keep = orbit_representatives(pool_digits, candidates.history)
+            return pool_digits[keep], pool_indices[keep], is_candidate[keep]
+
+        is_candidate = np.isin(representatives, candidates.indices)
+        if self.consistent_only:
+            representatives, is_candidate = representatives[is_candidate], is_candidate[is_candidate]
+        if len(representatives) > self.max_guesses_scored:
+            # Keep candidate classes first (up to half the budget), then sample the rest.
+            candidate_rows = np.nonzero(is_candidate)[0]
+            other_rows = np.nonzero(~is_candidate)[0]
+            candidate_rows = candidate_rows[self.rng.permutation(len(candidate_rows))[:max(1, self.max_guesses_scored // 2)]]
+            other_rows = other_rows[self.rng.permutation(len(other_rows))[:self.max_guesses_scored - len(candidate_rows)]]
+            rows = np.sort(np.concatenate((candidate_rows, other_rows)))
+            representatives, is_candidate = representatives[rows], is_candidate[rows]
+        pool_digits = enumerate_secrets(candidates.num_digits)[representatives]
+        return pool_digits, representatives.astype(np.int32), is_candidate
+
+    def _sampled_guess_pool(self, candidates: CandidateSet) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Builds a random pool of guesses within `max_guesses_scored`.
+
+        Returns:
+            A tuple (digits, enumeration indices, is-candidate flags) for the pool.
+        """
+        if self.consistent_only:
+            rows = self._sample(len(candidates), self.max_guesses_scored)
+            rows = slice(None) if rows is None else rows
+            digits, indices = candidates.digits[rows], candidates.indices[rows]
+            return digits, indices, np.ones(len(digits), dtype=bool)
+
+        # Split the budget between candidates and other secrets, since a guess that
+        # cannot be the answer often splits the candidates better.
+        candidate_budget = max(1, self.max_guesses_scored // 2)
+        rows = self._sample(len(candidates), candidate_budget)
+        rows = slice(None) if rows is None else rows
+        digits, indices = candidates.digits[rows], candidates.indices[rows]
+
+        all_secrets = enumerate_secrets(candidates.num_digits)
+        other_budget = self.max_guesses_scored - len(digits)
+        other = self.rng.choice(len(all_secrets), size=min(other_budget, len(all_secrets)), replace=False)
+        other = other[~np.isin(other, indices)]
+
+        pool_digits = np.concatenate((digits, all_secrets[other]))
+        pool_indices = np.concatenate((indices, other.astype(np.int32)))
+        is_candidate = np.zeros(len(pool_digits), dtype=bool)
+        is_candidate[:len(digits)] = True
+        return pool_digits, pool_indices, is_candidate
+
+    def _sample(self, population: int, cap: int) -> np.ndarray | None:
+        """ Returns sorted random rows to keep `population` within `cap`, or None to keep all. """
+        if population <= cap:
+            return None
+        return np.sort(self.rng.choice(population, size=cap, replace=False))
+
+
+class MaxEntropyStrategy(PartitionStrategy):
+    """ Picks the guess whose feedback carries the most information (Shannon entropy). """
+    name = "entropy"
+
+    def partition_score(self, counts: np.ndarray, total: int) -> np.ndarray:
+        p = counts / total
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropy = -np.where(counts > 0, p * np.log2(p), 0.0).sum(axis=1)
+        return -entropy
+
+
+class MinimaxStrategy(PartitionStrategy):
+    """ Picks the guess whose largest partition (worst-case outcome) is smallest. """
+    name = "minimax"
+
+    def partition_score(self, counts: np.ndarray, total: int) -> np.ndarray:
+        return counts.max(axis=1).astype(np.float64)
+
+
+class ExpectedSizeStrategy(PartitionStrategy):
+    """ Picks the guess that minimizes the expected number of remaining candidates. """
+    name = "expected-size"
+
+    def partition_score(self, counts: np.ndarray, total: int) -> np.ndarray:
+        counts = counts.astype(np.float64)
+        return (counts * counts).sum(axis=1) / total
+
+
+class LookaheadStrategy(MaxEntropyStrategy):
+    """
+    Searches `depth` moves ahead over the possible clue responses.
+
+    A position's value is the number of guesses still needed to solve it: one for
+    the guess itself plus, over every non-winning clue response, the value of
+    the resulting position, either weighted by its probability ('expectimax') or
+    taken at its worst ('minimax'). Only the `beam_width` guesses ranked best by
+    entropy are searched at each node. Positions beyond the search depth are
+    valued with a logarithmic estimate of the guesses left.
+
+    Positions are cached in a transposition table keyed by the canonical form of
+    the candidate set and every setting that affects the search, so a position
+    reached by different guess orders is searched only once. Pass the same table
+    to several strategies to share it, e.g. across the games of a long-running
+    bot service; differently configured strategies keep separate entries.
+
+    Attributes:
+        depth (int): Number of moves searched ahead (1 = greedy on the estimate).
+        beam_width (int): Number of guesses searched at each node.
+        mode (str): 'expectimax' or 'minimax'.
+        transposition_table (TranspositionTable): Cache of evaluated positions.
+    """
+    name = "lookahead"
+
+    # Effective number of partitions a good guess splits the candidates into,
+    # used to estimate the guesses left at the search horizon.
+    LEAF_BRANCHING: float = 6.0
+
+    def __init__(self, depth: int = 2, beam_width: int = 4, mode: str = "expectimax",
+                 transposition_table: TranspositionTable | None = None, max_guesses_scored: int = 300,
+                 max_secrets_sampled: int = 2000, consistent_only: bool = False,
+                 seed: int | np.random.SeedSequence | None = None, symmetry: bool = False,
+                 max_symmetry_space: int = DEFAULT_MAX_SYMMETRY_SPACE):
+        """
+        Initializes the strategy.
+
+        Args:
+            depth: Number of moves searched ahead.
+            beam_width: Number of guesses searched at each node.
+            mode: 'expectimax' (minimize the expected guesses) or 'minimax'
+                (minimize the worst case).
+            transposition_table: Cache of evaluated positions. A new table with
+                default limits is created if omitted.
+            max_guesses_scored: Maximum number of guesses ranked per node.
+            max_secrets_sampled: Maximum number of candidates each guess is ranked against.
+            consistent_only: If True, only candidates are considered as guesses.
+            seed: Seed for the strategy's random generator.
+            symmetry: If True, only one guess per symmetry class is ranked.
+            max_symmetry_space: Largest guess space reduced by symmetry in full.
+
+        Raises:
+            ValueError: If depth, beam_width or mode is invalid.
+        """
+        super().__init__(max_guesses_scored, max_secrets_sampled, consistent_only, seed,
+                         symmetry, max_symmetry_space)
+        if depth <= 0 or beam_width <= 0:
+            raise ValueError("Search depth and beam width must be positive integers.")
+        if mode not in ("expectimax", "minimax"):
+            raise ValueError("Search mode must be 'expectimax' or 'minimax'.")
+        self.depth: int = depth
+        self.beam_width: int = beam_width
+        self.mode: str = mode
+        # Not `or`: an empty table is falsy, and a shared table starts out empty.
+        self.transposition_table: TranspositionTable = transposition_table if transposition_table is not None \
+            else TranspositionTable()
+
+    def choose_guess(self, candidates: CandidateSet) -> np.ndarray:
+        _, guess = self.evaluate(candidates, self.depth)
+        return guess
+
+    def evaluate(self, candidates: CandidateSet, depth: int) -> tuple[float, np.ndarray]:
+        """
+        Computes the value of a position and the best guess in it.
+
+        Args:
+            candidates: The secrets consistent with the clues so far. Must not be empty.
+            depth: Number of moves still searched below this position.
+
+        Returns:
+            A tuple (expected or worst-case guesses still needed, best guess digits).
+        """
+        if len(candidates) <= 2:
+            # Guess a candidate: solved in 1 guess, or 1.5 on average (2 at worst) for two.
+            value = 1.0 if len(candidates) == 1 else (1.5 if self.mode == "expectimax" else 2.0)
+            return value, candidates.digits[0]
+
+        key = (candidate_key(candidates), depth, self._search_settings())
+        cached = self.transposition_table.get(key)
+        if cached is not None:
+            value, guess_index = cached
+            return value, enumerate_secrets(candidates.num_digits)[guess_index]
+
+        pool_digits, pool_indices, pool_is_candidate = self._guess_pool(candidates)
+        secret_rows = self._sample(len(candidates), self.max_secrets_sampled)
+        ranking = self.score_pool(candidates, pool_digits, pool_indices, secret_rows) - pool_is_candidate * 1e-9
+        win_code = winning_clue_code(candidates.num_digits)
+
+        best_value, best_row = math.inf, 0
+        for row in np.argsort(ranking, kind="stable")[:self.beam_width]:
+            codes = candidates.scores(pool_digits[row])
+            order = np.argsort(codes, kind="stable")
+            unique_codes, starts = np.unique(codes[order], return_index=True)
+            outcome = 0.0
+            for code, rows in zip(unique_codes, np.split(order, starts[1:])):
+                if code == win_code:
+                    continue
+                if depth > 1:
+                    step = (int(pool_indices[row]), int(code))
+                    child_value, _ = self.evaluate(candidates.subset(rows, step), depth - 1)
+                else:
+                    child_value = self.estimate_guesses(len(rows))
+                if self.mode == "expectimax":
+                    outcome += len(rows) / len(candidates) * child_value
+                else:
+                    outcome = max(outcome, child_value)
+            value = 1.0 + outcome
+            # Prefer candidates on ties, since they can end the game immediately.
+            if value < best_value - 1e-12 or (abs(value - best_value) <= 1e-12 and pool_is_candidate[row]):
+                best_value, best_row = value, row
+
+        self.transposition_table.put(key, (best_value, int(pool_indices[best_row])))
+        return best_value, pool_digits[best_row]
+
+    def _search_settings(self) -> tuple:
+        # Everything besides the position and depth that changes the guess pool or the values found.
+        return (type(self).__qualname__, self.beam_width, self.mode, self.max_guesses_scored,
+                self.max_secrets_sampled, self.consistent_only, self.symmetry, self.max_symmetry_space,
+                self.LEAF_BRANCHING)
+
+    def estimate_guesses(self, num_candidates: int) -> float:
+        """ Estimates the guesses needed to solve a position with `num_candidates` candidates. """
+        if num_candidates <= 2:
+            return float(num_candidates) if self.mode == "minimax" else (1.0 if num_candidates == 1 else 1.5)
+        return 1.0 + math.log(num_candidates) / math.log(self.LEAF_BRANCHING)
+
+
+def partition_counts(codes: np.ndarray, num_codes: int) -> np.ndarray:
+    """
+    Counts how many secrets fall into each feedback code, for every guess.
+
+    Args:
+        codes: Array of shape (G, K) of feedback codes.
+        num_codes: The number of distinct codes (3**num_digits).
+
+    Returns:
+        An `int64` array of shape (G, num_codes).
+    """
+    offsets = (np.arange(len(codes), dtype=np.int64) * num_codes)[:, None]
+    flat = (codes.astype(np.int64) + offsets).ravel()
+    return np.bincount(flat, minlength=len(codes) * num_codes).reshape(len(codes), num_codes)
+
+
+STRATEGIES: dict[str, type[GuessStrategy]] = {
+    cls.name: cls for cls in (RandomConsistentStrategy, MaxEntropyStrategy, MinimaxStrategy, ExpectedSizeStrategy,
+                              LookaheadStrategy)
+}
+
+
+def make_strategy(name: str, **kwargs) -> GuessStrategy:
+    """
+    Creates a strategy by name.
+
+    Args:
+        name: One of the keys of `STRATEGIES` ('random', 'entropy', 'minimax', 'expected-size',
+              'lookahead').
+        **kwargs: Passed to the strategy's constructor.
+
+    Returns:
+        The new strategy instance.
+
+    Raises:
+        ValueError: If `name` is not a known strategy.
+    """
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{name}'. Choose from: {', '.join(STRATEGIES)}.")
+    return STRATEGIES[name](**kwargs)
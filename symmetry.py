@@ -0,0 +1,178 @@
+"""
+TSF Game - Symmetry Reduction
+
+The T/S/F rules are invariant under relabeling digits and under permuting
+positions, applied to both guess and secret. Once some clues are known, the
+symmetries that survive are those that leave the clue history unchanged:
+
+- Fresh digits, which appear in no previous guess, can be relabeled freely.
+- Two positions i and j can be swapped if every previous clue has the same
+  value at i and j. The swap then also exchanges the digits each previous guess
+  had at i and j. This is only valid when that digit exchange is consistent
+  across the whole history and moves no other guessed digit.
+
+Two guesses related by such a symmetry split the candidate secrets into
+partitions of exactly the same sizes, so a strategy only needs to score one
+representative per equivalence class. Before the first guess every guess is
+equivalent; after it, the number of distinct guesses drops by orders of
+magnitude for 6-9 digits (e.g. from 151,200 guesses to a few hundred
+classes for 6 digits).
+
+The classes found are exact orbits of the subgroup generated by the
+symmetries above, which is sufficient for correctness: equivalent guesses
+that the subgroup misses are simply scored separately.
+"""
+import numpy as np
+
+from core_game_logic import decode_clues
+from solver import History, enumerate_secrets
+
+# Default largest guess space reduced in full; larger spaces are reduced per sampled pool.
+DEFAULT_MAX_SYMMETRY_SPACE: int = 1_000_000
+
+
+def history_guesses(num_digits: int, history: History) -> list[tuple[np.ndarray, list[str]]]:
+    """ Decodes a clue history into (guess digits, clues) pairs. """
+    all_secrets = enumerate_secrets(num_digits)
+    return [(all_secrets[guess_index], decode_clues(code, num_digits)) for guess_index, code in history]
+
+
+def fresh_digits(num_digits: int, history: History) -> np.ndarray:
+    """ Returns the digits, in ascending order, that appear in no guess of `history`. """
+    used = np.zeros(10, dtype=bool)
+    for guess, _ in history_guesses(num_digits, history):
+        used[guess] = True
+    return np.nonzero(~used)[0].astype(np.uint8)
+
+
+def canonicalize_fresh(guesses: np.ndarray, fresh: np.ndarray) -> np.ndarray:
+    """
+    Relabels fresh digits so they appear in ascending order from left to right.
+
+    Every guess is mapped to the smallest member of its class under relabeling
+    of the fresh digits.
+
+    Args:
+        guesses: `uint8` array of shape (G, num_digits).
+        fresh: The fresh digits, in ascending order.
+
+    Returns:
+        A new `uint8` array of shape (G, num_digits).
+    """
+    is_fresh_digit = np.zeros(10, dtype=bool)
+    is_fresh_digit[fresh] = True
+    is_fresh = is_fresh_digit[guesses]
+    # Digits are unique within a guess, so the k-th fresh digit seen gets the k-th fresh label.
+    order = np.cumsum(is_fresh, axis=1) - 1
+    labels = fresh[np.clip(order, 0, max(len(fresh) - 1, 0))] if len(fresh) else guesses
+    return np.where(is_fresh, labels, guesses).astype(np.uint8)
+
+
+def symmetry_generators(num_digits: int, history: History) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Finds position swaps, with their induced digit relabelings, that preserve `history`.
+
+    Args:
+        num_digits: The number of digits in the game.
+        history: The clue history so far.
+
+    Returns:
+        A list of (position permutation, digit permutation) pairs. Applying one to
+        a guess `g` gives `digit_perm[g[position_perm]]`.
+    """
+    decoded = history_guesses(num_digits, history)
+    generators = []
+    for i in range(num_digits):
+        for j in range(i + 1, num_digits):
+            if any(clues[i] != clues[j] for _, clues in decoded):
+                continue
+            digit_perm = np.arange(10, dtype=np.uint8)
+            mapping: dict[int, int] = {}
+            valid = True
+            for guess, _ in decoded:
+                a, b = int(guess[i]), int(guess[j])
+                if mapping.setdefault(a, b) != b or mapping.setdefault(b, a) != a:
+                    valid = False
+                    break
+            if not valid:
+                continue
+            for source, target in mapping.items():
+                digit_perm[source] = target
+            # The relabeling must leave every other position of every previous guess unchanged.
+            if any((digit_perm[np.delete(guess, [i, j])] != np.delete(guess, [i, j])).any() for guess, _ in decoded):
+                continue
+            position_perm = np.arange(num_digits)
+            position_perm[[i, j]] = position_perm[[j, i]]
+            generators.append((position_perm, digit_perm))
+    return generators
+
+
+def _keys(guesses: np.ndarray) -> np.ndarray:
+    """ Packs each guess into an `int64` whose order matches lexicographic order. """
+    weights = 10 ** np.arange(guesses.shape[1] - 1, -1, -1, dtype=np.int64)
+    return guesses.astype(np.int64) @ weights
+
+
+def orbit_representatives(guesses: np.ndarray, history: History) -> np.ndarray:
+    """
+    Picks one guess per symmetry class among `guesses`.
+
+    Args:
+        guesses: `uint8` array of shape (G, num_digits) of distinct guesses.
+        history: The clue history so far.
+
+    Returns:
+        Sorted row numbers into `guesses`, one for each class present.
+    """
+    num_digits = guesses.shape[1]
+    fresh = fresh_digits(num_digits, history)
+    canonical = canonicalize_fresh(guesses, fresh)
+    unique_keys, first_rows = np.unique(_keys(canonical), return_index=True)
+    reduced = canonical[first_rows]
+
+    # Link each reduced guess to its image under every generator that lands in the set.
+    links = []
+    for position_perm, digit_perm in symmetry_generators(num_digits, history):
+        image_keys = _keys(canonicalize_fresh(digit_perm[reduced[:, position_perm]], fresh))
+        targets = np.searchsorted(unique_keys, image_keys)
+        found = targets < len(unique_keys)
+        found[found] = unique_keys[targets[found]] == image_keys[found]
+        links.append((np.nonzero(found)[0], targets[found]))
+
+    # Label propagation: every class converges to the label of its smallest member.
+    labels = np.arange(len(reduced))
+    changed = bool(links)
+    while changed:
+        previous = labels.copy()
+        for sources, targets in links:
+            smallest = np.minimum(labels[sources], labels[targets])
+            np.minimum.at(labels, sources, smallest)
+            np.minimum.at(labels, targets, smallest)
+        labels = labels[labels] # Pointer jumping to shorten label chains
+        changed = bool((labels != previous).any())
+
+    return np.sort(first_rows[np.unique(labels)])
+
+
+def guess_representatives(num_digits: int, history: History,
+                          max_space: int = DEFAULT_MAX_SYMMETRY_SPACE) -> np.ndarray | None:
+    """
+    Picks one guess per symmetry class over the whole guess space.
+
+    Args:
+        num_digits: The number of digits in the game.
+        history: The clue history so far.
+        max_space: Largest guess space reduced in full.
+
+    Returns:
+        Sorted enumeration indices (see `solver.enumerate_secrets`) of one guess per
+        class, or None if the space is larger than `max_space` and the caller
+        should reduce a sampled pool with `orbit_representatives` instead.
+    """
+    if not history:
+        # Before any clue, every guess is equivalent to every other.
+        return np.zeros(1, dtype=np.int64)
+    all_secrets = enumerate_secrets(num_digits)
+    if len(all_secrets) > max_space:
+        return None
+    return orbit_representatives(all_secrets, history)
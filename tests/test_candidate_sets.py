@@ -0,0 +1,44 @@
+"""Tests that every candidate set backend narrows the secrets exactly like `solver.CandidateSet`."""
+import numpy as np
+import pytest
+
+from candidate_bitsets import BitsetCandidateSet, ConsistencyCache
+from core_game_logic import Clue, Number, score_guess
+from parallel_filter import SharedCandidateSet, shutdown_filter_pool
+from solver import CandidateSet
+
+
+@pytest.fixture(scope="module", autouse=True)
+def filter_pool():
+    yield
+    shutdown_filter_pool()
+
+
+def random_game(num_digits: int, seed: int, num_guesses: int = 5) -> list[tuple[Number, Clue]]:
+    rng = np.random.default_rng(seed)
+    secret = Number.from_array(rng.permutation(10)[:num_digits].astype(np.uint8))
+    guesses = [Number.from_array(rng.permutation(10)[:num_digits].astype(np.uint8)) for _ in range(num_guesses)]
+    return [(guess, score_guess(guess, secret)) for guess in guesses]
+
+
+@pytest.mark.parametrize("num_digits", [3, 5, 7])
+@pytest.mark.parametrize("seed", range(3))
+def test_bitset_candidate_set_matches_candidate_set(num_digits, seed):
+    reference = CandidateSet(num_digits)
+    bitset = BitsetCandidateSet(num_digits, cache=ConsistencyCache())
+    for guess, clues in random_game(num_digits, seed):
+        assert bitset.filter(guess, clues) == reference.filter(guess, clues)
+        assert (bitset.indices() == reference.indices).all()
+        assert bitset.history == reference.history
+        assert (bitset.view().digits == reference.digits).all()
+
+
+@pytest.mark.parametrize("min_parallel", [0, 1 << 30]) # Through the worker pool, and in process
+@pytest.mark.parametrize("num_digits", [4, 8])
+def test_shared_candidate_set_matches_candidate_set(num_digits, min_parallel):
+    reference = CandidateSet(num_digits)
+    with SharedCandidateSet(num_digits, workers=2, min_parallel=min_parallel) as shared:
+        for guess, clues in random_game(num_digits, num_digits):
+            assert shared.filter(guess, clues) == reference.filter(guess, clues)
+            assert (shared.indices() == reference.indices).all()
+            assert shared.history == reference.history
@@ -0,0 +1,58 @@
+"""Tests for the scalar and vectorized scoring in core_game_logic."""
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from core_game_logic import (Variant, Clue, Number, calculate_clues, decode_clues, encode_clues, encode_digits,
+                             generate_secret_number, score_guess, score_guesses, winning_clue_code)
+from solver import enumerate_secrets
+
+
+@pytest.mark.parametrize("num_digits", [1, 2, 3])
+def test_score_guesses_matches_calculate_clues_exhaustively(num_digits):
+    numbers = enumerate_secrets(num_digits)
+    strings = [[str(d) for d in row] for row in numbers]
+    codes = score_guesses(numbers, numbers)
+    for g, guess in enumerate(strings):
+        expected = [encode_clues(calculate_clues(guess, secret)) for secret in strings]
+        assert codes[g].tolist() == expected
+
+
+def test_score_guesses_matches_calculate_clues_on_large_games():
+    rng = np.random.default_rng(0)
+    for num_digits in (7, 9, 10):
+        secrets = enumerate_secrets(num_digits)[rng.integers(len(enumerate_secrets(num_digits)), size=200)]
+        guess = rng.permutation(10)[:num_digits].astype(np.uint8)
+        codes = score_guesses(guess, secrets)
+        for secret, code in zip(secrets, codes):
+            assert code == encode_clues(calculate_clues([str(d) for d in guess], [str(d) for d in secret]))
+
+
+@pytest.mark.parametrize("num_digits", [1, 4, 10])
+def test_clue_codes_round_trip(num_digits):
+    for clues in itertools.islice(itertools.product("TSF", repeat=num_digits), 2000):
+        code = encode_clues(list(clues))
+        assert decode_clues(code, num_digits) == list(clues)
+        assert Clue(code, num_digits).symbols() == list(clues)
+    assert encode_clues(["T"] * num_digits) == winning_clue_code(num_digits)
+
+
+def test_number_round_trips_through_strings_and_arrays():
+    for num_digits in range(1, 11):
+        digits = generate_secret_number(num_digits)
+        number = Number.from_digits(digits)
+        assert number.to_list() == digits
+        assert Number.from_array(number.to_array()) == number
+        assert (number.to_array() == encode_digits(digits)).all()
+
+
+@pytest.mark.parametrize("variant", [Variant(16, False), Variant(6, True), Variant(10, True)])
+def test_score_guess_matches_calculate_clues_in_variants(variant):
+    random.seed(1)
+    for _ in range(500):
+        secret = generate_secret_number(4, variant)
+        guess = generate_secret_number(4, variant)
+        assert score_guess(Number.from_digits(guess), Number.from_digits(secret)).symbols() == \
+            calculate_clues(guess, secret)
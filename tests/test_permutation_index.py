@@ -0,0 +1,30 @@
+"""Tests for ranking and unranking unique-digit numbers."""
+import numpy as np
+import pytest
+
+from permutation_index import (from_bitset, num_permutations, rank, rank_batch, to_bitset, unrank,
+                               unrank_batch)
+from solver import enumerate_secrets
+
+
+@pytest.mark.parametrize("num_digits", [1, 2, 3, 4])
+def test_rank_unrank_round_trip_exhaustively(num_digits):
+    assert num_permutations(num_digits) == len(enumerate_secrets(num_digits))
+    for index, digits in enumerate(enumerate_secrets(num_digits).tolist()):
+        assert rank(digits) == index
+        assert list(unrank(index, num_digits)) == digits
+
+
+@pytest.mark.parametrize("num_digits", [5, 8, 10])
+def test_batch_rank_unrank_match_enumeration_order(num_digits):
+    secrets = enumerate_secrets(num_digits)
+    indices = np.random.default_rng(num_digits).integers(len(secrets), size=5000)
+    assert (unrank_batch(indices, num_digits) == secrets[indices]).all()
+    assert (rank_batch(secrets[indices]) == indices).all()
+    for index in indices[:50].tolist():
+        assert rank(unrank(index, num_digits)) == index
+
+
+def test_bitset_round_trip():
+    indices = np.unique(np.random.default_rng(0).integers(num_permutations(6), size=1000))
+    assert (from_bitset(to_bitset(indices, 6), 6) == indices).all()
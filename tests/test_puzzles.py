@@ -0,0 +1,45 @@
+"""Tests for the puzzle generator's solution counter and its puzzles."""
+import numpy as np
+import pytest
+
+from core_game_logic import score_guesses, winning_clue_code
+from puzzles import PuzzleSettings, count_solutions, generate_puzzle
+from solver import enumerate_secrets
+
+
+def full_scan(clues, num_digits: int) -> int:
+    secrets = enumerate_secrets(num_digits)
+    consistent = np.ones(len(secrets), dtype=bool)
+    for guess, code in clues:
+        consistent &= score_guesses(guess, secrets) == code
+    return int(consistent.sum())
+
+
+@pytest.mark.parametrize("num_digits", [3, 4, 5])
+@pytest.mark.parametrize("seed", range(5))
+def test_count_solutions_matches_full_scan(num_digits, seed):
+    rng = np.random.default_rng(seed)
+    secrets = enumerate_secrets(num_digits)
+    secret = secrets[rng.integers(len(secrets))]
+    clues = []
+    for _ in range(seed % 4 + 1):
+        guess = secrets[rng.integers(len(secrets))]
+        clues.append((guess, int(score_guesses(guess, secret[None, :])[0])))
+    expected = full_scan(clues, num_digits)
+    for limit in (1, 2, 10, 10 ** 7):
+        assert count_solutions(clues, num_digits, limit) == min(expected, limit)
+
+
+@pytest.mark.parametrize("num_digits", [3, 5])
+def test_generated_puzzles_are_unique_and_minimal(num_digits):
+    rng = np.random.default_rng(num_digits)
+    for _ in range(5):
+        puzzle = generate_puzzle(PuzzleSettings(num_digits), rng)
+        clues = [(guess.to_array(), clue.code) for guess, clue in puzzle.clues]
+        assert len(clues) >= 2
+        assert all(code != winning_clue_code(num_digits) for _, code in clues)
+        assert full_scan(clues, num_digits) == 1
+        secret = puzzle.secret.to_array()[None, :]
+        assert all(score_guesses(guess, secret)[0] == code for guess, code in clues)
+        for i in range(len(clues)):
+            assert full_scan(clues[:i] + clues[i + 1:], num_digits) > 1
@@ -0,0 +1,81 @@
+"""Round-trip tests for the session snapshot and game log binary formats."""
+import numpy as np
+
+from core_game_logic import Number
+from game_log import BOT_GUESSER, HARD_HUMAN_GUESSER, HUMAN_GUESSER, SOURCE_CLI, SOURCE_GUI, GameLogWriter, \
+    encode_moves, read_game_log
+from game_session import GameSession
+from permutation_index import rank
+from session_store import _HEADER, ACTIVE, FREE, WON, SessionStore
+
+
+def make_store() -> tuple[SessionStore, list[str]]:
+    store = SessionStore(rng=np.random.default_rng(0))
+    ids = [store.create(4, 10) for _ in range(20)] + [store.create(9, 3, Number.from_digits("123456789"))]
+    for n, session_id in enumerate(ids):
+        slot = store.lookup(session_id)
+        for guess in ("0123", "4567", "1032")[:n % 4]:
+            if store.status[slot] == ACTIVE:
+                store.submit_guess(slot, Number.from_digits(guess))
+    store.submit_guess(store.lookup(ids[-1]), Number.from_digits("123456789"))
+    for session_id in ids[::3]:
+        store.close(store.lookup(session_id))
+    return store, ids
+
+
+def snapshot_time(data: bytes) -> float:
+    return _HEADER.unpack_from(data)[-1]
+
+
+def test_session_snapshot_round_trip():
+    store, ids = make_store()
+    data = store.to_bytes()
+    restored = SessionStore.from_bytes(data, now=snapshot_time(data))
+    assert restored.to_bytes()[_HEADER.size:] == data[_HEADER.size:] # Everything but the save time
+    assert len(restored) == len(store)
+    for session_id in ids:
+        slot = int(session_id[:8], 16)
+        assert restored.status[slot] == store.status[slot]
+        if store.status[slot] == FREE:
+            continue
+        assert restored.secret_number(slot) == store.secret_number(slot)
+        assert restored.history(slot) == store.history(slot)
+    assert restored.status[int(ids[-1][:8], 16)] == WON
+    # Restored games keep accepting guesses and new games reuse freed slots.
+    open_id = next(i for i in ids if store.status[int(i[:8], 16)] == ACTIVE)
+    restored.submit_guess(restored.lookup(open_id), Number.from_digits("9876"))
+    assert int(restored.create(4, 10)[:8], 16) in {int(i[:8], 16) for i in ids[::3]}
+
+
+def test_game_log_round_trip(tmp_path):
+    path = str(tmp_path / "games.tsflog")
+    games = []
+    for n in range(50):
+        session = GameSession(4, 6, secret_number=Number.from_digits("0123"))
+        for guess in ("4567", "0132", "0123")[:n % 3 + 1]:
+            session.submit_guess(Number.from_digits(guess))
+        mode = (HUMAN_GUESSER, BOT_GUESSER, HARD_HUMAN_GUESSER)[n % 3]
+        secret = None if mode == BOT_GUESSER and not session.won else session.secret_number
+        games.append((mode, SOURCE_CLI if n % 2 else SOURCE_GUI, secret, encode_moves(session.history), 1e9 + n))
+    with GameLogWriter(path, buffer_bytes=64) as writer:
+        for mode, source, secret, moves, started_at in games:
+            writer.record_game(mode, source, 4, 6, secret, moves, started_at)
+
+    records = list(read_game_log(path, chunk_bytes=13))
+    assert len(records) == len(games)
+    for record, (mode, source, secret, moves, started_at) in zip(records, games):
+        assert (record.mode, record.source, record.num_digits, record.max_guesses) == (mode, source, 4, 6)
+        assert record.secret == (None if secret is None else rank(secret))
+        assert record.moves == moves
+        assert record.started_at == started_at
+
+
+def test_restored_games_do_not_expire_for_server_downtime():
+    store, _ = make_store()
+    open_games = int(np.count_nonzero(store.status[:store.num_slots] != FREE))
+    data = store.to_bytes()
+    restarted_at = snapshot_time(data) + 3600 # Down for an hour, longer than the idle timeout
+    restored = SessionStore.from_bytes(data, now=restarted_at)
+    assert restored.expire_idle(600, now=restarted_at) == 0
+    # Idle time after the restart still counts.
+    assert restored.expire_idle(600, now=restarted_at + 601) == open_games
@@ -0,0 +1,26 @@
+"""Tests for guess-selection strategies."""
+import numpy as np
+
+from core_game_logic import Number, score_guess
+from solver import CandidateSet
+from strategies import LookaheadStrategy
+from transposition import TranspositionTable
+
+
+def narrowed_candidates() -> CandidateSet:
+    candidates = CandidateSet(4)
+    guess = Number.from_digits("0123")
+    candidates.filter(guess, score_guess(guess, Number.from_digits("1357")))
+    return candidates
+
+
+def test_shared_transposition_table_keeps_configurations_apart():
+    table = TranspositionTable()
+    settings = [dict(consistent_only=True), dict(mode="minimax"), dict(max_secrets_sampled=50),
+                dict(max_guesses_scored=20), dict(symmetry=True), dict()]
+    for options in settings:
+        shared = LookaheadStrategy(transposition_table=table, seed=0, **options)
+        alone = LookaheadStrategy(seed=0, **options)
+        candidates = narrowed_candidates()
+        assert shared.evaluate(candidates, shared.depth)[0] == alone.evaluate(candidates, alone.depth)[0]
+        assert (shared.choose_guess(narrowed_candidates()) == alone.choose_guess(narrowed_candidates())).all()
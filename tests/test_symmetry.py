@@ -0,0 +1,30 @@
+"""Tests that symmetry reduction keeps one guess of every partition shape."""
+import numpy as np
+import pytest
+
+from core_game_logic import score_guesses
+from permutation_index import rank
+from solver import CandidateSet, enumerate_secrets
+from symmetry import guess_representatives
+
+
+def partition_shapes(guesses: np.ndarray, candidates: CandidateSet) -> set[tuple[int, ...]]:
+    codes = score_guesses(guesses, candidates.digits, candidates.masks)
+    return {tuple(sorted(np.bincount(row, minlength=3 ** candidates.num_digits).tolist())) for row in codes}
+
+
+@pytest.mark.parametrize("num_digits", [3, 4])
+@pytest.mark.parametrize("seed", range(4))
+def test_representatives_cover_every_partition_shape(num_digits, seed):
+    rng = np.random.default_rng(seed)
+    all_guesses = enumerate_secrets(num_digits)
+    secret = all_guesses[rng.integers(len(all_guesses))]
+    candidates = CandidateSet(num_digits)
+    for _ in range(seed % 2 + 1):
+        guess = all_guesses[rng.integers(len(all_guesses))]
+        code = int(score_guesses(guess, secret[None, :])[0])
+        candidates = candidates.subset(candidates.scores(guess) == code, (rank(guess), code))
+
+    representatives = guess_representatives(num_digits, candidates.history)
+    assert len(representatives) < len(all_guesses)
+    assert partition_shapes(all_guesses[representatives], candidates) == partition_shapes(all_guesses, candidates)
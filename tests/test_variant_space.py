@@ -0,0 +1,57 @@
+"""Tests for streaming the secrets of game variants against brute-force enumeration."""
+import itertools
+
+import numpy as np
+import pytest
+
+from core_game_logic import Clue, Number, Variant, score_guesses
+from variant_space import VariantCandidateSet, enumerate_space, stream_consistent
+
+VARIANTS = [(Variant(6, True), 4), (Variant(12, False), 3), (Variant(2, True), 6), (Variant(10, False), 4)]
+
+
+def brute_force_space(num_digits: int, variant: Variant) -> np.ndarray:
+    symbols = range(variant.alphabet_size)
+    rows = itertools.product(symbols, repeat=num_digits) if variant.allow_repeats \
+        else itertools.permutations(symbols, num_digits)
+    return np.array(list(rows), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("variant, num_digits", VARIANTS)
+def test_enumerate_space_is_the_full_space_in_order(variant, num_digits):
+    space = enumerate_space(num_digits, variant)
+    assert len(space) == variant.space_size(num_digits)
+    assert (space == brute_force_space(num_digits, variant)).all()
+
+
+@pytest.mark.parametrize("variant, num_digits", VARIANTS)
+@pytest.mark.parametrize("seed", range(4))
+def test_stream_consistent_matches_brute_force(variant, num_digits, seed):
+    rng = np.random.default_rng(seed)
+    space = brute_force_space(num_digits, variant)
+    secret = space[rng.integers(len(space))]
+    clues = []
+    for _ in range(seed + 1):
+        guess = space[rng.integers(len(space))]
+        clues.append((guess, int(score_guesses(guess, secret[None, :])[0])))
+    consistent = np.ones(len(space), dtype=bool)
+    for guess, code in clues:
+        consistent &= score_guesses(guess, space) == code
+    streamed = np.concatenate(list(stream_consistent(num_digits, variant, clues, chunk_rows=7)))
+    assert (streamed == space[consistent]).all()
+    shuffled = np.concatenate(list(stream_consistent(num_digits, variant, clues,
+                                                     symbol_order=rng.permutation(variant.alphabet_size))))
+    assert sorted(map(tuple, shuffled.tolist())) == sorted(map(tuple, space[consistent].tolist()))
+
+
+def test_lazy_variant_candidate_set_keeps_the_secret():
+    variant = Variant(16, False)
+    rng = np.random.default_rng(5)
+    secret = Number.from_array(rng.permutation(16)[:6].astype(np.uint8))
+    candidates = VariantCandidateSet(6, variant, materialize_limit=1000)
+    assert candidates.members is None
+    while candidates.members is None:
+        guess = Number.from_array(candidates.sample(rng))
+        code = int(score_guesses(guess.to_array(), secret.to_array()[None, :])[0])
+        candidates.filter(guess, Clue(code, 6))
+    assert any((row == secret.to_array()).all() for row in candidates.members)
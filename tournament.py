@@ -0,0 +1,283 @@
+"""
+TSF Game - Strategy Tournament
+
+Plays several bot configurations against the same seeded secrets, for every
+combination of digit count and guess cap, and prints one comparison table:
+win rate under the cap, mean and percentile guesses-to-solve among the games
+won, and CPU time per move.
+
+Every entrant plays the same games: for each digit count, batch k of every
+entrant is seeded identically, so it draws the same secrets (see
+`simulation.run_batch`). A bot's moves do not depend on the cap, so each
+entrant plays each digit count once under the largest cap, and the smaller
+caps are scored from those same games (a game is won under a cap if it was
+solved within it).
+
+Batches run on a process pool and are streamed back as they finish; a
+progress line is printed to stderr whenever an (entrant, digit count) cell
+is complete.
+
+Entrants are strategy names (see `simulation.make_bot`), optionally followed
+by strategy options, e.g. "entropy:max_guesses_scored=300,symmetry=true".
+
+Run it from the command line, e.g.:
+    python tournament.py --strategies heuristic random entropy minimax --digits 3 4 --max-guesses 6 8 10
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from simulation import DEFAULT_BATCH_SIZE, HEURISTIC_BOT, BatchResult, run_batch, summarize
+from strategies import STRATEGIES, make_strategy
+
+
+@dataclass
+class Entrant:
+    """
+    One bot configuration taking part in a tournament.
+
+    Attributes:
+        label (str): The name shown in the results table.
+        strategy (str): `HEURISTIC_BOT` or a name from `strategies.STRATEGIES`.
+        options (dict): Keyword arguments for the strategy's constructor.
+    """
+    label: str
+    strategy: str
+    options: dict = field(default_factory=dict)
+
+
+@dataclass
+class TournamentRow:
+    """ One entrant's results for one digit count and guess cap. """
+    entrant: str
+    num_digits: int
+    max_guesses: int
+    games: int
+    wins: int
+    win_rate: float
+    mean_guesses: float
+    guess_percentiles: dict[str, float]
+    cpu_ms_per_move: float
+
+    def to_dict(self) -> dict:
+        """ Returns the row as a JSON-serializable dict. """
+        return dict(self.__dict__)
+
+
+def _parse_option_value(text: str) -> bool | int | float | str:
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_entrant(spec: str) -> Entrant:
+    """
+    Parses an entrant description such as "minimax" or "entropy:max_guesses_scored=300,symmetry=true".
+
+    Raises:
+        ValueError: If the strategy is unknown or its options are not accepted.
+    """
+    name, _, option_text = spec.partition(":")
+    options = {}
+    for item in filter(None, option_text.split(",")):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Strategy option '{item}' must look like key=value.")
+        options[key.strip()] = _parse_option_value(value.strip())
+    if name == HEURISTIC_BOT:
+        if options:
+            raise ValueError(f"The {HEURISTIC_BOT} bot takes no options.")
+    else:
+        try:
+            make_strategy(name, **options)
+        except TypeError as e:
+            raise ValueError(f"Invalid options for strategy '{name}': {e}") from None
+    return Entrant(spec, name, options)
+
+
+def tournament_batches(entrants: list[Entrant], digit_counts: list[int], num_games: int, max_guesses: int,
+                       workers: int | None = None, seed: int = 0, batch_size: int = DEFAULT_BATCH_SIZE,
+                       use_feedback_table: bool = False) -> Iterator[tuple[int, int, BatchResult]]:
+    """
+    Plays every entrant's games and yields each batch as soon as it finishes.
+
+    Args:
+        entrants: The bot configurations.
+        digit_counts: The digit counts to play.
+        num_games: Games per entrant and digit count.
+        max_guesses: The guess cap the games are played under.
+        workers: Number of worker processes. Defaults to the number of CPUs;
+                 1 runs everything in the current process.
+        seed: Tournament seed; the secrets depend only on it, the digit count and `batch_size`.
+        batch_size: Number of games per task.
+        use_feedback_table: See `simulation.make_bot`.
+
+    Yields:
+        (entrant index, digit count, batch result) tuples, in completion order.
+    """
+    tasks = []
+    for num_digits in digit_counts:
+        batch_sizes = [min(batch_size, num_games - start) for start in range(0, num_games, batch_size)]
+        for index, entrant in enumerate(entrants):
+            # The same batch seeds for every entrant, so every entrant faces the same secrets. They are
+            # re-derived per entrant because `run_batch` spawns from them, which advances a SeedSequence.
+            batch_seeds = np.random.SeedSequence([seed, num_digits]).spawn(len(batch_sizes))
+            for size, batch_seed in zip(batch_sizes, batch_seeds):
+                tasks.append((index, num_digits, (num_digits, entrant.strategy, max_guesses, size, batch_seed,
+                                                  use_feedback_table, entrant.options)))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for index, num_digits, args in tasks:
+            yield index, num_digits, run_batch(*args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_batch, *args): (index, num_digits) for index, num_digits, args in tasks}
+        for future in as_completed(futures):
+            index, num_digits = futures[future]
+            yield index, num_digits, future.result()
+
+
+def score_cell(results: list[BatchResult], entrant: Entrant, num_digits: int, max_guesses: int) -> TournamentRow:
+    """
+    Scores one entrant's games for one digit count under a guess cap.
+
+    Args:
+        results: The entrant's batches, played under a cap of at least `max_guesses`.
+        entrant: The entrant.
+        num_digits: The digit count of the games.
+        max_guesses: The guess cap to score under.
+
+    Returns:
+        The table row.
+    """
+    capped = [BatchResult(np.where(r.guesses <= max_guesses, r.guesses, -1), r.move_latencies, r.cpu_seconds)
+              for r in results]
+    summary = summarize(capped, num_digits, entrant.label, max_guesses, 0.0)
+    return TournamentRow(
+        entrant=entrant.label,
+        num_digits=num_digits,
+        max_guesses=max_guesses,
+        games=summary.games,
+        wins=summary.wins,
+        win_rate=summary.wins / summary.games,
+        mean_guesses=summary.mean_guesses,
+        guess_percentiles=summary.guess_percentiles,
+        cpu_ms_per_move=summary.cpu_ms_per_move,
+    )
+
+
+def run_tournament(entrants: list[Entrant], digit_counts: list[int], num_games: int, max_guesses: list[int],
+                   workers: int | None = None, seed: int = 0, batch_size: int = DEFAULT_BATCH_SIZE,
+                   use_feedback_table: bool = False,
+                   on_cell_done: Callable[[list[TournamentRow]], None] | None = None) -> list[TournamentRow]:
+    """
+    Plays a full tournament.
+
+    Args:
+        entrants: The bot configurations.
+        digit_counts: The digit counts to play.
+        num_games: Games per entrant and digit count.
+        max_guesses: The guess caps to report.
+        workers, seed, batch_size, use_feedback_table: See `tournament_batches`.
+        on_cell_done: Called with an (entrant, digit count) cell's rows, one per
+            cap, as soon as all of its batches are in.
+
+    Returns:
+        Every row, ordered by digit count, cap and entrant.
+
+    Raises:
+        ValueError: If a list is empty or a count is not positive.
+    """
+    if not entrants or not digit_counts or not max_guesses:
+        raise ValueError("Entrants, digit counts and guess caps must not be empty.")
+    if num_games <= 0 or batch_size <= 0 or min(max_guesses) <= 0:
+        raise ValueError("Game, batch and guess counts must be positive integers.")
+
+    batches_per_cell = -(-num_games // batch_size)
+    pending: dict[tuple[int, int], list[BatchResult]] = {}
+    rows = []
+    for index, num_digits, result in tournament_batches(entrants, digit_counts, num_games, max(max_guesses),
+                                                        workers, seed, batch_size, use_feedback_table):
+        cell = pending.setdefault((index, num_digits), [])
+        cell.append(result)
+        if len(cell) < batches_per_cell:
+            continue
+        cell_rows = [score_cell(cell, entrants[index], num_digits, cap) for cap in sorted(max_guesses)]
+        rows.extend(cell_rows)
+        del pending[(index, num_digits)]
+        if on_cell_done is not None:
+            on_cell_done(cell_rows)
+
+    order = {entrant.label: i for i, entrant in enumerate(entrants)}
+    return sorted(rows, key=lambda row: (row.num_digits, row.max_guesses, order[row.entrant]))
+
+
+def format_table(rows: list[TournamentRow]) -> str:
+    """ Formats tournament rows as a plain-text table. """
+    header = ("entrant", "digits", "max", "games", "win %", "mean", "p50", "p90", "p99", "cpu ms/move")
+    lines = []
+    for row in rows:
+        p = row.guess_percentiles
+        lines.append((row.entrant, str(row.num_digits), str(row.max_guesses), str(row.games),
+                      f"{100.0 * row.win_rate:.1f}", f"{row.mean_guesses:.3f}",
+                      *(f"{p[key]:g}" if key in p else "-" for key in ("p50", "p90", "p99")),
+                      f"{row.cpu_ms_per_move:.3f}"))
+    widths = [max(len(cells[i]) for cells in (header, *lines)) for i in range(len(header))]
+    # Left-align the entrant names, right-align the numbers.
+    def format_line(cells):
+        return "  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(cells, widths)))
+    return "\n".join([format_line(header), format_line(["-" * w for w in widths]), *map(format_line, lines)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare bot strategies on the same seeded secrets.")
+    parser.add_argument("--strategies", nargs="+", default=[HEURISTIC_BOT, "random", "entropy"],
+                        help=f"Entrants: {HEURISTIC_BOT} or {', '.join(STRATEGIES)}, "
+                             "optionally with options, e.g. entropy:symmetry=true.")
+    parser.add_argument("--digits", type=int, nargs="+", default=[4], help="Digit counts to play (1-9).")
+    parser.add_argument("--max-guesses", type=int, nargs="+", default=[10], help="Guess caps to report.")
+    parser.add_argument("--games", type=int, default=1000, help="Games per entrant and digit count.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs).")
+    parser.add_argument("--seed", type=int, default=0, help="Tournament seed; fixes the secrets.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Games per worker task.")
+    parser.add_argument("--feedback-table", action="store_true",
+                        help="Use the cached feedback table (up to 5 digits).")
+    parser.add_argument("--output", default=None, help="Also write the rows as JSON to this file.")
+    args = parser.parse_args()
+
+    try:
+        entrants = [parse_entrant(spec) for spec in args.strategies]
+    except ValueError as e:
+        parser.error(str(e))
+
+    def report_progress(cell_rows: list[TournamentRow]):
+        row = cell_rows[-1]
+        print(f"{row.entrant} ({row.num_digits} digits): {row.games} games, "
+              f"{100.0 * row.win_rate:.1f}% won within {row.max_guesses}", file=sys.stderr)
+
+    start = time.perf_counter()
+    rows = run_tournament(entrants, args.digits, args.games, args.max_guesses, args.workers, args.seed,
+                          args.batch_size, args.feedback_table, report_progress)
+    print(f"Tournament finished in {time.perf_counter() - start:.1f}s.\n", file=sys.stderr)
+    print(format_table(rows))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([row.to_dict() for row in rows], f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+TSF Game - Transposition Table
+
+Search-based bots reach the same position (the same set of remaining candidate
+secrets) through different guess orders. This module provides a bounded LRU
+cache keyed by a canonical digest of the candidate set, so each position is
+evaluated only once. The cache enforces both an entry limit and an approximate
+memory cap, which keeps it from growing without bound in long-running services.
+"""
+import hashlib
+import sys
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from solver import CandidateSet
+
+# Approximate bookkeeping cost of one OrderedDict entry beyond its key and value.
+_ENTRY_OVERHEAD_BYTES: int = 100
+
+
+def candidate_key(candidates: CandidateSet) -> bytes:
+    """
+    Returns a canonical 16-byte digest of a candidate set.
+
+    Two candidate sets get the same key exactly when they hold the same secrets
+    (up to digest collisions, which are negligible at 128 bits), no matter which
+    guesses and clues produced them. Candidate indices are kept in ascending
+    order by `CandidateSet`, so no sorting is needed.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(bytes((candidates.num_digits,)))
+    digest.update(candidates.indices.tobytes())
+    return digest.digest()
+
+
+class TranspositionTable:
+    """
+    An LRU cache with an entry limit and an approximate memory cap.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept.
+        max_bytes (int | None): Approximate maximum memory used by keys and values, or None.
+        approx_bytes (int): Approximate memory currently used.
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups.
+        evictions (int): Number of entries evicted to respect the limits.
+    """
+    def __init__(self, max_entries: int = 100_000, max_bytes: int | None = 64 * 1024 * 1024):
+        """
+        Initializes an empty table.
+
+        Args:
+            max_entries: Maximum number of entries kept.
+            max_bytes: Approximate memory cap in bytes, or None for no cap.
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        if max_entries <= 0 or (max_bytes is not None and max_bytes <= 0):
+            raise ValueError("Transposition table limits must be positive.")
+        self.max_entries: int = max_entries
+        self.max_bytes: int | None = max_bytes
+        self.approx_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """ Returns the value stored for `key` (marking it recently used), or None. """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """ Stores `value` for `key`, evicting least recently used entries as needed. """
+        size = sys.getsizeof(key) + sys.getsizeof(value) + _ENTRY_OVERHEAD_BYTES
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.approx_bytes -= old[1]
+        self._entries[key] = (value, size)
+        self.approx_bytes += size
+
+        while len(self._entries) > self.max_entries or \
+              (self.max_bytes is not None and self.approx_bytes > self.max_bytes and len(self._entries) > 1):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.approx_bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        """ Removes every entry (statistics are kept). """
+        self._entries.clear()
+        self.approx_bytes = 0
@@ -4,11 +4,17 @@ TSF Game - Graphical User Interface (GUI)
 This module implements the Tkinter-based GUI for the TSF (Ten Sefirot Finder) game.
 It allows users to play the game by interacting with visual elements,
 including setting game parameters, submitting guesses, and viewing game history and rules.
-It uses `core_game_logic.py` for the underlying game mechanics.
+It uses `game_session.py` for the underlying game state and rules, and
+`hint_engine.py` to compute hints on a background thread. In hard mode the
+secret is kept open by an adversarial host (see `adversary.py`). Finished games are
+appended to the game log (see `game_log.py`).
 """
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, Toplevel, Text
-from core_game_logic import generate_secret_number, calculate_clues
+from adversary import AdversarialGameSession
+from game_log import HARD_HUMAN_GUESSER, HUMAN_GUESSER, SOURCE_GUI, encode_moves, open_game_log
+from game_session import GameSession
+from hint_engine import HintEngine
 
 class TSFGameGUI:
     """
@@ -17,6 +23,8 @@ class TSFGameGUI:
     This class encapsulates all the UI elements, game state variables,
     and methods required to run the TSF game with a graphical interface.
     """
+    HINT_POLL_MS: int = 100 # How often the Tk loop collects finished hints
+
     def __init__(self, master: tk.Tk):
         """
         Initializes the TSF Game GUI.
@@ -26,19 +34,20 @@ class TSFGameGUI:
         """
         self.master = master
         master.title("TSF Game")
-        master.geometry("500x600") # Adjusted window size for better layout
+        master.geometry("500x710") # Adjusted window size for better layout
 
         # --- Game State Variables ---
-        self.secret_number: list[str] = []         # The computer-generated secret number
-        self.num_digits_setting: int = 0           # Number of digits chosen for the current game
-        self.max_guesses_setting: int = 0          # Max guesses chosen for the current game
-        self.current_guesses_count: int = 0        # How many guesses the player has made in the current game
+        self.session: GameSession | None = None    # The current game; None until the first game starts
         self.game_active: bool = False             # Flag to indicate if a game is currently in progress
+        self.hint_engine = HintEngine()            # Filters candidates off the Tk thread
+        self.game_log = open_game_log()            # Records finished games; None if disabled
 
         self._setup_menu()
         self._setup_settings_frame()
         self._setup_message_area()
+        self._setup_hints_area()
         self._setup_gameplay_area()
+        self.master.after(self.HINT_POLL_MS, self._poll_hints)
 
     def _setup_menu(self):
         """Sets up the menu bar for the application."""
@@ -68,15 +77,53 @@ class TSFGameGUI:
         self.max_guesses_entry.grid(row=1, column=1, padx=5, pady=5, sticky="w")
         self.max_guesses_entry.insert(0, "10") # Default value
 
+        # Hard mode: the adversarial host answers every guess with the least revealing clues
+        self.hard_mode = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Hard mode (adversarial host)",
+                        variable=self.hard_mode).grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+
         # Start Game button
         self.start_game_button = ttk.Button(settings_frame, text="Start Game", command=self.start_new_game)
-        self.start_game_button.grid(row=0, column=2, rowspan=2, padx=10, pady=5, sticky="nsew")
+        self.start_game_button.grid(row=0, column=2, rowspan=3, padx=10, pady=5, sticky="nsew")
 
     def _setup_message_area(self):
         """Sets up the label for displaying game messages and status updates."""
         self.message_label = ttk.Label(self.master, text="Set parameters and start the game!", font=("Arial", 10), wraplength=480)
         self.message_label.pack(pady=5, padx=10, fill="x")
 
+    def _setup_hints_area(self):
+        """Sets up the remaining-possibilities counter and the optional best-guess hint."""
+        hints_frame = ttk.LabelFrame(self.master, text="Hints", padding=(10, 5))
+        hints_frame.pack(padx=10, pady=(0, 5), fill="x")
+
+        self.remaining_label = ttk.Label(hints_frame, text="Remaining possibilities: -")
+        self.remaining_label.grid(row=0, column=0, padx=5, pady=2, sticky="w")
+
+        self.show_best_guess = tk.BooleanVar(value=False)
+        ttk.Checkbutton(hints_frame, text="Show best next guess", variable=self.show_best_guess,
+                        command=self._toggle_best_guess).grid(row=0, column=1, padx=5, pady=2, sticky="e")
+        self.best_guess_label = ttk.Label(hints_frame, text="")
+        self.best_guess_label.grid(row=1, column=0, columnspan=2, padx=5, pady=2, sticky="w")
+        hints_frame.columnconfigure(1, weight=1)
+
+    def _toggle_best_guess(self):
+        """Requests a best-guess hint when the option is switched on, and hides it when switched off."""
+        if self.show_best_guess.get() and self.game_active:
+            self.best_guess_label.config(text="Best next guess: computing...")
+            self.hint_engine.request_best_guess()
+        else:
+            self.best_guess_label.config(text="")
+
+    def _poll_hints(self):
+        """Shows hints finished by the background engine, then reschedules itself on the Tk loop."""
+        for result in self.hint_engine.poll():
+            if not self.game_active:
+                continue # Hints still in flight when the game ended are stale
+            self.remaining_label.config(text=f"Remaining possibilities: {result.remaining:,}")
+            if result.best_guess is not None and self.show_best_guess.get():
+                self.best_guess_label.config(text=f"Best next guess: {result.best_guess}")
+        self.master.after(self.HINT_POLL_MS, self._poll_hints)
+
     def _setup_gameplay_area(self):
         """Sets up the frame for guess input and guess history display."""
         game_play_frame = ttk.LabelFrame(self.master, text="Gameplay", padding=(10, 5))
@@ -105,41 +152,35 @@ class TSFGameGUI:
         Validates game settings, generates a new secret number,
         and resets the UI for a new game session.
         """
-        # Validate number of digits input
+        # Validate the settings inputs
         try:
             num_digits = int(self.num_digits_entry.get())
-            if not (1 <= num_digits <= 9): # Max 10 for core_game_logic, but UI limits to 9 for simplicity
-                self.message_label.config(text="Error: Number of digits must be between 1 and 9.")
-                return
         except ValueError:
             self.message_label.config(text="Error: Invalid input for Number of Digits.")
             return
-
-        # Validate max guesses input
         try:
             max_guesses = int(self.max_guesses_entry.get())
-            if not (1 <= max_guesses <= 100):
-                self.message_label.config(text="Error: Max guesses must be between 1 and 100.")
-                return
         except ValueError:
             self.message_label.config(text="Error: Invalid input for Max Guesses.")
             return
 
-        # Store validated settings
-        self.num_digits_setting = num_digits
-        self.max_guesses_setting = max_guesses
-        
-        # Generate secret number using core logic
+        # Create the session; it checks the setting ranges and generates the secret number
+        # (in hard mode, the adversarial host keeps it open until the game is over)
         try:
-            self.secret_number = generate_secret_number(self.num_digits_setting)
-        except ValueError as e: # Catch errors from core_game_logic (e.g., num_digits > 10, though UI prevents)
-            self.message_label.config(text=f"Error generating secret number: {e}")
+            if self.hard_mode.get():
+                self.session = AdversarialGameSession(num_digits, max_guesses)
+            else:
+                self.session = GameSession(num_digits, max_guesses)
+        except ValueError as e:
+            self.message_label.config(text=f"Error: {e}")
             return
-
-        # Reset game state variables
-        self.current_guesses_count = 0
         self.game_active = True
 
+        # Start tracking the new game's candidates in the background
+        self.remaining_label.config(text="Remaining possibilities: computing...")
+        self.best_guess_label.config(text="Best next guess: computing..." if self.show_best_guess.get() else "")
+        self.hint_engine.new_game(num_digits, self.show_best_guess.get())
+
         # Reset UI elements for a new game
         self.guess_history_text.config(state=tk.NORMAL) # Enable to clear
         self.guess_history_text.delete('1.0', tk.END)
@@ -153,9 +194,9 @@ class TSFGameGUI:
         # self.num_digits_entry.config(state=tk.DISABLED) # Optionally disable during active game
         # self.max_guesses_entry.config(state=tk.DISABLED)
         
-        self.message_label.config(text=f"Game started! I've thought of a {self.num_digits_setting}-digit number. You have {self.max_guesses_setting} guesses.")
+        self.message_label.config(text=f"Game started! I've thought of a {num_digits}-digit number. You have {max_guesses} guesses.")
         # For debugging purposes:
-        # print(f"Secret Number (for debugging): {self.secret_number}")
+        # print(f"Secret Number (for debugging): {self.session.secret_number}")
 
     def display_rules(self):
         """
@@ -188,7 +229,7 @@ class TSFGameGUI:
     def submit_guess(self):
         """
         Processes the player's guess.
-        Validates the guess, calculates clues using core_game_logic,
+        Validates the guess, calculates clues through the game session,
         updates the guess history, and checks for win/loss conditions.
         """
         if not self.game_active:
@@ -198,52 +239,49 @@ class TSFGameGUI:
         guess_str = self.guess_entry.get().strip() # Get guess and remove leading/trailing whitespace
 
         # Validate the guess format
-        if len(guess_str) != self.num_digits_setting:
-            self.message_label.config(text=f"Error: Guess must have {self.num_digits_setting} digits.")
-            return
-        if not guess_str.isdigit():
-            self.message_label.config(text="Error: Guess must contain only digits.")
-            return
-        if len(set(guess_str)) != self.num_digits_setting: # Check for unique digits
-            self.message_label.config(text="Error: Digits in guess must be unique.")
+        try:
+            player_guess = self.session.parse_guess(guess_str)
+        except ValueError as e:
+            self.message_label.config(text=f"Error: {e}")
             return
 
-        player_guess_list = list(guess_str) # Convert guess string to list of characters (strings)
-        self.current_guesses_count += 1
-
-        # Calculate clues using core logic
+        # Calculate clues through the session
         try:
-            clues = calculate_clues(player_guess_list, self.secret_number)
+            clues = self.session.submit_guess(player_guess)
         except Exception as e: # Catch any unexpected errors from clue calculation
             self.message_label.config(text=f"Error calculating clues: {e}")
-            self.current_guesses_count -=1 # Rollback guess count as it failed
             return
 
-        clues_str_display = "".join(clues) # Format clues for display (e.g., "TSF")
+        clues_str_display = str(clues) # Format clues for display (e.g., "TSF")
+
+        # Narrow the hint engine's candidates with this clue only (runs in the background)
+        if not self.session.is_over:
+            if self.show_best_guess.get():
+                self.best_guess_label.config(text="Best next guess: computing...")
+            self.hint_engine.add_clue(player_guess, clues, self.show_best_guess.get())
 
         # Update guess history
         self.guess_history_text.config(state=tk.NORMAL) # Enable to modify
-        self.guess_history_text.insert(tk.END, f"Guess #{self.current_guesses_count}: {guess_str} -> Clues: {clues_str_display}\n")
+        self.guess_history_text.insert(tk.END, f"Guess #{self.session.guesses_taken}: {guess_str} -> Clues: {clues_str_display}\n")
         self.guess_history_text.see(tk.END) # Scroll to the latest guess
         self.guess_history_text.config(state=tk.DISABLED) # Disable again
         
         self.guess_entry.delete(0, tk.END) # Clear the guess entry field
 
         # Check for win condition
-        if all(c == 'T' for c in clues):
-            self.message_label.config(text=f"Congratulations! You guessed the number {''.join(self.secret_number)} in {self.current_guesses_count} tries!")
+        if self.session.won:
+            self.message_label.config(text=f"Congratulations! You guessed the number {self.session.secret_number} in {self.session.guesses_taken} tries!")
             self.end_game()
             return
 
         # Check for loss condition
-        if self.current_guesses_count >= self.max_guesses_setting:
-            self.message_label.config(text=f"Game Over! You ran out of guesses. The secret number was {''.join(self.secret_number)}.")
+        if self.session.is_over:
+            self.message_label.config(text=f"Game Over! You ran out of guesses. The secret number was {self.session.secret_number}.")
             self.end_game()
             return
         
         # If game continues, update status message
-        guesses_remaining = self.max_guesses_setting - self.current_guesses_count
-        self.message_label.config(text=f"Guess #{self.current_guesses_count} submitted. Clues: {clues_str_display}. You have {guesses_remaining} guesses remaining.")
+        self.message_label.config(text=f"Guess #{self.session.guesses_taken} submitted. Clues: {clues_str_display}. You have {self.session.guesses_remaining} guesses remaining.")
 
     def end_game(self):
         """
@@ -251,6 +289,14 @@ class TSFGameGUI:
         Disables gameplay elements and updates game state.
         """
         self.game_active = False
+        # The final clue is not sent to the hint engine, so the last count would be out of date.
+        self.remaining_label.config(text="Remaining possibilities: -")
+        self.best_guess_label.config(text="")
+        if self.game_log is not None:
+            mode = HARD_HUMAN_GUESSER if isinstance(self.session, AdversarialGameSession) else HUMAN_GUESSER
+            self.game_log.record_game(mode, SOURCE_GUI, self.session.num_digits, self.session.max_guesses,
+                                      self.session.secret_number, encode_moves(self.session.history),
+                                      self.session.started_at)
         self.guess_entry.config(state=tk.DISABLED)
         self.submit_guess_button.config(state=tk.DISABLED)
         
@@ -0,0 +1,234 @@
+"""
+TSF Game - Variant Secret Spaces
+
+Candidate tracking for game variants (see `core_game_logic.Variant`): other
+alphabet sizes, and secrets with repeated symbols. These spaces can be far
+too large to enumerate (16 symbols and 8 unique digits give 518,918,400
+secrets; 10 digits with repeats give 10^10), so instead of one array of every
+secret, as `solver.CandidateSet` keeps for the classic game, secrets are
+produced on demand:
+
+* `stream_consistent` generates the secrets consistent with a list of clues
+  depth-first, one digit position at a time, in chunks of bounded size. A
+  partial secret is dropped as soon as it contradicts a clue (a 'T' that does
+  not match, a symbol marked 'F', more 'S'/'T' symbols still to place than
+  positions left), so only the consistent part of the space is ever built.
+* `VariantCandidateSet` keeps the consistent secrets in memory once there are
+  at most `materialize_limit` of them, and otherwise only the clues. Its size
+  is then estimated by sampling random secrets, and a consistent secret is
+  drawn by streaming in a random symbol order.
+"""
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+
+from core_game_logic import Clue, Number, Variant, digit_masks, generate_secrets, score_guesses
+
+ENUMERATION_LIMIT: int = 1 << 20 # Candidate sets up to this many secrets are kept in memory
+STREAM_CHUNK_ROWS: int = 1 << 14 # Partial secrets extended per step of `stream_consistent`
+ESTIMATE_SAMPLES: int = 1 << 14
+
+_POPCOUNT16: np.ndarray = np.array([i.bit_count() for i in range(1 << 16)], dtype=np.uint8)
+
+# A clue in array form: (guess digit array, feedback code).
+ArrayClue = tuple[np.ndarray, int]
+
+
+class _ClueConstraints:
+    """ Per-clue masks used to reject partial secrets early. """
+    def __init__(self, num_digits: int, clues: Sequence[ArrayClue], allow_repeats: bool):
+        self.num_digits = num_digits
+        self.clues = [(np.asarray(guess, dtype=np.uint8), int(code)) for guess, code in clues]
+        self.exact = [] # Per clue: bool array, True where the clue is 'T'
+        self.absent_masks = [] # Per clue: symbols marked 'F'
+        self.present_masks = [] # Per clue: symbols marked 'S' or 'T'
+        self.reserved_masks = [] # Per clue and depth: 'T' symbols of later positions
+        for guess, code in self.clues:
+            values = np.array([code // 3 ** i % 3 for i in range(num_digits)])
+            bits = [1 << int(d) for d in guess]
+            self.exact.append(values == 2)
+            self.absent_masks.append(sum(set(b for b, v in zip(bits, values) if v == 0)))
+            self.present_masks.append(sum(set(b for b, v in zip(bits, values) if v > 0)))
+            reserved = [0] * (num_digits + 1)
+            if not allow_repeats:
+                # Without repeats, a symbol placed by a later 'T' cannot appear earlier.
+                for depth in range(num_digits - 1, -1, -1):
+                    reserved[depth] = reserved[depth + 1] | (bits[depth] if values[depth] == 2 else 0)
+            self.reserved_masks.append(reserved)
+
+    def allows(self, rows: np.ndarray, masks: np.ndarray) -> np.ndarray:
+        """ Returns which partial secrets (the first `rows.shape[1]` digits) can still satisfy every clue. """
+        depth = rows.shape[1]
+        keep = np.ones(len(rows), dtype=bool)
+        for (guess, code), exact, absent, present, reserved in zip(
+                self.clues, self.exact, self.absent_masks, self.present_masks, self.reserved_masks):
+            if depth == self.num_digits:
+                keep &= score_guesses(guess, rows, masks) == code
+                continue
+            keep &= ((rows == guess[:depth]) == exact[:depth]).all(axis=1)
+            keep &= (masks & np.uint16(absent | reserved[depth])) == 0
+            keep &= _POPCOUNT16[np.uint16(present) & ~masks] <= self.num_digits - depth
+        return keep
+
+
+def stream_consistent(num_digits: int, variant: Variant, clues: Sequence[ArrayClue],
+                      chunk_rows: int = STREAM_CHUNK_ROWS, symbol_order: np.ndarray | None = None) -> Iterator[np.ndarray]:
+    """
+    Generates every secret consistent with the clues, without enumerating the whole space.
+
+    Args:
+        num_digits: The number of digits in each secret.
+        variant: The alphabet and repeat policy.
+        clues: (guess digit array, feedback code) pairs.
+        chunk_rows: Maximum number of partial secrets extended at a time; bounds memory use.
+        symbol_order: The order in which symbols are tried at each position.
+            Defaults to ascending, which yields the secrets in lexicographic order.
+
+    Yields:
+        `uint8` arrays of shape (K, num_digits), one consistent secret per row.
+
+    Raises:
+        ValueError: If num_digits is out of range for the variant.
+    """
+    variant.validate(num_digits)
+    order = np.arange(variant.alphabet_size, dtype=np.uint8) if symbol_order is None \
+        else np.asarray(symbol_order, dtype=np.uint8)
+    constraints = _ClueConstraints(num_digits, clues, variant.allow_repeats)
+    stack = [np.zeros((1, 0), dtype=np.uint8)]
+    while stack:
+        prefixes = stack.pop()
+        rows = np.empty((len(prefixes) * len(order), prefixes.shape[1] + 1), dtype=np.uint8)
+        rows[:, :-1] = np.repeat(prefixes, len(order), axis=0)
+        rows[:, -1] = np.tile(order, len(prefixes))
+        masks = digit_masks(rows)
+        keep = constraints.allows(rows, masks)
+        if not variant.allow_repeats:
+            # A symbol already used sets no new bit, so fewer bits than digits means a repeat.
+            keep &= _POPCOUNT16[masks] == rows.shape[1]
+        rows = rows[keep]
+        if rows.shape[1] == num_digits:
+            if len(rows):
+                yield rows
+        else:
+            # Pushed last-first so the chunks are extended in order.
+            for start in reversed(range(0, len(rows), chunk_rows)):
+                stack.append(rows[start:start + chunk_rows])
+
+
+def enumerate_space(num_digits: int, variant: Variant) -> np.ndarray:
+    """
+    Enumerates every secret of a variant, in lexicographic order.
+
+    Returns:
+        A `uint8` array of shape (variant.space_size(num_digits), num_digits).
+
+    Raises:
+        ValueError: If num_digits is out of range or the space has more than `ENUMERATION_LIMIT` secrets.
+    """
+    variant.validate(num_digits)
+    if variant.space_size(num_digits) > ENUMERATION_LIMIT:
+        raise ValueError(f"The space of {variant.space_size(num_digits):,} secrets is too large to enumerate.")
+    return np.concatenate(list(stream_consistent(num_digits, variant, [])))
+
+
+class VariantCandidateSet:
+    """
+    The secrets of a variant that are still consistent with all clues received so far.
+
+    Attributes:
+        num_digits (int): The number of digits in each secret.
+        variant (Variant): The alphabet and repeat policy.
+        clues (list[ArrayClue]): The (guess digit array, feedback code) pairs received.
+        members (np.ndarray | None): The consistent secrets, one per row, once there are
+            at most `materialize_limit` of them; None while only the clues are kept.
+        materialize_limit (int): Largest candidate set kept in memory.
+    """
+    def __init__(self, num_digits: int, variant: Variant, materialize_limit: int = ENUMERATION_LIMIT):
+        """
+        Initializes the set with every possible secret.
+
+        Raises:
+            ValueError: If num_digits is out of range for the variant.
+        """
+        variant.validate(num_digits)
+        self.num_digits: int = num_digits
+        self.variant: Variant = variant
+        self.clues: list[ArrayClue] = []
+        self.materialize_limit: int = materialize_limit
+        self.members: np.ndarray | None = None
+        if variant.space_size(num_digits) <= materialize_limit:
+            self.members = enumerate_space(num_digits, variant)
+        self._estimate: int = variant.space_size(num_digits)
+        self._estimate_rng = np.random.default_rng(0) # Fixed, so estimates are reproducible
+
+    def size(self) -> int:
+        """ Returns the number of candidates: exact once materialized, otherwise an estimate. """
+        return len(self.members) if self.members is not None else self._estimate
+
+    def estimated_size(self, samples: int = ESTIMATE_SAMPLES) -> int:
+        """ Estimates the number of candidates from the fraction of random secrets that are consistent. """
+        secrets = generate_secrets(samples, self.num_digits, self._estimate_rng, self.variant)
+        consistent = np.ones(samples, dtype=bool)
+        masks = digit_masks(secrets)
+        for guess, code in self.clues:
+            consistent &= score_guesses(guess, secrets, masks) == code
+        return round(consistent.mean() * self.variant.space_size(self.num_digits))
+
+    def filter(self, guess: Number, clues: Clue) -> int:
+        """
+        Removes every candidate that is inconsistent with the given clues.
+
+        Once the estimated size drops to `materialize_limit`, the candidates are
+        streamed into memory; from then on each clue filters them directly.
+
+        Args:
+            guess: The guess that was made.
+            clues: The clues received for that guess.
+
+        Returns:
+            The number of candidates remaining (an estimate while not materialized, see `size`).
+
+        Raises:
+            ValueError: If guess or clues do not have `num_digits` entries.
+        """
+        if len(guess) != self.num_digits or len(clues) != self.num_digits:
+            raise ValueError(f"Guess and clues must both have {self.num_digits} entries.")
+        guess_digits = guess.to_array()
+        self.clues.append((guess_digits, clues.code))
+        if self.members is not None:
+            self.members = self.members[score_guesses(guess_digits, self.members) == clues.code]
+            return len(self.members)
+        self._estimate = self.estimated_size()
+        if self._estimate <= self.materialize_limit:
+            self.members = self._collect()
+            if self.members is None:
+                self._estimate = self.materialize_limit + 1 # Underestimated; at least this many remain
+        return self.size()
+
+    def sample(self, rng: np.random.Generator) -> np.ndarray | None:
+        """
+        Draws a consistent secret.
+
+        Uniform once materialized; otherwise the first secret streamed in a random
+        symbol order, which is quick to find but not exactly uniform.
+
+        Returns:
+            A `uint8` digit array, or None if no secret is consistent with the clues.
+        """
+        if self.members is not None:
+            return self.members[rng.integers(len(self.members))] if len(self.members) else None
+        order = rng.permutation(self.variant.alphabet_size)
+        for chunk in stream_consistent(self.num_digits, self.variant, self.clues, symbol_order=order):
+            return chunk[rng.integers(len(chunk))]
+        return None
+
+    def _collect(self) -> np.ndarray | None:
+        # Streams the candidates into one array, or gives up (None) past `materialize_limit`.
+        chunks = []
+        total = 0
+        for chunk in stream_consistent(self.num_digits, self.variant, self.clues):
+            total += len(chunk)
+            if total > self.materialize_limit:
+                return None
+            chunks.append(chunk)
+        return np.concatenate(chunks) if chunks else np.empty((0, self.num_digits), dtype=np.uint8)